@@ -7,7 +7,7 @@ Region="us-east-1"
 # --- Get Event File from Argument ---
 if [ -z "$1" -o -z "$2" ]; then
   echo "Usage: $0 [account_type] [model]"
-  echo "  account_type: primary, alt, or noreply"
+  echo "  account_type: primary, alt, noreply, or all"
   echo "  model: nova or haiku"
   exit 1
 fi
@@ -4,10 +4,21 @@ import logging
 import os
 import sys
 
-from email_summarizer.app import run_bot
+from pydantic import ValidationError
+
+from email_summarizer.app import run_bot_jobs
+from email_summarizer.models.report_job import ReportJob
+from email_summarizer.runtime import get_warm_runtime
+from email_summarizer.utils.config_utils import check_required_config
+from email_summarizer.utils.deadline_utils import Deadline
 
 ACCOUNT_PARAM_KEY = "email_account_type"
 MODEL_PARAM_KEY = "model"
+JOBS_PARAM_KEY = "jobs"
+# Keep the event loop and Discord REST client alive between warm invocations.
+PERSISTENT_RUNTIME = os.environ.get("PERSISTENT_RUNTIME", "false").lower() == "true"
+# Seconds of the Lambda timeout kept back for posting the (partial) report.
+DEADLINE_RESERVE_SECONDS = float(os.environ.get("DEADLINE_RESERVE_SECONDS", 5))
 
 LOG = logging.getLogger(__name__)
 log_level_name = os.environ.get("LOG_LEVEL", "INFO").upper()
@@ -25,7 +36,7 @@ class MalformedEventError(Exception):
     pass
 
 
-def lambda_handler(event, _context):
+def lambda_handler(event, context):
     """
     AWS Lambda handler function.
 
@@ -37,10 +48,14 @@ def lambda_handler(event, _context):
     status_good = True
     error_message = ""
     try:
+        check_required_config()
         body = _parse_body_from_event(event)
-        email_account = _parse_value_from_body(body, ACCOUNT_PARAM_KEY)
-        model = _parse_value_from_body(body, MODEL_PARAM_KEY)
-        asyncio.run(run_bot(email_account, model))
+        jobs = _parse_jobs_from_body(body)
+        deadline = Deadline.from_lambda_context(context, DEADLINE_RESERVE_SECONDS)
+        if PERSISTENT_RUNTIME:
+            get_warm_runtime().run(jobs, deadline=deadline)
+        else:
+            asyncio.run(run_bot_jobs(jobs, deadline=deadline))
     except Exception as e:
         LOG.error("Error: %s", e)
         raise e
@@ -76,6 +91,37 @@ def _parse_body_from_event(event: dict) -> dict:
         raise MalformedEventError("Event body is not a valid JSON string")
 
 
+def _parse_jobs_from_body(body: dict) -> list[ReportJob]:
+    """
+    Parse the report jobs from the event body.
+
+    The body either holds a single job as top-level keys or a list of jobs:
+    {"jobs": [{"email_account_type": "PRIMARY", "model": "NOVA_MICRO"}, ...]}
+    """
+    raw_jobs = body.get(JOBS_PARAM_KEY, [body])
+    if not isinstance(raw_jobs, list) or len(raw_jobs) == 0:
+        raise MalformedEventError(
+            f"Event body.{JOBS_PARAM_KEY} must be a non-empty list"
+        )
+
+    jobs = []
+    for raw_job in raw_jobs:
+        if not isinstance(raw_job, dict):
+            raise MalformedEventError(f"Event body.{JOBS_PARAM_KEY} must hold objects")
+        try:
+            jobs.append(
+                ReportJob(
+                    email_account=_parse_value_from_body(raw_job, ACCOUNT_PARAM_KEY),
+                    target_model=_parse_value_from_body(raw_job, MODEL_PARAM_KEY),
+                )
+            )
+        except ValidationError as validation_error:
+            raise MalformedEventError(
+                f"Event body has an unsupported account or model: {validation_error}"
+            )
+    return jobs
+
+
 def _parse_value_from_body(body: dict, key: str) -> str:
     raw_value = body.get(key)
 
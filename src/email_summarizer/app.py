@@ -1,12 +1,29 @@
 import asyncio  # Required for discord.py v2.0+ even for simple tasks
 import logging
 import os
+from typing import TYPE_CHECKING
 
-import discord
 from dotenv import load_dotenv
 
-from email_summarizer.controllers.alphonse_controller import put_email_report
-from email_summarizer.models.enums import EmailAccounts, SupportedModel
+from email_summarizer.controllers.alphonse_controller import (
+    put_email_reports,
+    start_email_report_task,
+)
+from email_summarizer.models.enums import (
+    DiscordDelivery,
+    EmailAccounts,
+    SupportedModel,
+)
+from email_summarizer.models.report import EmailReport
+from email_summarizer.models.report_job import ReportJob
+from email_summarizer.services.report_sinks import build_sinks
+from email_summarizer.utils.config_utils import check_required_config
+from email_summarizer.utils.deadline_utils import Deadline
+
+if TYPE_CHECKING:
+    import discord
+
+    from email_summarizer.services.discord_rest import DiscordRestClient
 
 LOG = logging.getLogger()
 
@@ -16,41 +33,112 @@ if __name__ == "__main__":
 BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
 CHANNEL_ID_STR = os.getenv("DISCORD_CHANNEL_ID")
 MAX_EMAILS = int(os.getenv("MAX_EMAILS", 5))
+DISCORD_DELIVERY = os.getenv("DISCORD_DELIVERY", DiscordDelivery.GATEWAY.value)
+WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL")
+# Extra sinks the report is also written to, e.g. "stdout,json:/tmp/report.json".
+# With several accounts, JSON files get the account in their name.
+REPORT_SINKS = os.getenv("REPORT_SINKS")
 # --- End Configuration ---
 
-# Define necessary intents
-# discord.py v2.0 requires explicit intent declaration
-intents = discord.Intents.default()
-# If you don't need to read message content or member lists,
-# default intents are often enough for just sending.
-# If you needed members intent later: intents.members = True
-# If you needed message content intent later: intents.message_content = True
 
-# Create a client instance with the specified intents
-client = discord.Client(intents=intents)
+def build_gateway_client() -> "discord.Client":
+    """
+    Create the gateway client. discord.py is imported here rather than at
+    module level so REST/webhook runs and cold starts don't pay for it.
+    """
+    import discord
+
+    # Define necessary intents
+    # discord.py v2.0 requires explicit intent declaration
+    intents = discord.Intents.default()
+    # If you don't need to read message content or member lists,
+    # default intents are often enough for just sending.
+    # If you needed members intent later: intents.members = True
+    # If you needed message content intent later: intents.message_content = True
+
+    # Create a client instance with the specified intents
+    client = discord.Client(intents=intents)
+
+    @client.event
+    async def on_ready():
+        """
+        This function runs when the bot successfully connects to Discord.
+        """
+        LOG.info("Discord bot ready")
+        client.delivered = await put_email_reports(
+            client,
+            client.report_jobs,
+            CHANNEL_ID_STR,
+            MAX_EMAILS,
+            email_report_tasks=client.email_report_tasks,
+            extra_sinks=build_sinks(
+                REPORT_SINKS, per_account=len(client.report_jobs) > 1
+            ),
+            deadline=client.deadline,
+        )
 
+    return client
 
-@client.event
-async def on_ready():
+
+async def run_bot(email_account_type: str, model_str: str):
+    """Handles login and potential errors for a single account report"""
+    await run_bot_jobs(
+        [
+            ReportJob(
+                email_account=EmailAccounts(email_account_type),
+                target_model=SupportedModel(model_str),
+            )
+        ]
+    )
+
+
+async def run_bot_jobs(
+    jobs: list[ReportJob],
+    rest_client: "DiscordRestClient | None" = None,
+    deadline: Deadline | None = None,
+) -> bool:
     """
-    This function runs when the bot successfully connects to Discord.
+    Handles login and potential errors.
+
+    Every job's report starts building before the Discord login so they
+    overlap with it and with each other; the reports are posted over one
+    Discord session once both are ready. A logged-in rest_client is used
+    as-is and left open so the caller can reuse it. With a deadline, partial
+    reports are posted before it expires. Returns whether the reports reached
+    the channel; after False a reused rest_client should be replaced.
     """
-    LOG.info("Discord bot ready")
-    email_account = client.target_email_account
-    target_model = client.target_model
-    await put_email_report(
-        client, email_account, target_model, CHANNEL_ID_STR, MAX_EMAILS
-    )
+    delivery = DiscordDelivery(DISCORD_DELIVERY.upper())
+    email_report_tasks = [
+        start_email_report_task(
+            job.email_account, job.target_model, MAX_EMAILS, deadline
+        )
+        for job in jobs
+    ]
+    if rest_client is not None:
+        try:
+            return await put_email_reports(
+                rest_client,
+                jobs,
+                CHANNEL_ID_STR,
+                MAX_EMAILS,
+                email_report_tasks=email_report_tasks,
+                extra_sinks=build_sinks(REPORT_SINKS, per_account=len(jobs) > 1),
+                close_client=False,
+                deadline=deadline,
+            )
+        finally:
+            _discard_email_report_tasks(email_report_tasks)
+    if delivery != DiscordDelivery.GATEWAY:
+        return await run_rest_delivery(jobs, delivery, email_report_tasks, deadline)
 
+    import discord
 
-async def run_bot(email_account_type: str, model_str: str):
-    """Handles login and potential errors"""
-    email_account = EmailAccounts(email_account_type)
-    target_model = SupportedModel(model_str)
+    client = build_gateway_client()
     try:
         LOG.info("Starting Discord bot...")
-        client.target_email_account = email_account
-        client.target_model = target_model
+        client.report_jobs = jobs
+        client.email_report_tasks = email_report_tasks
+        client.deadline = deadline
         await client.start(BOT_TOKEN)
     except discord.errors.LoginFailure:
         LOG.error(
@@ -58,10 +146,65 @@ async def run_bot(email_account_type: str, model_str: str):
         )
     except Exception as e:
         LOG.error(f"An unexpected error occurred during bot startup or runtime: {e}")
+    finally:
+        _discard_email_report_tasks(email_report_tasks)
+    # Set by on_ready once the reports are posted
+    return getattr(client, "delivered", False)
+
+
+async def run_rest_delivery(
+    jobs: list[ReportJob],
+    delivery: DiscordDelivery,
+    email_report_tasks: list[asyncio.Task[EmailReport]],
+    deadline: Deadline | None = None,
+) -> bool:
+    """Posts the reports over Discord's HTTP API without a gateway session"""
+    import discord
+
+    rest_client = build_rest_client(delivery)
+    try:
+        LOG.info("Delivering report over Discord %s API...", delivery.value)
+        await rest_client.login()
+        return await put_email_reports(
+            rest_client,
+            jobs,
+            CHANNEL_ID_STR,
+            MAX_EMAILS,
+            email_report_tasks=email_report_tasks,
+            extra_sinks=build_sinks(REPORT_SINKS, per_account=len(jobs) > 1),
+            deadline=deadline,
+        )
+    except discord.errors.LoginFailure:
+        LOG.error("Error: Discord rejected the bot token or webhook URL.")
+        await rest_client.close()
+    except Exception as e:
+        LOG.error(f"An unexpected error occurred during REST delivery: {e}")
+        await rest_client.close()
+    finally:
+        _discard_email_report_tasks(email_report_tasks)
+    return False
+
+
+def build_rest_client(delivery: DiscordDelivery) -> "DiscordRestClient":
+    from email_summarizer.services.discord_rest import DiscordRestClient
+
+    if delivery == DiscordDelivery.WEBHOOK:
+        return DiscordRestClient(webhook_url=WEBHOOK_URL)
+    return DiscordRestClient(bot_token=BOT_TOKEN)
+
+
+def _discard_email_report_tasks(email_report_tasks: list[asyncio.Task[EmailReport]]):
+    """Cancels reports that were never delivered, e.g. after a failed login"""
+    for email_report_task in email_report_tasks:
+        if not email_report_task.done():
+            email_report_task.cancel()
+        elif not email_report_task.cancelled() and email_report_task.exception():
+            LOG.debug("Discarded report build error: %s", email_report_task.exception())
 
 
 # Run the bot
 if __name__ == "__main__":
     email_account_type = EmailAccounts.PRIMARY.value
     model_str = SupportedModel.NOVA_MICRO.value
+    check_required_config()
     asyncio.run(run_bot(email_account_type, model_str))
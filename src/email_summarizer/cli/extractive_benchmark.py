@@ -0,0 +1,143 @@
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from email_summarizer.models.email import Email
+from email_summarizer.models.enums import EmailAccounts, SupportedModel
+from email_summarizer.prompts.summary_prompt import summary_system_prompt
+from email_summarizer.utils.ai_utils import EXTRACTIVE_CHAR_BUDGET
+from email_summarizer.utils.email_utils import email_to_prompt
+from email_summarizer.utils.token_utils import estimate_tokens
+
+load_dotenv()
+
+DEFAULT_SENTENCES = 8
+
+
+def load_corpus(directory: Path) -> list[Email]:
+    return [
+        Email(
+            id=path.stem,
+            subject=path.stem,
+            sender="benchmark@example.com",
+            date="",
+            snippet="",
+            body_preview=path.read_text(encoding="utf-8", errors="replace"),
+        )
+        for path in sorted(directory.glob("*.txt"))
+    ]
+
+
+def export_corpus(email_account: EmailAccounts, directory: Path, count: int) -> int:
+    """
+    Save the cleaned bodies of recent emails as a benchmark corpus.
+    """
+    from email_summarizer.utils.gmail_utils import get_emails
+
+    directory.mkdir(parents=True, exist_ok=True)
+    saved = 0
+    for email in get_emails(email_account, max_results=count):
+        if body_preview := email.load_body():
+            (directory / f"{email.id}.txt").write_text(body_preview)
+            saved += 1
+    return saved
+
+
+def build_prompts(
+    corpus: list[Email], sentences: int, char_budget: int
+) -> tuple[list[str], float]:
+    """Prompts of the corpus and the median milliseconds spent per prompt."""
+    prompts = []
+    timings = []
+    for email in corpus:
+        start = time.perf_counter()
+        prompts.append(
+            email_to_prompt(
+                email,
+                disable_redaction=True,
+                extractive_sentences=sentences,
+                extractive_char_budget=char_budget,
+            )["prompt_body"]
+        )
+        timings.append(time.perf_counter() - start)
+    return prompts, statistics.median(timings) * 1000
+
+
+def time_model(target_model: SupportedModel, prompts: list[str]) -> float:
+    """Median seconds of a summary call per prompt."""
+    from email_summarizer.utils.ai_utils import get_model_client
+
+    client = get_model_client(target_model)
+    timings = []
+    for prompt in prompts:
+        start = time.perf_counter()
+        client.invoke(prompt=prompt, system_prompt=summary_system_prompt(False))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare extractive and full-body summary prompts on a corpus."
+    )
+    parser.add_argument("corpus", type=Path, help="Directory of .txt email bodies")
+    parser.add_argument("--sentences", type=int, default=DEFAULT_SENTENCES)
+    parser.add_argument("--char-budget", type=int, default=EXTRACTIVE_CHAR_BUDGET)
+    parser.add_argument(
+        "--invoke",
+        choices=[model.value for model in SupportedModel],
+        help="Also time summary calls to this model with both prompts.",
+    )
+    parser.add_argument(
+        "--export-from",
+        choices=[account.value for account in EmailAccounts],
+        help="Fill the corpus directory from this account's recent mail first.",
+    )
+    parser.add_argument("--export-count", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.export_from:
+        saved = export_corpus(
+            EmailAccounts(args.export_from), args.corpus, args.export_count
+        )
+        print(f"Exported {saved} email bodies to {args.corpus}")
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print(f"No .txt files found in {args.corpus}")
+        sys.exit(1)
+    print(
+        f"{len(corpus)} emails, top {args.sentences} sentences"
+        f" within {args.char_budget} chars"
+    )
+
+    variants = {
+        "full body": build_prompts(corpus, 0, args.char_budget),
+        "extractive": build_prompts(corpus, args.sentences, args.char_budget),
+    }
+    baseline_tokens = None
+    baseline_seconds = None
+    for name, (prompts, prompt_ms) in variants.items():
+        tokens = sum(estimate_tokens(prompt) for prompt in prompts)
+        baseline_tokens = baseline_tokens or tokens
+        line = (
+            f"  {name:<11} {tokens:>9} input tokens"
+            f"  {1 - tokens / baseline_tokens:>6.1%} fewer"
+            f"  {prompt_ms:>7.2f} ms/prompt"
+        )
+        if args.invoke:
+            seconds = time_model(SupportedModel(args.invoke), prompts)
+            baseline_seconds = baseline_seconds or seconds
+            line += (
+                f"  {seconds * 1000:>8.0f} ms/call"
+                f"  {seconds / baseline_seconds - 1:>+7.1%} latency"
+            )
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+import argparse
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from email_summarizer.models.enums import EmailAccounts, FetchFormat
+from email_summarizer.services.gmail import build_email_from_message
+
+load_dotenv()
+
+
+def record_corpus(email_account: EmailAccounts, directory: Path, count: int) -> int:
+    """
+    Save recent messages in every fetch format as <id>.<format>.json.
+    """
+    from email_summarizer.services.gmail import (
+        authenticate_gmail,
+        get_message_details,
+        list_messages,
+    )
+
+    service = authenticate_gmail(email_account)
+    directory.mkdir(parents=True, exist_ok=True)
+    recorded = 0
+    for message_info in list_messages(service, max_results=count):
+        for fetch_format in FetchFormat:
+            message = get_message_details(service, message_info["id"], fetch_format)
+            if message:
+                path = directory / f"{message_info['id']}.{fetch_format.value}.json"
+                path.write_text(json.dumps(message))
+        recorded += 1
+    return recorded
+
+
+def load_corpus(directory: Path, fetch_format: FetchFormat) -> list[str]:
+    return [
+        path.read_text()
+        for path in sorted(directory.glob(f"*.{fetch_format.value}.json"))
+    ]
+
+
+def parse_corpus(corpus: list[str], fetch_format: FetchFormat) -> None:
+    for response in corpus:
+        message = json.loads(response)
+        build_email_from_message(message["id"], message, fetch_format)
+
+
+def benchmark_format(
+    corpus: list[str], fetch_format: FetchFormat, runs: int
+) -> tuple[int, float, int]:
+    """Bytes on the wire, median parse seconds and peak parse memory in bytes."""
+    wire_bytes = sum(len(response.encode()) for response in corpus)
+    timings = []
+    for _ in range(runs):
+        start = time.process_time()
+        parse_corpus(corpus, fetch_format)
+        timings.append(time.process_time() - start)
+    tracemalloc.start()
+    parse_corpus(corpus, fetch_format)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return wire_bytes, statistics.median(timings), peak_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare Gmail fetch formats on a recorded corpus."
+    )
+    parser.add_argument("corpus", type=Path, help="Directory of recorded responses")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--record-from",
+        choices=[account.value for account in EmailAccounts],
+        help="Record recent messages from this account into the corpus first.",
+    )
+    parser.add_argument("--record-count", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.record_from:
+        recorded = record_corpus(
+            EmailAccounts(args.record_from), args.corpus, args.record_count
+        )
+        print(f"Recorded {recorded} messages to {args.corpus}")
+
+    print(
+        f"{'format':<10} {'messages':>8} {'wire KB':>9} {'parse ms':>9} {'peak KB':>9}"
+    )
+    found = False
+    for fetch_format in FetchFormat:
+        corpus = load_corpus(args.corpus, fetch_format)
+        if not corpus:
+            continue
+        found = True
+        wire_bytes, seconds, peak_bytes = benchmark_format(
+            corpus, fetch_format, args.runs
+        )
+        print(
+            f"{fetch_format.value:<10} {len(corpus):>8} {wire_bytes / 1024:>9.1f}"
+            f" {seconds * 1000:>9.1f} {peak_bytes / 1024:>9.1f}"
+        )
+    if not found:
+        print(f"No recorded responses found in {args.corpus}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from email_summarizer.models.enums import EmailAccounts, HtmlTextEngine
+from email_summarizer.utils.html_utils import HTML_TEXT_MAX_CHARS, html_to_text
+
+load_dotenv()
+
+
+def load_corpus(directory: Path) -> list[str]:
+    paths = sorted([*directory.glob("*.html"), *directory.glob("*.htm")])
+    return [path.read_text(encoding="utf-8", errors="replace") for path in paths]
+
+
+def export_corpus(email_account: EmailAccounts, directory: Path, count: int) -> int:
+    """
+    Save the HTML bodies of recent messages as a benchmark corpus.
+    """
+    from email_summarizer.services.gmail import (
+        authenticate_gmail,
+        get_message_details,
+        list_messages,
+    )
+    from email_summarizer.utils.mime_utils import HTML_TEXT, walk_text_parts
+
+    service = authenticate_gmail(email_account)
+    directory.mkdir(parents=True, exist_ok=True)
+    saved = 0
+    for message_info in list_messages(service, max_results=count):
+        message = get_message_details(service, message_info["id"]) or {}
+        for part in walk_text_parts(message.get("payload", {})):
+            body = part.decode() if part.mime_type == HTML_TEXT else None
+            if body:
+                (directory / f"{message_info['id']}.html").write_text(body)
+                saved += 1
+                break
+    return saved
+
+
+def time_engine(
+    corpus: list[str], engine: HtmlTextEngine, runs: int, max_chars: int
+) -> tuple[float, int]:
+    """Median seconds to extract the whole corpus, and the text length produced."""
+    timings = []
+    output_chars = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        output_chars = sum(
+            len(html_to_text(html, engine=engine, max_chars=max_chars))
+            for html in corpus
+        )
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), output_chars
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare HTML-to-text engines on a corpus of email HTML."
+    )
+    parser.add_argument("corpus", type=Path, help="Directory of .html files")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-chars", type=int, default=HTML_TEXT_MAX_CHARS)
+    parser.add_argument(
+        "--export-from",
+        choices=[account.value for account in EmailAccounts],
+        help="Fill the corpus directory from this account's recent mail first.",
+    )
+    parser.add_argument("--export-count", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.export_from:
+        saved = export_corpus(
+            EmailAccounts(args.export_from), args.corpus, args.export_count
+        )
+        print(f"Exported {saved} HTML bodies to {args.corpus}")
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print(f"No .html files found in {args.corpus}")
+        sys.exit(1)
+    corpus_mb = sum(len(html) for html in corpus) / 1_000_000
+    print(f"{len(corpus)} messages, {corpus_mb:.2f} MB of HTML, {args.runs} runs")
+
+    baseline = None
+    for engine in (HtmlTextEngine.BEAUTIFULSOUP, HtmlTextEngine.STREAMING):
+        seconds, output_chars = time_engine(corpus, engine, args.runs, args.max_chars)
+        baseline = baseline or seconds
+        print(
+            f"  {engine.value:<14} {seconds * 1000:>9.1f} ms"
+            f"  {seconds / len(corpus) * 1000:>7.2f} ms/msg"
+            f"  {baseline / seconds:>5.1f}x  {output_chars:>9} chars of text"
+        )
+
+
+if __name__ == "__main__":
+    main()
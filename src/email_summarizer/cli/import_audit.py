@@ -0,0 +1,129 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from pydantic import BaseModel
+
+DEFAULT_MODULE = "lambda_function"
+# Cold-start regression budget for importing the Lambda handler module.
+DEFAULT_BUDGET_MS = 400
+# Heavy dependencies that must only load on first use, never at import time.
+DEFAULT_FORBIDDEN = (
+    "aiohttp",
+    "boto3",
+    "botocore",
+    "bs4",
+    "discord",
+    "google_auth_oauthlib",
+    "googleapiclient",
+    "numpy",
+)
+
+
+class ImportRecord(BaseModel):
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+class ImportAudit(BaseModel):
+    module: str
+    cumulative_ms: float
+    self_ms_by_package: dict[str, float]
+    forbidden_loaded: list[str]
+
+
+def parse_importtime(stderr: str) -> list[ImportRecord]:
+    """
+    Parse the output of `python -X importtime`.
+    """
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        records.append(
+            ImportRecord(
+                name=name.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(name.lstrip())) // 2,
+            )
+        )
+    return records
+
+
+def self_time_by_package(records: list[ImportRecord]) -> dict[str, float]:
+    """
+    Sum self time per top-level package, in milliseconds, largest first.
+    """
+    totals: dict[str, int] = defaultdict(int)
+    for record in records:
+        totals[record.name.split(".")[0]] += record.self_us
+    return {
+        package: round(total / 1000, 2)
+        for package, total in sorted(totals.items(), key=lambda item: -item[1])
+    }
+
+
+def audit_import(
+    module: str = DEFAULT_MODULE,
+    forbidden: tuple[str, ...] = DEFAULT_FORBIDDEN,
+) -> ImportAudit:
+    """
+    Import the module in a fresh interpreter and report where the time went.
+    """
+    code = f"import json, sys, {module}; print(json.dumps(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        check=True,
+    )
+    records = parse_importtime(result.stderr)
+    loaded = set(json.loads(result.stdout.splitlines()[-1]))
+    target = next(record for record in records if record.name == module)
+    return ImportAudit(
+        module=module,
+        cumulative_ms=round(target.cumulative_us / 1000, 2),
+        self_ms_by_package=self_time_by_package(records),
+        forbidden_loaded=sorted(name for name in forbidden if name in loaded),
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Audit cold-start import time with python -X importtime."
+    )
+    parser.add_argument("--module", default=DEFAULT_MODULE)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    audits = [audit_import(args.module) for _ in range(args.runs)]
+    median_ms = statistics.median(audit.cumulative_ms for audit in audits)
+
+    print(f"Import of {args.module}: median {median_ms:.1f} ms over {args.runs} runs")
+    print("Self time by package (last run):")
+    for package, ms in list(audits[-1].self_ms_by_package.items())[: args.top]:
+        print(f"  {package:<32} {ms:>8.2f} ms")
+
+    failed = False
+    if audits[-1].forbidden_loaded:
+        print(f"FAIL: loaded at import time: {', '.join(audits[-1].forbidden_loaded)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"FAIL: {median_ms:.1f} ms exceeds budget of {args.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+import asyncio
+
+from dotenv import load_dotenv
+
+from email_summarizer.controllers.alphonse_controller import write_email_report
+from email_summarizer.models.enums import EmailAccounts, SupportedModel
+from email_summarizer.services.report_sinks import build_sinks
+from email_summarizer.utils.config_utils import check_required_config
+
+load_dotenv()
+
+
+async def run(args: argparse.Namespace) -> None:
+    sinks = build_sinks(",".join(args.sink))
+    try:
+        await write_email_report(
+            EmailAccounts(args.account),
+            SupportedModel(args.model),
+            args.max_emails,
+            sinks,
+        )
+    finally:
+        for sink in sinks:
+            await sink.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compile an email report and write it to local sinks."
+    )
+    parser.add_argument(
+        "--account",
+        default=EmailAccounts.PRIMARY.value,
+        choices=[account.value for account in EmailAccounts],
+    )
+    parser.add_argument(
+        "--model",
+        default=SupportedModel.NOVA_MICRO.value,
+        choices=[model.value for model in SupportedModel],
+    )
+    parser.add_argument("--max-emails", type=int, default=5)
+    parser.add_argument(
+        "--sink",
+        action="append",
+        default=[],
+        help='Sink spec: "stdout", "json:<path>" or "webhook:<url>". Repeatable.',
+    )
+    args = parser.parse_args()
+    if not args.sink:
+        args.sink = ["stdout"]
+    check_required_config()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from email_summarizer.models.email import Email
+from email_summarizer.models.enums import EmailIntent
+from email_summarizer.utils.ai_utils import INTENT_CONFIDENCE_THRESHOLD
+from email_summarizer.utils.digest_utils import INTENT_PATTERN, parse_intent
+from email_summarizer.utils.intent_classifier import (
+    DEFAULT_FEATURE_BITS,
+    IntentClassifier,
+)
+
+load_dotenv()
+
+# Every HOLDOUT_EVERY-th example is held back to evaluate the classifier.
+HOLDOUT_EVERY = 5
+
+
+def load_examples(paths: list[Path]) -> list[tuple[Email, EmailIntent]]:
+    """
+    Labelled emails from saved reports, e.g. written by the json report
+    sink. Only summaries the model wrote and tagged with an intent are used,
+    so the classifier never learns from its own template lines.
+    """
+    examples = []
+    for path in paths:
+        report = json.loads(path.read_text())
+        for summary in report.get("summaries", []):
+            if summary.get("is_fallback") or summary.get("is_local"):
+                continue
+            if not INTENT_PATTERN.match(summary["body"]):
+                continue
+            intent, _ = parse_intent(summary["body"])
+            examples.append((Email(**summary["email"]), intent))
+    return examples
+
+
+def evaluate(
+    classifier: IntentClassifier,
+    examples: list[tuple[Email, EmailIntent]],
+    threshold: float,
+) -> tuple[float, float, float]:
+    """Accuracy overall, share of emails over the threshold and their accuracy."""
+    predictions = [(classifier.predict(email), intent) for email, intent in examples]
+    confident = [
+        (prediction, intent)
+        for prediction, intent in predictions
+        if prediction.confidence >= threshold
+    ]
+    accuracy = sum(p.intent == intent for p, intent in predictions) / len(predictions)
+    coverage = len(confident) / len(predictions)
+    confident_accuracy = (
+        sum(p.intent == intent for p, intent in confident) / len(confident)
+        if confident
+        else 0.0
+    )
+    return accuracy, coverage, confident_accuracy
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Train the local intent classifier from saved reports."
+    )
+    parser.add_argument("reports", type=Path, nargs="+", help="Report JSON files")
+    parser.add_argument("--output", type=Path, default=Path("intent_classifier.npz"))
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--feature-bits", type=int, default=DEFAULT_FEATURE_BITS)
+    parser.add_argument("--threshold", type=float, default=INTENT_CONFIDENCE_THRESHOLD)
+    args = parser.parse_args()
+
+    examples = load_examples(args.reports)
+    if len(examples) < HOLDOUT_EVERY:
+        print(f"Only {len(examples)} labelled emails found, not enough to train")
+        sys.exit(1)
+    train = [ex for i, ex in enumerate(examples) if i % HOLDOUT_EVERY]
+    holdout = examples[::HOLDOUT_EVERY]
+
+    classifier = IntentClassifier.fit(
+        train, feature_bits=args.feature_bits, epochs=args.epochs
+    )
+    accuracy, coverage, confident_accuracy = evaluate(
+        classifier, holdout, args.threshold
+    )
+    print(f"{len(train)} training and {len(holdout)} held-out emails")
+    print(f"  held-out accuracy        {accuracy:>6.1%}")
+    print(f"  over {args.threshold:.2f} confidence    {coverage:>6.1%} of emails")
+    print(f"  accuracy over threshold  {confident_accuracy:>6.1%}")
+
+    # Ship the model trained on every example
+    IntentClassifier.fit(
+        examples, feature_bits=args.feature_bits, epochs=args.epochs
+    ).save(args.output)
+    print(f"Saved classifier to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,124 +1,379 @@
+import asyncio
 import logging
+import os
+from typing import TYPE_CHECKING
 
-import discord
-
-from email_summarizer.models.enums import EmailAccounts, SupportedModel
+from email_summarizer.controllers.pipeline_controller import stream_email_report
+from email_summarizer.models.enums import (
+    EmailAccounts,
+    ReportPipeline,
+    SupportedModel,
+)
 from email_summarizer.models.report import EmailReport
+from email_summarizer.models.report_job import ReportJob
+from email_summarizer.services.base_model_client import AbstractModelClient
 from email_summarizer.services.gmail import RefreshTokenInvalidError
-from email_summarizer.utils.ai_utils import compile_email_report, get_model_client
+from email_summarizer.services.message_ledger import record_reported
+from email_summarizer.services.rate_budgeter import get_rate_budgeter
+from email_summarizer.services.report_sinks import (
+    DiscordSink,
+    ReportSink,
+    deliver_error,
+    deliver_report,
+)
+from email_summarizer.utils.ai_utils import (
+    compile_email_report,
+    get_prompt_config,
+    get_shared_model_client,
+)
+from email_summarizer.utils.cluster_summary_utils import find_clusters
+from email_summarizer.utils.deadline_utils import Deadline
+from email_summarizer.utils.digest_utils import DIGEST_MIN_EMAILS, build_digests
 from email_summarizer.utils.gmail_utils import EmailUnavailableError, get_emails
 from email_summarizer.utils.grouping_utils import group_emails
 
+if TYPE_CHECKING:
+    import discord
+
+    from email_summarizer.services.discord_rest import DiscordRestClient
+
 LOG = logging.getLogger()
+# Time kept back from the model calls so the report is assembled and handed
+# over before the delivery deadline.
+COMPILE_MARGIN_SECONDS = 1.0
+# STAGED fetches every email before grouping and summarizing them; STREAMING
+# passes each email through the stages as soon as it is fetched.
+REPORT_PIPELINE = os.getenv("REPORT_PIPELINE", ReportPipeline.STAGED.value)
+
+
+def build_email_report(
+    email_account: EmailAccounts,
+    target_model: SupportedModel,
+    max_emails: int,
+    deadline: Deadline | None = None,
+) -> EmailReport:
+    """
+    Get emails from gmail and compile them into a report.
+
+    With a deadline, the report is returned before it expires even if some
+    emails could not be summarized in time.
 
+    Raises:
+        EmailUnavailableError: If the gmail service is not available.
+        RefreshTokenInvalidError: If the refresh token is invalid.
+    """
+    emails = get_emails(email_account, max_results=max_emails)
+    grouping_payload = group_emails(emails)
+    bedrock_client = get_shared_model_client(target_model)
+    ungrouped_emails, clusters = find_clusters(
+        grouping_payload.get("ungrouped_emails", [])
+    )
+    email_report = compile_email_report(
+        client=bedrock_client,
+        email_account=email_account,
+        emails=ungrouped_emails,
+        grouped_emails=grouping_payload.get("list_of_grouped_emails", []),
+        high_priority_emails=grouping_payload.get("high_priority_emails", []),
+        deadline=_compile_deadline(deadline),
+        prompt_config=get_prompt_config(target_model),
+        clusters=clusters,
+    )
+    email_report.reported_message_ids = [email.id for email in emails]
+    attach_digests(email_report, bedrock_client, deadline)
+    _log_rate_budget()
+    return email_report
+
+
+async def build_email_report_streaming(
+    email_account: EmailAccounts,
+    target_model: SupportedModel,
+    max_emails: int,
+    deadline: Deadline | None = None,
+) -> EmailReport:
+    """
+    Same report as build_email_report, built by streaming each email through
+    the fetch, parse, classify, redact and summarize stages, except that
+    similar emails are not clustered: clusters need every ungrouped email,
+    which would hold the summarize stage back until the last fetch.
+
+    Raises:
+        EmailUnavailableError: If the gmail service is not available.
+        RefreshTokenInvalidError: If the refresh token is invalid.
+    """
+    bedrock_client = get_shared_model_client(target_model)
+    email_report = await stream_email_report(
+        bedrock_client,
+        email_account,
+        max_emails,
+        deadline=_compile_deadline(deadline),
+        prompt_config=get_prompt_config(target_model),
+    )
+    await asyncio.to_thread(attach_digests, email_report, bedrock_client, deadline)
+    _log_rate_budget()
+    return email_report
 
-def _report_header(email_report: EmailReport) -> str:
-    return f"# {email_report.email_account.value} Email Report {email_report.timestamp}"
+
+def attach_digests(
+    email_report: EmailReport,
+    client: AbstractModelClient,
+    deadline: Deadline | None = None,
+    min_emails: int = DIGEST_MIN_EMAILS,
+) -> None:
+    """
+    In digest mode, condense the summaries of a report with at least
+    min_emails of them into per-intent digests.
+    """
+    if min_emails <= 0 or len(email_report.summaries) < min_emails:
+        return
+    email_report.digests = build_digests(
+        client, email_report.summaries, deadline=_compile_deadline(deadline)
+    )
+
+
+def _compile_deadline(deadline: Deadline | None) -> Deadline | None:
+    return deadline.shortened(COMPILE_MARGIN_SECONDS) if deadline else None
+
+
+def _log_rate_budget() -> None:
+    utilization = get_rate_budgeter().utilization()
+    LOG.info(
+        "Bedrock budget in the last minute: %d requests, %d tokens",
+        utilization.requests,
+        utilization.tokens,
+    )
+
+
+def start_email_report_task(
+    email_account: EmailAccounts,
+    target_model: SupportedModel,
+    max_emails: int,
+    deadline: Deadline | None = None,
+) -> asyncio.Task[EmailReport]:
+    """
+    Start building the report in a worker thread so it can overlap with the
+    Discord login. The task is handed to put_email_report once connected.
+    With REPORT_PIPELINE=STREAMING the report is streamed on the event loop.
+    """
+    if ReportPipeline(REPORT_PIPELINE.upper()) == ReportPipeline.STREAMING:
+        return asyncio.create_task(
+            build_email_report_streaming(
+                email_account, target_model, max_emails, deadline
+            )
+        )
+    return asyncio.create_task(
+        asyncio.to_thread(
+            build_email_report, email_account, target_model, max_emails, deadline
+        )
+    )
+
+
+async def write_email_report(
+    email_account: EmailAccounts,
+    target_model: SupportedModel,
+    max_emails: int,
+    sinks: list[ReportSink],
+    email_report_task: asyncio.Task[EmailReport] | None = None,
+    deadline: Deadline | None = None,
+) -> EmailReport | None:
+    """
+    Compile the report once and deliver it to every sink.
+
+    Gmail errors are reported to the sinks instead of a report. Needs no
+    Discord connection, so the pipeline can run against local sinks alone.
+    With a deadline, a report that still isn't built when it expires is
+    reported as an error so the sinks always hear back in time. The emails
+    are recorded as reported only once every delivery sink (Discord or a
+    webhook) has them; local copies alone don't count.
+    """
+    try:
+        # Get emails and compile report
+        if email_report_task is None:
+            email_report_task = start_email_report_task(
+                email_account, target_model, max_emails, deadline
+            )
+        if deadline is None:
+            email_report = await email_report_task
+        else:
+            email_report = await asyncio.wait_for(
+                email_report_task, timeout=deadline.remaining()
+            )
+    except TimeoutError:
+        LOG.error("Error: %s report was not built before the deadline.", email_account)
+        await deliver_error(
+            f"Error: ran out of time building the {email_account.value} email report.",
+            sinks,
+            email_account,
+        )
+        return None
+    except EmailUnavailableError as e:
+        LOG.error("Error: %s", e)
+        await deliver_error("Error: Gmail service not available.", sinks, email_account)
+        LOG.info("Reported error to sinks.")
+        return None
+    except RefreshTokenInvalidError:
+        LOG.error("Error: Gmail Refresh token is invalid.")
+        await deliver_error(
+            f"**Gmail refresh token for {email_account.value} is invalid. Please update the token.**",
+            sinks,
+            email_account,
+        )
+        LOG.info("Reported error to sinks.")
+        return None
+
+    # Send report to sinks
+    deliveries = await deliver_report(email_report, sinks)
+    for delivery in deliveries:
+        if delivery.error is None:
+            LOG.info("Report sent to %s sink", delivery.sink)
+    delivered = [
+        delivery.error is None
+        for sink, delivery in zip(sinks, deliveries)
+        if sink.records_delivery
+    ]
+    if delivered and all(delivered):
+        # Only delivered emails are left out of later reports.
+        await asyncio.to_thread(
+            record_reported, email_account, email_report.recordable_message_ids()
+        )
+    return email_report
 
 
 async def put_email_report(
-    discord_client: discord.Client,
+    discord_client: "discord.Client | DiscordRestClient",
     email_account: EmailAccounts,
     target_model: SupportedModel,
     channel_str: str,
     max_emails: int,
-) -> None:
+    email_report_task: asyncio.Task[EmailReport] | None = None,
+    extra_sinks: list[ReportSink] | None = None,
+) -> bool:
     """
     Get emails from gmail, compile them into a report, and send the report to the channel.
+
+    The discord client may be a gateway discord.Client or a DiscordRestClient
+    that posts over the HTTP API. When email_report_task is given, the report
+    it is already building is awaited instead of starting a new build. The
+    report is written through a DiscordSink for the channel and any
+    extra_sinks, so it is compiled once and fanned out to every sink.
+    Returns whether the channel got every message.
+    """
+    return await put_email_reports(
+        discord_client,
+        [ReportJob(email_account=email_account, target_model=target_model)],
+        channel_str,
+        max_emails,
+        email_report_tasks=[email_report_task] if email_report_task else None,
+        extra_sinks=extra_sinks,
+    )
+
+
+async def put_email_reports(
+    discord_client: "discord.Client | DiscordRestClient",
+    jobs: list[ReportJob],
+    channel_str: str,
+    max_emails: int,
+    email_report_tasks: list[asyncio.Task[EmailReport]] | None = None,
+    extra_sinks: list[ReportSink] | None = None,
+    close_client: bool = True,
+    deadline: Deadline | None = None,
+) -> bool:
     """
+    Post one report per job to the channel over a single Discord session.
+
+    Jobs run concurrently and independently: a job that fails, e.g. because
+    its Gmail refresh token is invalid, is reported in the channel without
+    affecting the other jobs. email_report_tasks, when given, line up with
+    jobs and hold reports that are already being built. Pass
+    close_client=False to keep a reusable client connected afterwards.
+    Reports are posted, partially if need be, before the deadline expires.
+    Errors other than a failed Discord request propagate once the client is
+    closed.
+
+    Returns:
+        Whether the channel got every message. A failed post means the
+        client's connection can't be trusted for the next run.
+    """
+    # Both client types have already loaded discord.py, and with it aiohttp,
+    # by the time they exist.
+    import aiohttp
+    import discord
+
     # Guard statements
     assert discord_client.user is not None
     assert channel_str is not None
     assert max_emails is not None
-    assert email_account is not None
+    assert len(jobs) > 0
 
     LOG.info("Logged in as %s (%s)", discord_client.user.name, discord_client.user.id)
     LOG.info("------")
 
     channel_id = int(channel_str)
+    tasks: list[asyncio.Task[EmailReport] | None] = [None] * len(jobs)
+    if email_report_tasks:
+        tasks = list(email_report_tasks)
+    delivered = False
 
     try:
         # Get the channel object using the ID
         channel = discord_client.get_channel(channel_id)
 
         if not channel:
-            raise ValueError(f"Could not find channel with ID: {channel_id}")
-
-        LOG.info("Found channel: %s (%s)", channel.name, channel.id)
-
-        try:
-            # Get emails and compile report
-            emails = get_emails(email_account, max_results=max_emails)
-            grouping_payload = group_emails(emails)
-            bedrock_client = get_model_client(target_model)
-            email_report = compile_email_report(
-                client=bedrock_client,
-                email_account=email_account,
-                emails=grouping_payload.get("ungrouped_emails", []),
-                grouped_emails=grouping_payload.get("list_of_grouped_emails", []),
-                high_priority_emails=grouping_payload.get("high_priority_emails", []),
-            )
+            LOG.error("Error: Could not find channel with ID: %s", channel_id)
+            return False
 
-            # Send report to channel
-            await channel.send(_report_header(email_report))
-            if email_report.is_empty():
-                await channel.send("*No emails to report.*")
-            else:
-                LOG.debug("Displaying actionable emails...")
-                if len(email_report.actionable_emails) > 0:
-                    for i, actionable_email in enumerate(
-                        email_report.actionable_emails
-                    ):
-                        await channel.send(
-                            f"{i + 1}. ({actionable_email.email.sender}) {actionable_email.next_steps}"
-                        )
-                    await channel.send("--------")
-                else:
-                    await channel.send("*No high priority emails to report.*")
-
-                LOG.debug("Displaying regular emails...")
-                if len(email_report.summaries) > 0:
-                    for i, summary in enumerate(email_report.summaries):
-                        await channel.send(
-                            f"{i + 1}. ({summary.email.sender}) {summary.body}"
-                        )
-                else:
-                    await channel.send("*No regular emails to report.*")
-
-                LOG.debug("Displaying grouped emails...")
-                if _any_grouped_emails(email_report):
-                    await channel.send("### Grouped Emails")
-                    for grouped_email in email_report.grouped_emails:
-                        await channel.send(
-                            f"- ({grouped_email.sender}) - message count: {grouped_email.count}"
-                        )
-                else:
-                    await channel.send("*No grouped emails to report.*")
-            LOG.info("Message sent to %s", channel.name)
-        except EmailUnavailableError as e:
-            LOG.error("Error: %s", e)
-            await channel.send("Error: Gmail service not available.")
-            LOG.info("Reported error to channel.")
-        except RefreshTokenInvalidError:
-            LOG.error("Error: Gmail Refresh token is invalid.")
-            await channel.send(
-                f"**Gmail refresh token for {email_account.value} is invalid. Please update the token.**"
+        LOG.info("Found channel: %s (%s)", channel, channel.id)
+
+        discord_sink = DiscordSink(channel)
+        sinks: list[ReportSink] = [discord_sink, *(extra_sinks or [])]
+        await asyncio.gather(
+            *(
+                _write_job_report(job, max_emails, sinks, task, deadline)
+                for job, task in zip(jobs, tasks)
             )
-            LOG.info("Reported error to channel.")
+        )
+        delivered = not discord_sink.failed
 
     except discord.errors.Forbidden:
         LOG.error(
             "Error: Bot doesn't have permissions to send messages in channel ID %s.",
             channel_id,
         )
-    except Exception as e:
-        LOG.error("An error occurred: %s", e)
+    except (discord.errors.HTTPException, aiohttp.ClientError) as e:
+        LOG.error("Error: Discord request failed: %s", e)
     finally:
-        # After sending the message, close the connection.
-        # If you want the bot to stay online for other tasks, remove this line.
-        LOG.info("Closing bot connection.")
-        await discord_client.close()
+        for task in tasks:
+            if task is not None and not task.done():
+                task.cancel()
+        for sink in extra_sinks or []:
+            await sink.close()
+        # After sending the message, close the connection unless the caller
+        # keeps the client for later invocations.
+        if close_client:
+            LOG.info("Closing bot connection.")
+            await discord_client.close()
+    return delivered
 
 
-def _any_grouped_emails(email_report: EmailReport) -> bool:
-    return any(grouped_email.count > 0 for grouped_email in email_report.grouped_emails)
+async def _write_job_report(
+    job: ReportJob,
+    max_emails: int,
+    sinks: list[ReportSink],
+    email_report_task: asyncio.Task[EmailReport] | None,
+    deadline: Deadline | None = None,
+) -> None:
+    try:
+        await write_email_report(
+            job.email_account,
+            job.target_model,
+            max_emails,
+            sinks,
+            email_report_task,
+            deadline,
+        )
+    except Exception as e:
+        LOG.error("Error building %s report: %s", job.email_account.value, e)
+        await deliver_error(
+            f"Error: could not build the {job.email_account.value} email report.",
+            sinks,
+            job.email_account,
+        )
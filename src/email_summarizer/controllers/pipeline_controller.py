@@ -0,0 +1,302 @@
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Callable, TypeVar
+
+from pydantic import BaseModel
+
+from email_summarizer.models.actionable_email import ActionableEmail
+from email_summarizer.models.email import Email
+from email_summarizer.models.enums import EmailAccounts, FetchFormat
+from email_summarizer.models.prompt_config import PromptConfig
+from email_summarizer.models.report import EmailReport
+from email_summarizer.models.summary import Summary
+from email_summarizer.services.base_model_client import AbstractModelClient
+from email_summarizer.services.gmail import (
+    GMAIL_FETCH_FORMAT,
+    build_email_from_message,
+    get_message_details,
+    list_messages,
+)
+from email_summarizer.services.message_ledger import (
+    LEDGER_LISTING_SIZE,
+    filter_reported,
+)
+from email_summarizer.utils.ai_utils import (
+    LLM_CONCURRENCY,
+    assemble_email_report,
+    body_budget,
+    build_actionable_email_from_prompt,
+    build_or_fallback,
+    build_summary_from_prompt,
+    fallback_actionable_email,
+    fallback_summary,
+    is_long_email,
+    local_summary,
+    submit_long_summary,
+    summary_prompt_payload,
+)
+from email_summarizer.utils.deadline_utils import Deadline, seconds_left
+from email_summarizer.utils.email_utils import EmailPromptPayload, email_to_prompt
+from email_summarizer.utils.gmail_utils import get_gmail_service
+from email_summarizer.utils.grouping_utils import (
+    GroupingCategory,
+    build_grouping_categories,
+    classify_email,
+    tally_grouped_emails,
+)
+from email_summarizer.utils.pipeline_utils import (
+    DEFAULT_QUEUE_SIZE,
+    Stage,
+    run_pipeline,
+)
+
+LOG = logging.getLogger()
+
+# Workers per pipeline stage, e.g. "fetch=1,parse=2,redact=2,summarize=4".
+# The Gmail client is not thread-safe, so fetch should stay at one worker.
+# Delivery is not a stage: the report is sent once, after the pipeline.
+PIPELINE_CONCURRENCY = os.getenv("PIPELINE_CONCURRENCY", "")
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", DEFAULT_QUEUE_SIZE))
+
+DEFAULT_STAGE_CONCURRENCY = {
+    "fetch": 1,
+    "parse": 1,
+    "classify": 1,
+    "redact": 2,
+    "summarize": LLM_CONCURRENCY,
+}
+
+
+T = TypeVar("T")
+
+
+class PipelineItem(BaseModel):
+    """An email on its way through the report pipeline."""
+
+    email: Email
+    high_priority: bool = False
+    prompt_payload: EmailPromptPayload | None = None
+    summary: Summary | None = None
+    actionable_email: ActionableEmail | None = None
+
+
+def stage_concurrency(spec: str = PIPELINE_CONCURRENCY) -> dict[str, int]:
+    """
+    Workers per stage from a "stage=workers" comma-separated spec, on top of
+    DEFAULT_STAGE_CONCURRENCY.
+    """
+    concurrency = dict(DEFAULT_STAGE_CONCURRENCY)
+    for setting in spec.split(","):
+        if not setting.strip():
+            continue
+        name, _, workers = setting.partition("=")
+        name = name.strip().lower()
+        if name not in concurrency:
+            raise ValueError(
+                f"Unknown pipeline stage: {name}, expected one of "
+                + ", ".join(concurrency)
+            )
+        concurrency[name] = int(workers)
+    return concurrency
+
+
+async def stream_email_report(
+    client: AbstractModelClient,
+    email_account: EmailAccounts,
+    max_emails: int,
+    deadline: Deadline | None = None,
+    prompt_config: PromptConfig | None = None,
+    fetch_format: FetchFormat | None = None,
+    concurrency: dict[str, int] | None = None,
+    queue_size: int = PIPELINE_QUEUE_SIZE,
+) -> EmailReport:
+    """
+    Build the report by streaming each email through
+    fetch -> parse -> classify -> redact -> summarize.
+    Messages an earlier run already reported are dropped from the listing
+    before anything is fetched.
+
+    Emails are summarized while later ones are still being fetched instead
+    of waiting for the whole inbox at each step. Classification only needs
+    the sender, so it runs before redaction and grouped emails never have
+    their bodies decoded. The report keeps Gmail's order. Delivery is left
+    to the caller: the report goes out as one message once every email is
+    summarized, so there is no per-email deliver stage.
+
+    Raises:
+        EmailUnavailableError: If the gmail service is not available.
+        RefreshTokenInvalidError: If the refresh token is invalid.
+    """
+    fetch_format = fetch_format or FetchFormat(GMAIL_FETCH_FORMAT.upper())
+    concurrency = {**DEFAULT_STAGE_CONCURRENCY, **(concurrency or stage_concurrency())}
+    gmail_service = await asyncio.to_thread(get_gmail_service, email_account)
+    listed_ids = [
+        message["id"]
+        for message in await asyncio.to_thread(
+            list_messages, gmail_service, max(max_emails, LEDGER_LISTING_SIZE)
+        )
+    ]
+    new_ids = await asyncio.to_thread(filter_reported, email_account, listed_ids)
+    message_ids = new_ids[:max_emails]
+    positions = {message_id: index for index, message_id in enumerate(message_ids)}
+    grouping_categories = build_grouping_categories()
+    parsed_ids: list[str] = []
+    items: list[PipelineItem] = []
+
+    # Every model call, long emails' chunk calls included, shares one pool
+    model_executor = ThreadPoolExecutor(max_workers=concurrency["summarize"])
+    try:
+        await run_pipeline(
+            message_ids,
+            [
+                Stage(
+                    "fetch",
+                    partial(
+                        get_message_details, gmail_service, fetch_format=fetch_format
+                    ),
+                    concurrency["fetch"],
+                ),
+                Stage(
+                    "parse",
+                    partial(_parse_message, fetch_format=fetch_format),
+                    concurrency["parse"],
+                ),
+                Stage(
+                    "classify",
+                    partial(
+                        _classify,
+                        grouping_categories=grouping_categories,
+                        parsed_ids=parsed_ids,
+                    ),
+                    concurrency["classify"],
+                ),
+                Stage(
+                    "redact",
+                    partial(_redact, prompt_config=prompt_config),
+                    concurrency["redact"],
+                ),
+                Stage(
+                    "summarize",
+                    partial(
+                        _summarize, client, executor=model_executor, deadline=deadline
+                    ),
+                    concurrency["summarize"],
+                ),
+            ],
+            items.append,
+            queue_size=queue_size,
+        )
+    finally:
+        model_executor.shutdown(wait=False, cancel_futures=True)
+
+    items.sort(key=lambda item: positions[item.email.id])
+    email_report = assemble_email_report(
+        email_account,
+        summaries=[item.summary for item in items if item.summary],
+        grouped_emails=tally_grouped_emails(grouping_categories),
+        actionable_emails=[
+            item.actionable_email for item in items if item.actionable_email
+        ],
+    )
+    email_report.reported_message_ids = sorted(parsed_ids, key=positions.__getitem__)
+    return email_report
+
+
+def _parse_message(message: dict, fetch_format: FetchFormat) -> Email:
+    return build_email_from_message(message["id"], message, fetch_format)
+
+
+async def _classify(
+    email: Email, grouping_categories: list[GroupingCategory], parsed_ids: list[str]
+) -> PipelineItem | None:
+    parsed_ids.append(email.id)
+    grouping_category = classify_email(email, grouping_categories)
+    if grouping_category is None:
+        # Confidently classified emails skip redaction and the model call. The
+        # classifier loads its weights and runs NumPy, so keep it off the loop.
+        summary = await asyncio.to_thread(local_summary, email)
+        return PipelineItem(email=email, summary=summary)
+    if grouping_category.high_priority:
+        return PipelineItem(email=email, high_priority=True)
+    # Grouped emails are only counted
+    return None
+
+
+def _redact(item: PipelineItem, prompt_config: PromptConfig | None) -> PipelineItem:
+    if item.summary is not None:
+        return item
+    if item.high_priority:
+        item.prompt_payload = email_to_prompt(
+            item.email, body_token_budget=body_budget(prompt_config)
+        )
+    elif not is_long_email(item.email):
+        # Long emails are redacted chunk by chunk when summarized
+        item.prompt_payload = summary_prompt_payload(item.email, prompt_config)
+    return item
+
+
+async def _summarize(
+    client: AbstractModelClient,
+    item: PipelineItem,
+    executor: Executor,
+    deadline: Deadline | None,
+) -> PipelineItem:
+    if item.summary is not None:
+        return item
+    prompt_payload = item.prompt_payload
+    if item.high_priority:
+        # _redact always builds the payload of high-priority emails
+        assert prompt_payload is not None
+        actionable_email = await _run_model_call(
+            executor,
+            partial(build_actionable_email_from_prompt, prompt_payload=prompt_payload),
+            client,
+            item.email,
+            deadline,
+        )
+        item.actionable_email = actionable_email or fallback_actionable_email(
+            item.email
+        )
+    elif prompt_payload is None:
+        try:
+            item.summary = await asyncio.wait_for(
+                asyncio.wrap_future(
+                    submit_long_summary(executor, client, item.email, deadline)
+                ),
+                timeout=seconds_left(deadline),
+            )
+        except Exception as e:
+            LOG.warning("Falling back for email %s: %s", item.email.id, e)
+            item.summary = fallback_summary(item.email)
+    else:
+        summary = await _run_model_call(
+            executor,
+            partial(build_summary_from_prompt, prompt_payload=prompt_payload),
+            client,
+            item.email,
+            deadline,
+        )
+        item.summary = summary or fallback_summary(item.email)
+    return item
+
+
+async def _run_model_call(
+    executor: Executor,
+    build: Callable[[AbstractModelClient, Email], T],
+    client: AbstractModelClient,
+    email: Email,
+    deadline: Deadline | None,
+) -> T | None:
+    try:
+        return await asyncio.wait_for(
+            asyncio.wrap_future(
+                executor.submit(build_or_fallback, build, client, email, deadline)
+            ),
+            timeout=seconds_left(deadline),
+        )
+    except TimeoutError:
+        LOG.warning("Falling back for email %s: out of time", email.id)
+        return None
@@ -6,3 +6,5 @@ from email_summarizer.models.email import Email
 class ActionableEmail(BaseModel):
     email: Email
     next_steps: str
+    # Subject/snippet stand-in used when the model wasn't called in time.
+    is_fallback: bool = False
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+from email_summarizer.models.enums import EmailIntent
+
+
+class CategoryDigest(BaseModel):
+    intent: EmailIntent
+    body: str
+    email_count: int
+    # Some summaries were joined as-is because a reduce call failed.
+    is_fallback: bool = False
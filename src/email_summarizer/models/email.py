@@ -1,13 +1,54 @@
-from pydantic import BaseModel
+from typing import Callable
+
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class Email(BaseModel):
+    """
+    An email message.
+
+    The body can be given directly as body_preview, or through Email.lazy with
+    a body_loader that decodes and parses the raw payload. The loader only runs
+    on the first load_body() call and its result is kept in body_preview, so
+    emails that are grouped or skipped never pay for decoding their bodies.
+    Until then body_preview is None, for printing, copying, comparing and
+    model_dump alike.
+    """
+
     id: str
     subject: str
     sender: str
     date: str
     snippet: str
-    body_preview: str | None
+    body_preview: str | None = None
+
+    _body_loader: Callable[[], str | None] | None = PrivateAttr(default=None)
+
+    @classmethod
+    def lazy(cls, body_loader: Callable[[], str | None], **data: object) -> "Email":
+        """An email whose body is decoded by body_loader on first load_body()."""
+        email = cls.model_validate(data)
+        email._body_loader = body_loader
+        return email
+
+    @property
+    def body_loaded(self) -> bool:
+        return self._body_loader is None or "body_preview" in self.model_fields_set
+
+    def load_body(self) -> str | None:
+        """The body, running the loader the first time it is needed."""
+        if not self.body_loaded:
+            assert self._body_loader is not None
+            self.body_preview = self._body_loader()
+        # Drop the loader so the raw payload it holds can be freed
+        self._body_loader = None
+        return self.body_preview
+
+    def with_body(self, body_preview: str | None) -> "Email":
+        """A copy of this email with a different body."""
+        email = self.model_copy(update={"body_preview": body_preview})
+        email._body_loader = None
+        return email
 
     def __str__(self) -> str:
         return f"Email(id={self.id}, subject={self.subject}, sender={self.sender}, date={self.date}, snippet={self.snippet})"
@@ -16,3 +57,9 @@ class Email(BaseModel):
 class GroupedEmails(BaseModel):
     sender: str
     count: int
+    # One summary covering a cluster of similar emails, see cluster_summary_utils.
+    summary: str | None = None
+    # The cluster summary call failed and the subjects are listed instead.
+    is_fallback: bool = False
+    # Messages of a summarized cluster. Not rendered.
+    message_ids: list[str] = Field(default_factory=list, exclude=True)
@@ -12,3 +12,36 @@ class SupportedModel(Enum):
     CLAUDE_SONNET = "CLAUDE_SONNET"
     NOVA_MICRO = "NOVA_MICRO"
     DEEPSEEK = "DEEPSEEK"
+
+
+class DiscordDelivery(Enum):
+    GATEWAY = "GATEWAY"
+    REST = "REST"
+    WEBHOOK = "WEBHOOK"
+
+
+class HtmlTextEngine(Enum):
+    STREAMING = "STREAMING"
+    BEAUTIFULSOUP = "BEAUTIFULSOUP"
+
+
+class FetchFormat(Enum):
+    FULL = "FULL"
+    METADATA = "METADATA"
+    RAW = "RAW"
+
+
+class ReportPipeline(Enum):
+    STAGED = "STAGED"
+    STREAMING = "STREAMING"
+
+
+class EmailIntent(Enum):
+    TRANSACTION = "TRANSACTION"
+    SALE = "SALE"
+    SCHOOL = "SCHOOL"
+    REVIEW = "REVIEW"
+    INQUIRY = "INQUIRY"
+    ALERT = "ALERT"
+    SOCIAL = "SOCIAL"
+    OTHER = "OTHER"
@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+
+
+class PromptConfig(BaseModel):
+    # Most tokens of email body sent to the model; longer bodies are truncated.
+    body_token_budget: int
+    # Most body sentences kept by the extractive stage before summarizing.
+    # 0 sends the whole body.
+    extractive_sentences: int = 0
+    # Most characters of body the extracted sentences may add up to.
+    extractive_char_budget: int = 2000
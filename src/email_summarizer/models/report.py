@@ -1,6 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from email_summarizer.models.actionable_email import ActionableEmail
+from email_summarizer.models.digest import CategoryDigest
 from email_summarizer.models.email import GroupedEmails
 from email_summarizer.models.enums import EmailAccounts
 from email_summarizer.models.summary import Summary
@@ -12,6 +13,42 @@ class EmailReport(BaseModel):
     timestamp: str
     grouped_emails: list[GroupedEmails]
     actionable_emails: list[ActionableEmail]
+    # One short digest per intent category, set in digest mode.
+    digests: list[CategoryDigest] = Field(default_factory=list)
+    # Every message the report covers, grouped ones included. Not rendered.
+    reported_message_ids: list[str] = Field(default_factory=list, exclude=True)
+
+    def fallback_count(self) -> int:
+        return (
+            sum(summary.is_fallback for summary in self.summaries)
+            + sum(
+                actionable_email.is_fallback
+                for actionable_email in self.actionable_emails
+            )
+            + sum(grouped_email.is_fallback for grouped_email in self.grouped_emails)
+        )
+
+    def recordable_message_ids(self) -> list[str]:
+        """
+        The reported messages to leave out of later reports: all but those
+        shown as fallbacks, so a later run summarizes them properly.
+        """
+        fallback_ids = {
+            summary.email.id for summary in self.summaries if summary.is_fallback
+        }
+        fallback_ids.update(
+            actionable_email.email.id
+            for actionable_email in self.actionable_emails
+            if actionable_email.is_fallback
+        )
+        for grouped_email in self.grouped_emails:
+            if grouped_email.is_fallback:
+                fallback_ids.update(grouped_email.message_ids)
+        return [
+            message_id
+            for message_id in self.reported_message_ids
+            if message_id not in fallback_ids
+        ]
 
     def is_empty(self) -> bool:
         return (
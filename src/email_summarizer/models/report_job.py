@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+from email_summarizer.models.enums import EmailAccounts, SupportedModel
+
+
+class ReportJob(BaseModel):
+    email_account: EmailAccounts
+    target_model: SupportedModel
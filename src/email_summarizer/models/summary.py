@@ -6,3 +6,7 @@ from email_summarizer.models.email import Email
 class Summary(BaseModel):
     body: str
     email: Email
+    # Subject/snippet stand-in used when the model wasn't called in time.
+    is_fallback: bool = False
+    # Template line from the local intent classifier; no model call was made.
+    is_local: bool = False
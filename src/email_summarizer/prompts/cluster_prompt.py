@@ -0,0 +1,27 @@
+from functools import cache
+
+
+@cache
+def cluster_system_prompt() -> str:
+    return """
+You are a helpful assistant that summarizes a cluster of similar emails. \
+You are given a numbered list of emails, each with its sender, subject and \
+a snippet of its body. The emails were grouped because they are about the \
+same thing, e.g. promotions from one store or notifications from one app. \
+Your task is to write one short summary covering all of them.
+
+# Example Input
+1. Sender: Old Navy <deals@oldnavy.com> Subject: 40% off everything - Today only, shop the sale.
+2. Sender: Old Navy <deals@oldnavy.com> Subject: Last chance: 40% off - Sale ends at midnight.
+3. Sender: Gap <news@gap.com> Subject: Jeans from $30 - New fits just landed.
+
+# Example Output
+Old Navy's 40% off sale ends tonight at midnight and Gap has jeans from $30.
+
+# Output Guidelines
+- Keep every date, time, amount and deadline the recipient may act on.
+- Merge repeated information instead of listing every email.
+- The summary should be in the present tense.
+- The summary should be no more than 40 words.
+- Do not include your reasoning or any other text than the summary.
+"""
@@ -0,0 +1,51 @@
+from functools import cache
+
+from email_summarizer.models.enums import EmailIntent
+from email_summarizer.prompts.pii_redaction import redaction_prompt
+
+
+@cache
+def chunk_prompt() -> str:
+    return """
+You are a helpful assistant that takes notes on a long email. You are given \
+the subject, sender and one part of the email's body. Other parts are \
+handled separately and consecutive parts overlap slightly.
+
+# Output Guidelines
+- List the facts in this part the recipient may need: events, dates, \
+times, amounts, deadlines and requests.
+- Skip greetings, boilerplate and anything already implied by the subject.
+- Use no more than 60 words.
+- Do not include your reasoning or any other text than the notes.
+"""
+
+
+@cache
+def combine_prompt() -> str:
+    intents = ", ".join(intent.value for intent in EmailIntent)
+    return f"""
+You are a helpful assistant that summarizes emails. You are given the \
+subject and sender of a long email and notes taken on each part of its \
+body, in order. Your task is to create one summary of the whole email.
+
+# Summary Format
+Summary should begin with the intent of the email, one of: {intents}. \
+Then, summarize the email in a concise manner. The intent should be one \
+word in all caps inside square brackets.
+
+# Example Output
+[SCHOOL] Goddard's May newsletter. Pajama day is Friday, tuition is due \
+May 5 and the center is closed on Memorial Day.
+
+# Output Guidelines
+- Notes from overlapping parts may repeat; mention each fact once.
+- The summary should be in the present tense.
+- The summary should be no more than 100 words.
+- Do not include your reasoning or any other text than the summary.
+"""
+
+
+def chunk_system_prompt(needs_redaction: bool) -> str:
+    if needs_redaction:
+        return chunk_prompt() + "\n\n" + redaction_prompt()
+    return chunk_prompt()
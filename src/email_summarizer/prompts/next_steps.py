@@ -1,5 +1,7 @@
+from functools import cache
+
 from email_summarizer.models.email import Email
-from email_summarizer.prompts.pii_redaction import REDACTION_PROMPT
+from email_summarizer.prompts.pii_redaction import redaction_prompt
 from email_summarizer.utils.email_utils import email_to_prompt
 
 example_email = Email(
@@ -51,7 +53,11 @@ Total	$16.45
 """,
 )
 
-NEXT_STEPS_PROMPT = f"""
+
+# Built on first use: rendering the example input runs email_to_prompt.
+@cache
+def next_steps_prompt() -> str:
+    return f"""
 You are a helpful assistant that summarizes emails and determines the \
 next steps. You are given an email that includes the subject, sender, \
 and body. Your task is to create a summary of the email and determine \
@@ -102,5 +108,5 @@ NEXT STEPS: Pick up at 8:30 PM at 123 West Alpha Blvd, Chatham, NC 55123.
 
 def next_steps_system_prompt(needs_redaction: bool) -> str:
     if needs_redaction:
-        return NEXT_STEPS_PROMPT + "\n\n" + REDACTION_PROMPT
-    return NEXT_STEPS_PROMPT
+        return next_steps_prompt() + "\n\n" + redaction_prompt()
+    return next_steps_prompt()
@@ -1,5 +1,7 @@
+from functools import cache
+
 from email_summarizer.models.email import Email
-from email_summarizer.prompts.pii_redaction import REDACTION_PROMPT
+from email_summarizer.prompts.pii_redaction import redaction_prompt
 from email_summarizer.utils.email_utils import email_to_prompt
 
 example_email = Email(
@@ -39,7 +41,11 @@ Thank you for ordering online with Mellow Mushroom.
 """,
 )
 
-SUMMARY_PROMPT = f"""
+
+# Built on first use: rendering the example input runs email_to_prompt.
+@cache
+def summary_prompt() -> str:
+    return f"""
 You are a helpful assistant that summarizes emails. You are given an email \
 that includes the subject, sender, and body. Your task is to create a \
 summary of the email.
@@ -66,6 +72,13 @@ in a concise manner. The intent should be one word in all caps inside square \
 brackets.
 
 
+# Recurring Emails
+When the input ends with a previous summary, the sender sends this email \
+regularly from a template and the body only holds the lines that changed \
+since the previous email. Summarize what is new, using the previous summary \
+for context only.
+
+
 # Example Input
 {email_to_prompt(example_email, disable_redaction=True)["prompt_body"]}
 
@@ -84,5 +97,5 @@ brackets.
 
 def summary_system_prompt(needs_redaction: bool) -> str:
     if needs_redaction:
-        return SUMMARY_PROMPT + "\n\n" + REDACTION_PROMPT
-    return SUMMARY_PROMPT
+        return summary_prompt() + "\n\n" + redaction_prompt()
+    return summary_prompt()
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+from typing import TYPE_CHECKING
+
+from email_summarizer.app import DISCORD_DELIVERY, build_rest_client, run_bot_jobs
+from email_summarizer.models.enums import DiscordDelivery
+from email_summarizer.models.report_job import ReportJob
+from email_summarizer.utils.deadline_utils import Deadline
+
+if TYPE_CHECKING:
+    from email_summarizer.services.discord_rest import DiscordRestClient
+
+LOG = logging.getLogger()
+
+
+class WarmRuntime:
+    """
+    Keeps one event loop and a logged-in Discord REST client alive across
+    warm Lambda invocations.
+
+    Gmail services and model clients are already cached per process, so a
+    warm invocation pays no connection setup. A gateway session can't
+    survive the container being frozen, so GATEWAY delivery only reuses the
+    loop.
+    """
+
+    loop: asyncio.AbstractEventLoop | None
+    rest_client: "DiscordRestClient | None"
+
+    def __init__(self):
+        self.loop = None
+        self.rest_client = None
+
+    def run(self, jobs: list[ReportJob], deadline: Deadline | None = None) -> None:
+        loop = self._get_loop()
+        try:
+            delivered = loop.run_until_complete(self._run(jobs, deadline))
+        except Exception:
+            # Start from a clean client on the next invocation.
+            loop.run_until_complete(self._reset_rest_client())
+            raise
+        if not delivered:
+            # Failed posts are logged and swallowed; don't reuse the connection.
+            LOG.warning("Discord delivery failed, reconnecting next invocation.")
+            loop.run_until_complete(self._reset_rest_client())
+
+    def close(self) -> None:
+        if self.loop is None or self.loop.is_closed():
+            return
+        self.loop.run_until_complete(self._reset_rest_client())
+        self.loop.close()
+        self.loop = None
+
+    async def _run(self, jobs: list[ReportJob], deadline: Deadline | None) -> bool:
+        delivery = DiscordDelivery(DISCORD_DELIVERY.upper())
+        if delivery == DiscordDelivery.GATEWAY:
+            return await run_bot_jobs(jobs, deadline=deadline)
+        if self.rest_client is None:
+            LOG.info("Connecting Discord %s client...", delivery.value)
+            rest_client = build_rest_client(delivery)
+            await rest_client.login()
+            self.rest_client = rest_client
+        else:
+            LOG.info("Reusing Discord %s client.", delivery.value)
+        return await run_bot_jobs(jobs, rest_client=self.rest_client, deadline=deadline)
+
+    async def _reset_rest_client(self) -> None:
+        if self.rest_client is not None:
+            await self.rest_client.close()
+        self.rest_client = None
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        if self.loop is None or self.loop.is_closed():
+            self.loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self.loop)
+        return self.loop
+
+
+_WARM_RUNTIME: WarmRuntime | None = None
+
+
+def get_warm_runtime() -> WarmRuntime:
+    global _WARM_RUNTIME
+    if _WARM_RUNTIME is None:
+        _WARM_RUNTIME = WarmRuntime()
+    return _WARM_RUNTIME
@@ -3,14 +3,13 @@ import os
 from enum import Enum
 from typing import Any, Dict, Optional
 
-import boto3
-from botocore.exceptions import ClientError
 from dotenv import load_dotenv
 
 from email_summarizer.services.base_model_client import (
     AbastractModelResponse,
     AbstractModelClient,
 )
+from email_summarizer.services.bedrock_client import bedrock_config
 
 load_dotenv()
 
@@ -89,6 +88,9 @@ class AnthropicClient(AbstractModelClient):
         Raises:
             Exception: If client creation fails
         """
+        # Imported here so boto3 loads on first use rather than at import time.
+        import boto3
+
         try:
             # Using default credentials from environment or AWS config
             session = boto3.Session(
@@ -96,7 +98,7 @@ class AnthropicClient(AbstractModelClient):
                 aws_secret_access_key=os.getenv("BOTO_SECRET_ACCESS_KEY"),
                 region_name=self.region_name,
             )
-            return session.client("bedrock-runtime")
+            return session.client("bedrock-runtime", config=bedrock_config())
         except Exception as e:
             self.logger.error(f"Failed to create Bedrock client: {e}")
             raise
@@ -135,6 +137,8 @@ class AnthropicClient(AbstractModelClient):
             KeyError: If the response has an unexpected structure
             Exception: For any other unexpected errors
         """
+        from botocore.exceptions import ClientError
+
         model_id = model_id or self.default_model_id
 
         conversation = [
@@ -177,8 +181,12 @@ class AnthropicClient(AbstractModelClient):
                 if "text" in block:
                     response_text = block["text"]
 
+            usage = response.get("usage") or {}
             return AnthropicModelResponse(
-                reasoning=reasoning_text, response=response_text
+                reasoning=reasoning_text,
+                response=response_text,
+                input_tokens=usage.get("inputTokens"),
+                output_tokens=usage.get("outputTokens"),
             )
 
         except ClientError as e:
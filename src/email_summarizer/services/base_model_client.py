@@ -7,10 +7,19 @@ from email_summarizer.services.bedrock_client import BedrockClient
 
 
 class AbastractModelResponse(BaseModel):
+    # Token usage reported by Bedrock, when the model returns it.
+    input_tokens: int | None = None
+    output_tokens: int | None = None
+
     @abstractmethod
     def get_response(self) -> str:
         pass
 
+    def total_tokens(self) -> int | None:
+        if self.input_tokens is None and self.output_tokens is None:
+            return None
+        return (self.input_tokens or 0) + (self.output_tokens or 0)
+
 
 class AbstractModelClient:
     @abstractmethod
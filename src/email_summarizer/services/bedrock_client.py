@@ -1,7 +1,30 @@
 import os
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-import boto3
+if TYPE_CHECKING:
+    from botocore.config import Config
+
+# p99 latency budget for a single model call. Bedrock answers once the
+# whole response is generated, so the client's read timeout bounds the call.
+LLM_CALL_TIMEOUT_SECONDS = float(os.getenv("LLM_CALL_TIMEOUT_SECONDS", 20))
+BEDROCK_CONNECT_TIMEOUT_SECONDS = float(os.getenv("BEDROCK_CONNECT_TIMEOUT_SECONDS", 5))
+
+
+def bedrock_config() -> "Config":
+    """
+    botocore config of every Bedrock runtime client. Timeouts are enforced by
+    the client, so a slow call is closed rather than left running in the
+    background while it is retried. botocore's own retries are off: throttling
+    is retried by ResilientModelClient and transient errors by
+    call_with_retries.
+    """
+    from botocore.config import Config
+
+    return Config(
+        connect_timeout=BEDROCK_CONNECT_TIMEOUT_SECONDS,
+        read_timeout=LLM_CALL_TIMEOUT_SECONDS,
+        retries={"mode": "standard", "total_max_attempts": 1},
+    )
 
 
 class BedrockClient:
@@ -15,11 +38,15 @@ class BedrockClient:
         aws_access_key: str,
         aws_secret_access_key: str,
     ):
+        # Imported here so boto3 loads on first use rather than at import time.
+        import boto3
+
         self.boto3_client = boto3.client(
             service_name=service_name,
             region_name=region,
             aws_access_key_id=aws_access_key,
             aws_secret_access_key=aws_secret_access_key,
+            config=bedrock_config(),
         )
 
     def invoke_model(self, **kwargs):
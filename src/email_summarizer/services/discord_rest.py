@@ -0,0 +1,177 @@
+import asyncio
+import logging
+from typing import Any
+
+import aiohttp
+import discord
+from pydantic import BaseModel
+from yarl import URL
+
+LOG = logging.getLogger(__name__)
+
+DISCORD_API_BASE = "https://discord.com/api/v10"
+MAX_RATE_LIMIT_RETRIES = 4
+
+
+class DiscordRestUser(BaseModel):
+    id: str
+    name: str
+
+
+class DiscordRestChannel:
+    """
+    Minimal stand-in for a discord.py text channel that posts over HTTP.
+    """
+
+    id: int
+    name: str
+
+    def __init__(self, client: "DiscordRestClient", channel_id: int, url: str):
+        self.client = client
+        self.id = channel_id
+        self.name = str(channel_id)
+        self.url = url
+
+    def __str__(self) -> str:
+        return self.name
+
+    async def send(self, content: str) -> dict:
+        return await self.client.post_message(self.url, content)
+
+
+class DiscordRestClient:
+    """
+    Delivers messages through Discord's HTTP API without a gateway session.
+
+    Exposes the subset of the discord.Client interface used by
+    put_email_report (user, get_channel, close) so either client can be
+    passed to the report flow. When a webhook URL is given, messages are
+    posted to the webhook and no bot token is required.
+    """
+
+    bot_token: str | None
+    webhook_url: str | None
+    user: DiscordRestUser | None
+
+    def __init__(
+        self,
+        bot_token: str | None = None,
+        webhook_url: str | None = None,
+        session: aiohttp.ClientSession | None = None,
+    ):
+        if not bot_token and not webhook_url:
+            raise ValueError("Either a bot token or a webhook URL must be provided")
+        self.bot_token = bot_token
+        self.webhook_url = webhook_url
+        self.user = None
+        self._session = session
+
+    @property
+    def uses_webhook(self) -> bool:
+        return self.webhook_url is not None
+
+    async def login(self) -> DiscordRestUser:
+        """
+        Resolve the identity messages will be posted as.
+
+        Raises:
+            discord.errors.LoginFailure: If the token or webhook is rejected.
+        """
+        if self.webhook_url is not None:
+            url = self.webhook_url
+        else:
+            url = f"{DISCORD_API_BASE}/users/@me"
+        response, payload = await self._request("GET", url)
+        if response.status in (401, 403, 404):
+            raise discord.errors.LoginFailure("Discord rejected the credentials.")
+        _raise_for_status(response, payload)
+        if self.uses_webhook:
+            self.user = DiscordRestUser(
+                id=str(payload.get("id")), name=payload.get("name") or "webhook"
+            )
+        else:
+            self.user = DiscordRestUser(
+                id=str(payload.get("id")), name=payload.get("username") or "bot"
+            )
+        return self.user
+
+    def get_channel(self, channel_id: int) -> DiscordRestChannel:
+        if self.webhook_url is not None:
+            # Keep any query the webhook already has, e.g. thread_id
+            url = str(URL(self.webhook_url).update_query(wait="true"))
+        else:
+            url = f"{DISCORD_API_BASE}/channels/{channel_id}/messages"
+        return DiscordRestChannel(self, channel_id, url)
+
+    async def post_message(self, url: str, content: str) -> dict:
+        """
+        Post a message, waiting out 429 responses.
+
+        Raises:
+            discord.errors.Forbidden: If the bot may not post in the channel.
+            discord.errors.HTTPException: For any other failed request.
+        """
+        for _ in range(MAX_RATE_LIMIT_RETRIES):
+            response, payload = await self._request("POST", url, {"content": content})
+            if response.status != 429:
+                _raise_for_status(response, payload)
+                return payload
+            retry_after = float(payload.get("retry_after", 1.0))
+            LOG.warning("Rate limited by Discord, retrying in %.2fs", retry_after)
+            await asyncio.sleep(retry_after)
+        raise discord.errors.HTTPException(
+            response, "Exceeded retries while rate limited"
+        )
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _request(
+        self, method: str, url: str, json_body: dict | None = None
+    ) -> tuple[Any, dict]:
+        try:
+            return await self._send_request(method, url, json_body)
+        except aiohttp.ClientConnectionError as e:
+            # Pooled connections go stale while a warm Lambda is frozen;
+            # reconnect with a fresh session and try once more.
+            LOG.warning("Discord connection failed (%s), reconnecting", e)
+            await self.close()
+            return await self._send_request(method, url, json_body)
+
+    async def _send_request(
+        self, method: str, url: str, json_body: dict | None
+    ) -> tuple[Any, dict]:
+        session = self._get_session()
+        async with session.request(
+            method, url, json=json_body, headers=self._headers()
+        ) as response:
+            try:
+                payload = await response.json()
+            except (aiohttp.ContentTypeError, ValueError):
+                payload = {}
+            return response, payload or {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=15),
+            )
+        return self._session
+
+    def _headers(self) -> dict[str, Any]:
+        headers = {"Content-Type": "application/json"}
+        if not self.uses_webhook:
+            headers["Authorization"] = f"Bot {self.bot_token}"
+        return headers
+
+
+def _raise_for_status(response: Any, payload: dict) -> None:
+    if response.status == 403:
+        raise discord.errors.Forbidden(response, payload)
+    if response.status == 404:
+        raise discord.errors.NotFound(response, payload)
+    if response.status >= 400:
+        raise discord.errors.HTTPException(response, payload)
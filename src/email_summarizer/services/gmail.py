@@ -2,24 +2,36 @@ import base64
 import logging
 import os
 import os.path
-from typing import Optional
+import threading
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow  # type: ignore
-from googleapiclient.discovery import build  # type: ignore
-from googleapiclient.errors import HttpError  # type: ignore
 
 from email_summarizer.models.email import Email
-from email_summarizer.models.enums import EmailAccounts
+from email_summarizer.models.enums import EmailAccounts, FetchFormat
 from email_summarizer.services.refresh_token import is_refresh_token_valid
+from email_summarizer.utils.cleaning_utils import clean_body
 from email_summarizer.utils.gmail_credentials import build_gmail_credentials
+from email_summarizer.utils.html_utils import html_to_text
+from email_summarizer.utils.mime_utils import (
+    DEFAULT_CHARSET,
+    PLAIN_TEXT,
+    BodyPart,
+    decode_bytes,
+    find_body_part,
+)
+
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
 
 if __name__ == "__main__":
     load_dotenv()
 
+# Google client libraries and BeautifulSoup are imported inside the functions
+# that use them so importing this module stays cheap on Lambda cold starts.
+# The local OAuth flow (google_auth_oauthlib) is never imported in Lambda.
+
 
 class RefreshTokenInvalidError(Exception):
     pass
@@ -30,14 +42,25 @@ class RefreshTokenInvalidError(Exception):
 SCOPES = ["https://www.googleapis.com/auth/gmail.readonly"]  # Read-only access
 CLIENT_SECRET_FILE = "client_secret.json"  # Path to your client secret file
 TOKEN_FILE = "token.json"  # Stores the user's access and refresh tokens
+# Message format to fetch: FULL (JSON MIME tree), RAW (RFC 2822) or METADATA
+# (headers and snippet only, no body)
+GMAIL_FETCH_FORMAT = os.getenv("GMAIL_FETCH_FORMAT", FetchFormat.FULL.value)
+METADATA_HEADERS = ("Subject", "From", "Date")
 # --- End Configuration ---
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Credentials kept across warm invocations, keyed by account.
+_CACHED_CREDENTIALS: dict[EmailAccounts, "Credentials"] = {}
+_CACHED_CREDENTIALS_LOCK = threading.Lock()
+# A service holds one httplib2.Http, which is not thread-safe, so each thread
+# keeps its own services built on the shared credentials.
+_THREAD_SERVICES = threading.local()
+
 
-def load_credentials_from_file() -> Optional[Credentials]:
+def load_credentials_from_file() -> Optional["Credentials"]:
     """Load credentials from the token file if it exists.
 
     Returns:
@@ -46,6 +69,8 @@ def load_credentials_from_file() -> Optional[Credentials]:
     if not os.path.exists(TOKEN_FILE):
         return None
 
+    from google.oauth2.credentials import Credentials
+
     try:
         return Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
     except ValueError as e:
@@ -53,7 +78,7 @@ def load_credentials_from_file() -> Optional[Credentials]:
         return None
 
 
-def refresh_credentials(creds: Credentials) -> Optional[Credentials]:
+def refresh_credentials(creds: "Credentials") -> Optional["Credentials"]:
     """Refresh expired credentials if possible.
 
     Args:
@@ -65,6 +90,8 @@ def refresh_credentials(creds: Credentials) -> Optional[Credentials]:
     if not (creds and creds.expired and creds.refresh_token):
         return None
 
+    from google.auth.transport.requests import Request
+
     try:
         logger.info("Credentials expired, refreshing...")
         creds.refresh(Request())
@@ -75,7 +102,7 @@ def refresh_credentials(creds: Credentials) -> Optional[Credentials]:
         return None
 
 
-def locally_create_credentials() -> Optional[Credentials]:
+def locally_create_credentials() -> Optional["Credentials"]:
     """Create new credentials through the OAuth flow.
 
     Returns:
@@ -87,6 +114,8 @@ def locally_create_credentials() -> Optional[Credentials]:
         )
         return None
 
+    from google_auth_oauthlib.flow import InstalledAppFlow  # type: ignore
+
     try:
         logger.info(f"Starting authentication flow using {CLIENT_SECRET_FILE}...")
         flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRET_FILE, SCOPES)
@@ -99,7 +128,7 @@ def locally_create_credentials() -> Optional[Credentials]:
         return None
 
 
-def save_credentials(creds: Credentials | None) -> bool:
+def save_credentials(creds: "Credentials | None") -> bool:
     """Save credentials to the token file.
 
     Args:
@@ -121,7 +150,7 @@ def save_credentials(creds: Credentials | None) -> bool:
         return False
 
 
-def build_gmail_service(creds: Credentials | None):
+def build_gmail_service(creds: "Credentials | None"):
     """Build and return the Gmail API service.
 
     Args:
@@ -133,6 +162,9 @@ def build_gmail_service(creds: Credentials | None):
     if not creds:
         return None
 
+    from googleapiclient.discovery import build  # type: ignore
+    from googleapiclient.errors import HttpError  # type: ignore
+
     try:
         service = build("gmail", "v1", credentials=creds)
         logger.info("Gmail API service created successfully.")
@@ -149,17 +181,41 @@ def authenticate_gmail(email_account: EmailAccounts):
     """Shows basic usage of the Gmail API.
     Handles user authentication and returns the Gmail API service object.
 
+    A service built by an earlier call on the same thread is reused while
+    its access token is still valid, so warm invocations skip the token
+    exchange and build. Other threads build their own service on the same
+    credentials.
+
     Returns:
         The Gmail API service or None if authentication fails
     """
+    services = _thread_services()
+    cached = services.get(email_account)
+    if cached is not None and cached[0].valid:
+        logger.info("Reusing Gmail API service.")
+        return cached[1]
+
+    with _CACHED_CREDENTIALS_LOCK:
+        creds = _CACHED_CREDENTIALS.get(email_account)
+    if creds is None or not creds.valid:
+        creds = build_gmail_credentials(email_account)
+
+        if not is_refresh_token_valid(creds):
+            raise RefreshTokenInvalidError("Refresh token is invalid.")
+        with _CACHED_CREDENTIALS_LOCK:
+            _CACHED_CREDENTIALS[email_account] = creds
 
-    creds = build_gmail_credentials(email_account)
+    # Build and return the service
+    service = build_gmail_service(creds)
+    if service:
+        services[email_account] = (creds, service)
+    return service
 
-    if not is_refresh_token_valid(creds):
-        raise RefreshTokenInvalidError("Refresh token is invalid.")
 
-    # Build and return the service
-    return build_gmail_service(creds)
+def _thread_services() -> dict[EmailAccounts, tuple["Credentials", Any]]:
+    if not hasattr(_THREAD_SERVICES, "services"):
+        _THREAD_SERVICES.services = {}
+    return _THREAD_SERVICES.services
 
 
 def list_messages(service, max_results=10):
@@ -176,6 +232,8 @@ def list_messages(service, max_results=10):
         logger.error("Gmail service not available.")
         return []
 
+    from googleapiclient.errors import HttpError  # type: ignore
+
     try:
         # Call the Gmail API to list messages
         # 'me' is a special value indicating the authenticated user
@@ -203,12 +261,15 @@ def list_messages(service, max_results=10):
         return []
 
 
-def get_message_details(service, message_id):
+def get_message_details(
+    service, message_id, fetch_format: FetchFormat = FetchFormat.FULL
+):
     """Get detailed information about a specific message.
 
     Args:
         service: The Gmail API service
         message_id: The ID of the message to retrieve
+        fetch_format: The Gmail API format to request the message in
 
     Returns:
         The message details or None if retrieval fails
@@ -216,18 +277,24 @@ def get_message_details(service, message_id):
     if not service or not message_id:
         return None
 
+    from googleapiclient.errors import HttpError  # type: ignore
+
     try:
         # Get the full message details
         # format='metadata' gets headers only (faster)
         # format='full' gets headers, body, structure
         # format='raw' gets the raw RFC 2822 message (needs parsing)
+        request_args = {}
+        if fetch_format == FetchFormat.METADATA:
+            request_args["metadataHeaders"] = list(METADATA_HEADERS)
         message = (
             service.users()
             .messages()
             .get(
                 userId="me",
                 id=message_id,
-                format="full",  # Request more details including snippet/payload
+                format=fetch_format.value.lower(),
+                **request_args,
             )
             .execute()
         )
@@ -273,58 +340,49 @@ def extract_headers(message):
     return {"subject": subject, "sender": sender, "date": date}
 
 
-def extract_body_data(message):
-    """Extract the body data from a message.
+def extract_body_part(message) -> BodyPart | None:
+    """Find the body part of a message, at any MIME nesting depth.
+
+    text/plain is preferred over text/html and attachments are skipped.
+    The part is returned undecoded.
 
     Args:
         message: The message object from the Gmail API
 
     Returns:
-        The body data as a string or None if not found
+        The body part or None if not found
     """
     if not message or "payload" not in message:
         return None
+    return find_body_part(message.get("payload", {}))
 
-    payload = message.get("payload", {})
 
-    # Check for multipart message
-    if "parts" in payload:
-        # It's a multipart message, look for text/plain or text/html
-        for part in payload["parts"]:
-            if part["mimeType"] == "text/plain":
-                body_data = part.get("body", {}).get("data")
-                if body_data:
-                    return body_data
-            elif part["mimeType"] == "text/html":
-                body_data = part.get("body", {}).get("data")
-                if body_data:
-                    return body_data
-    # Check for simple message
-    elif "body" in payload:
-        # It's a simple message
-        return payload.get("body", {}).get("data")
+def extract_body_data(message):
+    """Extract the body data from a message.
+
+    Args:
+        message: The message object from the Gmail API
 
-    return None
+    Returns:
+        The body data as a string or None if not found
+    """
+    body_part = extract_body_part(message)
+    return body_part.data if body_part else None
 
 
-def decode_body(body_data):
+def decode_body(body_data, charset: str = DEFAULT_CHARSET):
     """Decode Base64 encoded body data.
 
     Args:
         body_data: Base64 encoded body data
+        charset: Charset declared for the body
 
     Returns:
         Decoded body text or None if decoding fails
     """
     if not body_data:
         return None
-
-    try:
-        # Decode Base64
-        return base64.urlsafe_b64decode(body_data).decode("utf-8")
-    except Exception as e:
-        logger.error(f"Error decoding body: {e}")
-        return None
+    return BodyPart(mime_type="", data=body_data, charset=charset).decode()
 
 
 def format_message_info(email: Email):
@@ -345,8 +403,8 @@ def format_message_info(email: Email):
         f"Snippet: {email.snippet}",
     ]
 
-    if email.body_preview:
-        info.append(f"Body (first 100 chars): {email.body_preview}...")
+    if body_preview := email.load_body():
+        info.append(f"Body (first 100 chars): {body_preview}...")
 
     return "\n".join(info)
 
@@ -355,46 +413,166 @@ def parse_body(body_data: str | None) -> str | None:
     if body_data:
         decoded_body = decode_body(body_data)
         if decoded_body:
-            soup = BeautifulSoup(decoded_body, "html.parser")
-            return soup.get_text(separator=" ", strip=True)
+            return html_to_text(decoded_body)
     return None
 
 
-def build_email_from_message(msg_id: str, message: dict) -> Email:
-    headers = extract_headers(message)
+def parse_body_part(body_part: BodyPart | None) -> str | None:
+    """Decode a body part and reduce it to readable text."""
+    if body_part is None:
+        return None
+    decoded_body = body_part.decode()
+    if not decoded_body:
+        return None
+    if body_part.mime_type == PLAIN_TEXT:
+        return decoded_body.strip()
+    return html_to_text(decoded_body)
+
+
+def build_email_from_message(
+    msg_id: str, message: dict, fetch_format: FetchFormat = FetchFormat.FULL
+) -> Email:
+    """Build an Email from a message fetched in the given format.
+
+    Every format yields the same Email, except that METADATA messages carry
+    no body. Only the headers are parsed here; the body keeps its encoded
+    payload and is decoded, parsed and cleaned the first time it is read.
+    """
+    if fetch_format == FetchFormat.RAW:
+        raw_bytes = decode_raw_message(message.get("raw"))
+        headers = parse_raw_headers(raw_bytes)
+        body_loader = partial(parse_raw_body, raw_bytes)
+    else:
+        headers = extract_headers(message)
+        body_loader = partial(parse_body_part, extract_body_part(message))
+    return _build_email(msg_id, message, headers, body_loader)
+
+
+def parse_raw_message(raw: str | None) -> tuple[dict[str, str], str | None]:
+    """Parse a format='raw' message with the stdlib email package.
+
+    Args:
+        raw: The base64url encoded RFC 2822 message
+
+    Returns:
+        The subject/sender/date headers and the body text
+    """
+    raw_bytes = decode_raw_message(raw)
+    return parse_raw_headers(raw_bytes), parse_raw_body(raw_bytes)
+
+
+def decode_raw_message(raw: str | None) -> bytes | None:
+    if not raw:
+        return None
+    return base64.urlsafe_b64decode(raw)
+
+
+def parse_raw_headers(raw_bytes: bytes | None) -> dict[str, str]:
+    """Parse only the header block of a raw message, leaving the body alone."""
+    headers = {"subject": "No Subject", "sender": "No Sender", "date": "No Date"}
+    if not raw_bytes:
+        return headers
+
+    from email import policy
+    from email.parser import BytesParser
+
+    mime_message = BytesParser(policy=policy.default).parsebytes(
+        raw_bytes, headersonly=True
+    )
+    for key, header in (("subject", "subject"), ("sender", "from"), ("date", "date")):
+        if mime_message[header] is not None:
+            headers[key] = str(mime_message[header])
+    return headers
+
+
+def parse_raw_body(raw_bytes: bytes | None) -> str | None:
+    """Parse a raw message's MIME tree and reduce its body to readable text."""
+    if not raw_bytes:
+        return None
+
+    from email import policy
+    from email.parser import BytesParser
+
+    mime_message = BytesParser(policy=policy.default).parsebytes(raw_bytes)
+    body_part = mime_message.get_body(preferencelist=("plain", "html"))
+    if body_part is None:
+        return None
+    try:
+        content = body_part.get_content()
+    except (LookupError, UnicodeDecodeError):
+        payload = body_part.get_payload(decode=True)
+        content = decode_bytes(payload) if isinstance(payload, bytes) else ""
+    if not content:
+        return None
+    if body_part.get_content_type() == PLAIN_TEXT:
+        return content.strip()
+    return html_to_text(content)
+
+
+def _build_email(
+    msg_id: str,
+    message: dict,
+    headers: dict[str, str],
+    body_loader: Callable[[], str | None],
+) -> Email:
     snippet = message.get("snippet", "No snippet available.")
-    body_data = extract_body_data(message)
-    body_preview = parse_body(body_data)
-    return Email(
+    return Email.lazy(
+        partial(_load_clean_body, msg_id, body_loader),
         id=msg_id,
         subject=headers["subject"],
         sender=headers["sender"],
         date=headers["date"],
         snippet=snippet,
-        body_preview=body_preview,
     )
 
 
-def list_emails(service, max_results=10) -> list[Email]:
-    """Lists the user's email messages and prints basic info."""
+def _load_clean_body(msg_id: str, body_loader: Callable[[], str | None]) -> str | None:
+    body_preview = body_loader()
+    if not body_preview:
+        return body_preview
+    cleaned = clean_body(body_preview)
+    logger.debug(
+        "Cleaned email %s: removed %d chars (~%d tokens)",
+        msg_id,
+        cleaned["chars_removed"],
+        cleaned["tokens_removed"],
+    )
+    return cleaned["body"]
+
+
+def list_emails(
+    service,
+    max_results=10,
+    fetch_format: FetchFormat | None = None,
+    message_filter: Callable[[list[str]], list[str]] | None = None,
+    listing_size: int | None = None,
+) -> list[Email]:
+    """Lists the user's email messages and prints basic info.
+
+    message_filter narrows the listed message IDs before any details are
+    fetched; listing_size IDs are listed so enough remain after filtering.
+    """
+    fetch_format = fetch_format or FetchFormat(GMAIL_FETCH_FORMAT.upper())
     if not service:
         logger.error("Gmail service not available.")
         return []
 
-    messages = list_messages(service, max_results)
+    messages = list_messages(service, max(max_results, listing_size or 0))
     if not messages:
         return []
 
-    emails = []
-    for message_info in messages:
-        msg_id = message_info["id"]
+    message_ids = [message_info["id"] for message_info in messages]
+    if message_filter is not None:
+        message_ids = message_filter(message_ids)
 
+    emails = []
+    for msg_id in message_ids[:max_results]:
         # Get message details
-        message = get_message_details(service, msg_id)
+        message = get_message_details(service, msg_id, fetch_format)
         if not message:
             continue
 
-        email = build_email_from_message(msg_id, message)
+        email = build_email_from_message(msg_id, message, fetch_format)
         if email:
             emails.append(email)
 
@@ -0,0 +1,161 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+from email_summarizer.models.enums import EmailAccounts
+from email_summarizer.utils.bloom_utils import BloomFilter
+
+LOG = logging.getLogger(__name__)
+
+# SQLite file remembering which messages were already reported. It has to be
+# on persistent storage, e.g. an EFS mount on Lambda, where /tmp is wiped on
+# every cold start. Empty, the default, reports every unread email every run.
+LEDGER_PATH = os.getenv("LEDGER_PATH", "")
+LEDGER_RETENTION_DAYS = float(os.getenv("LEDGER_RETENTION_DAYS", 30))
+# Report unread emails again even if an earlier run already reported them.
+REINCLUDE_REPORTED = os.getenv("REINCLUDE_REPORTED", "false").lower() == "true"
+# Message IDs listed per run, so enough new ones remain after filtering.
+LEDGER_LISTING_SIZE = int(os.getenv("LEDGER_LISTING_SIZE", 100))
+MIN_BLOOM_CAPACITY = 1024
+SECONDS_PER_DAY = 24 * 60 * 60
+
+_LEDGERS: dict[EmailAccounts, "MessageLedger"] = {}
+_LEDGERS_LOCK = threading.Lock()
+
+
+class MessageLedger:
+    """
+    IDs of the messages already reported for one account.
+
+    The IDs live in SQLite and a Bloom filter of them is kept in memory, so
+    a listing is checked without touching the database except for the rare
+    IDs the filter reports as maybe seen. Entries older than retention_days
+    are dropped when the ledger is opened.
+    """
+
+    def __init__(
+        self,
+        email_account: EmailAccounts,
+        path: str,
+        retention_days: float = LEDGER_RETENTION_DAYS,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.email_account = email_account
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS reported_messages ("
+                "account TEXT NOT NULL, "
+                "message_id TEXT NOT NULL, "
+                "reported_at REAL NOT NULL, "
+                "PRIMARY KEY (account, message_id))"
+            )
+            self._connection.execute(
+                "DELETE FROM reported_messages WHERE account = ? AND reported_at < ?",
+                (self._account, clock() - retention_days * SECONDS_PER_DAY),
+            )
+        self._bloom_filter = self._load_bloom_filter()
+
+    @property
+    def _account(self) -> str:
+        return self.email_account.value
+
+    def filter_new(self, message_ids: list[str]) -> list[str]:
+        """The message IDs that have not been reported yet, in order."""
+        with self._lock:
+            maybe_reported = [
+                message_id
+                for message_id in message_ids
+                if message_id in self._bloom_filter
+            ]
+            reported = self._reported(maybe_reported)
+        new_ids = [
+            message_id for message_id in message_ids if message_id not in reported
+        ]
+        LOG.info(
+            "Ledger skipped %d already reported %s messages",
+            len(message_ids) - len(new_ids),
+            self._account,
+        )
+        return new_ids
+
+    def record(self, message_ids: list[str]) -> None:
+        if not message_ids:
+            return
+        reported_at = self._clock()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO reported_messages "
+                "(account, message_id, reported_at) VALUES (?, ?, ?)",
+                [
+                    (self._account, message_id, reported_at)
+                    for message_id in message_ids
+                ],
+            )
+            for message_id in message_ids:
+                self._bloom_filter.add(message_id)
+            if self._bloom_filter.count > self._bloom_filter.capacity:
+                self._bloom_filter = self._load_bloom_filter()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def _reported(self, message_ids: list[str]) -> set[str]:
+        if not message_ids:
+            return set()
+        placeholders = ",".join("?" * len(message_ids))
+        rows = self._connection.execute(
+            "SELECT message_id FROM reported_messages "
+            f"WHERE account = ? AND message_id IN ({placeholders})",
+            (self._account, *message_ids),
+        )
+        return {row[0] for row in rows}
+
+    def _load_bloom_filter(self) -> BloomFilter:
+        message_ids = [
+            row[0]
+            for row in self._connection.execute(
+                "SELECT message_id FROM reported_messages WHERE account = ?",
+                (self._account,),
+            )
+        ]
+        return BloomFilter.from_items(
+            message_ids, capacity=max(MIN_BLOOM_CAPACITY, 2 * len(message_ids))
+        )
+
+
+def get_message_ledger(email_account: EmailAccounts) -> MessageLedger | None:
+    """
+    Get the process-wide ledger for an account, or None when LEDGER_PATH is
+    not set.
+    """
+    if not LEDGER_PATH:
+        return None
+    with _LEDGERS_LOCK:
+        if email_account not in _LEDGERS:
+            _LEDGERS[email_account] = MessageLedger(email_account, LEDGER_PATH)
+        return _LEDGERS[email_account]
+
+
+def filter_reported(email_account: EmailAccounts, message_ids: list[str]) -> list[str]:
+    """
+    Drop messages an earlier run already reported, unless REINCLUDE_REPORTED
+    is set.
+    """
+    ledger = get_message_ledger(email_account)
+    if ledger is None or REINCLUDE_REPORTED:
+        return message_ids
+    return ledger.filter_new(message_ids)
+
+
+def record_reported(email_account: EmailAccounts, message_ids: list[str]) -> None:
+    if not message_ids:
+        return
+    ledger = get_message_ledger(email_account)
+    if ledger is not None:
+        ledger.record(message_ids)
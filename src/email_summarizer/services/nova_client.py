@@ -50,7 +50,12 @@ class NovaClient(BaseModelClient):
         if len(contents) == 0:
             raise ValueError("Empty content found in Nova response")
         text_content = contents[0]["text"]
-        return BaseModelResponse(response=text_content)
+        usage = response_body.get("usage") or {}
+        return BaseModelResponse(
+            response=text_content,
+            input_tokens=usage.get("inputTokens"),
+            output_tokens=usage.get("outputTokens"),
+        )
 
 
 class NovaClientFactory:
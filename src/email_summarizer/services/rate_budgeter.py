@@ -0,0 +1,195 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+from pydantic import BaseModel
+
+from email_summarizer.services.base_model_client import (
+    AbastractModelResponse,
+    AbstractModelClient,
+)
+from email_summarizer.utils.token_utils import estimate_tokens
+
+LOG = logging.getLogger(__name__)
+
+# Bedrock quotas for the account; unset means unlimited.
+BEDROCK_RPM_LIMIT = os.getenv("BEDROCK_RPM_LIMIT")
+BEDROCK_TPM_LIMIT = os.getenv("BEDROCK_TPM_LIMIT")
+# Output tokens assumed for a request until Bedrock reports actual usage.
+ESTIMATED_OUTPUT_TOKENS = 300
+WINDOW_SECONDS = 60.0
+
+
+class Reservation:
+    """
+    Quota taken for one request, adjusted once its actual usage is known.
+    """
+
+    def __init__(self, submitted_at: float, tokens: int):
+        self.submitted_at = submitted_at
+        self.tokens = tokens
+
+
+class RateUtilization(BaseModel):
+    requests: int
+    tokens: int
+    requests_per_minute: int | None
+    tokens_per_minute: int | None
+
+    @property
+    def request_utilization(self) -> float | None:
+        if not self.requests_per_minute:
+            return None
+        return self.requests / self.requests_per_minute
+
+    @property
+    def token_utilization(self) -> float | None:
+        if not self.tokens_per_minute:
+            return None
+        return self.tokens / self.tokens_per_minute
+
+
+class RateBudgeter:
+    """
+    Paces model requests to stay under requests- and tokens-per-minute
+    quotas over a sliding one-minute window.
+
+    Requests reserve their estimated tokens up front; reconcile() swaps the
+    estimate for the usage Bedrock reports, so the window tracks what was
+    actually spent and throughput can run right up to the quota.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        window_seconds: float = WINDOW_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.window_seconds = window_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._reservations: deque[Reservation] = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self, estimated_tokens: int) -> Reservation:
+        """
+        Block until the request fits under both limits, then reserve it.
+
+        A request larger than the whole token limit is let through on an
+        empty window rather than blocking forever.
+        """
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._prune(now)
+                wait_seconds = self._wait_seconds(now, estimated_tokens)
+                if wait_seconds <= 0:
+                    reservation = Reservation(now, estimated_tokens)
+                    self._reservations.append(reservation)
+                    return reservation
+            LOG.debug("Rate budget full, waiting %.2fs", wait_seconds)
+            self._sleep(wait_seconds)
+
+    def reconcile(self, reservation: Reservation, actual_tokens: int | None) -> None:
+        if actual_tokens is None:
+            return
+        with self._lock:
+            reservation.tokens = actual_tokens
+
+    def utilization(self) -> RateUtilization:
+        with self._lock:
+            self._prune(self._clock())
+            return RateUtilization(
+                requests=len(self._reservations),
+                tokens=sum(reservation.tokens for reservation in self._reservations),
+                requests_per_minute=self.requests_per_minute,
+                tokens_per_minute=self.tokens_per_minute,
+            )
+
+    def _prune(self, now: float) -> None:
+        while (
+            self._reservations
+            and now - self._reservations[0].submitted_at >= self.window_seconds
+        ):
+            self._reservations.popleft()
+
+    def _wait_seconds(self, now: float, estimated_tokens: int) -> float:
+        """Seconds until enough of the window expires for the request to fit."""
+        if not self._reservations:
+            return 0.0
+        wait_until = now
+        if (
+            self.requests_per_minute
+            and len(self._reservations) >= self.requests_per_minute
+        ):
+            index = len(self._reservations) - self.requests_per_minute
+            wait_until = max(wait_until, self._expires_at(index))
+        if self.tokens_per_minute:
+            excess = (
+                sum(reservation.tokens for reservation in self._reservations)
+                + estimated_tokens
+                - self.tokens_per_minute
+            )
+            for index, reservation in enumerate(self._reservations):
+                if excess <= 0:
+                    break
+                excess -= reservation.tokens
+                wait_until = max(wait_until, self._expires_at(index))
+        return wait_until - now
+
+    def _expires_at(self, index: int) -> float:
+        return self._reservations[index].submitted_at + self.window_seconds
+
+
+class BudgetedModelClient(AbstractModelClient):
+    """
+    Routes a model client's requests through a RateBudgeter.
+    """
+
+    def __init__(
+        self,
+        client: AbstractModelClient,
+        budgeter: RateBudgeter,
+        estimated_output_tokens: int = ESTIMATED_OUTPUT_TOKENS,
+    ):
+        self.client = client
+        self.budgeter = budgeter
+        self.estimated_output_tokens = estimated_output_tokens
+
+    def invoke(
+        self, prompt: str, system_prompt: str | None = None
+    ) -> AbastractModelResponse:
+        estimated_tokens = (
+            estimate_tokens(system_prompt)
+            + estimate_tokens(prompt)
+            + self.estimated_output_tokens
+        )
+        reservation = self.budgeter.acquire(estimated_tokens)
+        response = self.client.invoke(prompt=prompt, system_prompt=system_prompt)
+        self.budgeter.reconcile(reservation, response.total_tokens())
+        return response
+
+
+_RATE_BUDGETER: RateBudgeter | None = None
+_RATE_BUDGETER_LOCK = threading.Lock()
+
+
+def get_rate_budgeter() -> RateBudgeter:
+    """The budgeter shared by every model client in the process."""
+    global _RATE_BUDGETER
+    with _RATE_BUDGETER_LOCK:
+        if _RATE_BUDGETER is None:
+            _RATE_BUDGETER = RateBudgeter(
+                requests_per_minute=(
+                    int(BEDROCK_RPM_LIMIT) if BEDROCK_RPM_LIMIT else None
+                ),
+                tokens_per_minute=int(BEDROCK_TPM_LIMIT) if BEDROCK_TPM_LIMIT else None,
+            )
+        return _RATE_BUDGETER
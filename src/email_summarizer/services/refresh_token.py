@@ -1,14 +1,14 @@
 import logging
+from typing import TYPE_CHECKING
 
-from google.auth.exceptions import GoogleAuthError, RefreshError
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
 
 # Configure basic logging
 LOG = logging.getLogger(__name__)
 
 
-def is_refresh_token_valid(gmail_credentials: Credentials) -> bool:
+def is_refresh_token_valid(gmail_credentials: "Credentials") -> bool:
     """
     Checks if a Google OAuth 2.0 refresh token is still valid by attempting
     to exchange it for a new access token using the google-auth library.
@@ -26,6 +26,9 @@ def is_refresh_token_valid(gmail_credentials: Credentials) -> bool:
         LOG.error("Gmail credentials must be provided.")
         raise ValueError("Gmail credentials must be provided.")
 
+    from google.auth.exceptions import GoogleAuthError, RefreshError
+    from google.auth.transport.requests import Request
+
     try:
         LOG.info(
             "Attempting to refresh access token using google-auth to validate refresh token."
@@ -0,0 +1,235 @@
+import asyncio
+import json
+import logging
+import sys
+import time
+from abc import abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, TextIO
+
+from pydantic import BaseModel
+
+from email_summarizer.models.enums import EmailAccounts
+from email_summarizer.models.report import EmailReport
+from email_summarizer.utils.discord_utils import DiscordMessageQueue
+from email_summarizer.utils.report_utils import (
+    render_report_lines,
+    render_report_messages,
+)
+
+if TYPE_CHECKING:
+    import aiohttp
+
+LOG = logging.getLogger(__name__)
+
+
+class ReportSink:
+    """
+    Destination a compiled EmailReport is delivered to.
+    """
+
+    name: str = "sink"
+    # Whether a delivery here counts as the report reaching its reader, so
+    # its emails are recorded in the ledger. Local copies such as stdout or
+    # a JSON file don't.
+    records_delivery: bool = False
+
+    @abstractmethod
+    async def deliver(self, email_report: EmailReport) -> None:
+        pass
+
+    @abstractmethod
+    async def deliver_error(
+        self, message: str, email_account: EmailAccounts | None = None
+    ) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class DiscordSink(ReportSink):
+    name = "discord"
+    records_delivery = True
+
+    def __init__(self, channel: Any):
+        self.channel = channel
+        # Set once a post fails, so the caller can drop a broken connection.
+        self.failed = False
+
+    async def deliver(self, email_report: EmailReport) -> None:
+        queue = DiscordMessageQueue(self.channel)
+        queue.extend(render_report_messages(email_report))
+        try:
+            await queue.flush()
+        except Exception:
+            self.failed = True
+            raise
+
+    async def deliver_error(
+        self, message: str, email_account: EmailAccounts | None = None
+    ) -> None:
+        try:
+            await self.channel.send(message)
+        except Exception:
+            self.failed = True
+            raise
+
+
+class StdoutSink(ReportSink):
+    name = "stdout"
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream
+
+    async def deliver(self, email_report: EmailReport) -> None:
+        self._write("\n".join(render_report_lines(email_report)))
+
+    async def deliver_error(
+        self, message: str, email_account: EmailAccounts | None = None
+    ) -> None:
+        self._write(message)
+
+    def _write(self, text: str) -> None:
+        stream = self.stream or sys.stdout
+        stream.write(text + "\n")
+        stream.flush()
+
+
+class JsonFileSink(ReportSink):
+    """
+    Writes the report as JSON. An "{account}" placeholder in the path is
+    replaced with the report's account so multi-account runs keep each file.
+    With per_account and no placeholder, the account is added to the file
+    name instead, e.g. report-PRIMARY.json. An error replaces its account's
+    file, or goes to an "error" file when the account is unknown.
+    """
+
+    name = "json"
+
+    def __init__(self, path: str, per_account: bool = False):
+        self.path = path
+        self.per_account = per_account
+
+    async def deliver(self, email_report: EmailReport) -> None:
+        path = self.account_path(email_report.email_account.value)
+        await asyncio.to_thread(
+            self._write, path, email_report.model_dump_json(indent=2)
+        )
+
+    async def deliver_error(
+        self, message: str, email_account: EmailAccounts | None = None
+    ) -> None:
+        path = self.account_path(email_account.value if email_account else "error")
+        await asyncio.to_thread(self._write, path, json.dumps({"error": message}))
+
+    def account_path(self, account: str) -> str:
+        if "{account}" in self.path:
+            return self.path.replace("{account}", account)
+        if not self.per_account:
+            return self.path
+        path = Path(self.path)
+        return str(path.with_name(f"{path.stem}-{account}{path.suffix}"))
+
+    def _write(self, path: str, text: str) -> None:
+        with open(path, "w") as report_file:
+            report_file.write(text)
+
+
+class WebhookSink(ReportSink):
+    name = "webhook"
+    records_delivery = True
+
+    def __init__(self, url: str, session: "aiohttp.ClientSession | None" = None):
+        self.url = url
+        self._session = session
+
+    async def deliver(self, email_report: EmailReport) -> None:
+        await self._post({"report": email_report.model_dump(mode="json")})
+
+    async def deliver_error(
+        self, message: str, email_account: EmailAccounts | None = None
+    ) -> None:
+        await self._post({"error": message})
+
+    async def close(self) -> None:
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _post(self, payload: dict) -> None:
+        if self._session is None or self._session.closed:
+            import aiohttp
+
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+        async with self._session.post(self.url, json=payload) as response:
+            response.raise_for_status()
+
+
+class SinkDelivery(BaseModel):
+    sink: str
+    seconds: float
+    error: str | None = None
+
+
+def build_sink(spec: str, per_account: bool = False) -> ReportSink:
+    """
+    Build a sink from a spec string: "stdout", "json:<path>" or "webhook:<url>".
+    per_account is set for runs reporting on several accounts, so file sinks
+    write one file per account.
+    """
+    kind, _, target = spec.strip().partition(":")
+    kind = kind.lower()
+    if kind == StdoutSink.name:
+        return StdoutSink()
+    if kind == JsonFileSink.name and target:
+        return JsonFileSink(target, per_account)
+    if kind == WebhookSink.name and target:
+        return WebhookSink(target)
+    raise ValueError(f"Unsupported report sink: {spec}")
+
+
+def build_sinks(specs: str | None, per_account: bool = False) -> list[ReportSink]:
+    if not specs:
+        return []
+    return [build_sink(spec, per_account) for spec in specs.split(",") if spec.strip()]
+
+
+async def deliver_report(
+    email_report: EmailReport, sinks: list[ReportSink]
+) -> list[SinkDelivery]:
+    """
+    Fan one compiled report out to every sink concurrently.
+
+    A failing sink does not affect the others. Delivery time is measured
+    separately for each sink.
+    """
+    return await _fan_out(sinks, lambda sink: sink.deliver(email_report))
+
+
+async def deliver_error(
+    message: str,
+    sinks: list[ReportSink],
+    email_account: EmailAccounts | None = None,
+) -> list[SinkDelivery]:
+    return await _fan_out(
+        sinks, lambda sink: sink.deliver_error(message, email_account)
+    )
+
+
+async def _fan_out(sinks: list[ReportSink], send) -> list[SinkDelivery]:
+    async def timed(sink: ReportSink) -> SinkDelivery:
+        start = time.perf_counter()
+        error = None
+        try:
+            await send(sink)
+        except Exception as e:
+            LOG.error("Delivery to %s sink failed: %s", sink.name, e)
+            error = str(e)
+        seconds = time.perf_counter() - start
+        LOG.info("Delivered to %s sink in %.3fs", sink.name, seconds)
+        return SinkDelivery(sink=sink.name, seconds=seconds, error=error)
+
+    return list(await asyncio.gather(*(timed(sink) for sink in sinks)))
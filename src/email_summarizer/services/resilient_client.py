@@ -0,0 +1,185 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from email_summarizer.services.base_model_client import (
+    AbastractModelResponse,
+    AbstractModelClient,
+)
+from email_summarizer.utils.deadline_utils import Deadline
+from email_summarizer.utils.retry_utils import backoff_delay, is_throttling_error
+
+LOG = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """
+    Rolling window of successful call latencies, in seconds.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._latencies: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def percentile(self, percentile: float) -> float | None:
+        """
+        The latency at the given percentile (0-1), or None until enough
+        calls have been seen for it to be meaningful.
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(percentile * len(ordered)))
+        return ordered[index]
+
+
+class ResilientModelClient(AbstractModelClient):
+    """
+    Wraps model clients with throttling-aware retries, hedging and fallback.
+
+    Throttled calls are retried with jittered exponential backoff. When a
+    hedge percentile is set, a duplicate request is sent once a call has
+    run longer than that percentile of recent latencies, and whichever
+    answers first wins. When a client keeps being throttled, the call moves
+    on to the next client in the chain, e.g. Haiku then Nova Micro. Errors
+    other than throttling are raised straight away. This is the only layer
+    that retries throttling; call_with_retries and botocore leave it alone.
+    With backoff_budget_seconds, an invoke stops backing off once that long
+    has passed since it started: a model whose next backoff would overrun
+    the budget is given up on.
+    """
+
+    clients: list[AbstractModelClient]
+
+    def __init__(
+        self,
+        clients: list[AbstractModelClient],
+        max_throttle_retries: int = 3,
+        backoff_base_seconds: float = 0.5,
+        hedge_percentile: float | None = None,
+        latency_tracker: LatencyTracker | None = None,
+        backoff_budget_seconds: float | None = None,
+    ):
+        if len(clients) == 0:
+            raise ValueError("At least one model client must be provided")
+        self.clients = clients
+        self.max_throttle_retries = max_throttle_retries
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_budget_seconds = backoff_budget_seconds
+        self.hedge_percentile = hedge_percentile
+        self.latency_trackers = [
+            latency_tracker if i == 0 and latency_tracker else LatencyTracker()
+            for i in range(len(clients))
+        ]
+        self._executor = (
+            ThreadPoolExecutor(max_workers=16, thread_name_prefix="hedge")
+            if hedge_percentile is not None
+            else None
+        )
+
+    def invoke(
+        self, prompt: str, system_prompt: str | None = None
+    ) -> AbastractModelResponse:
+        last_error: Exception | None = None
+        budget = (
+            Deadline.after(self.backoff_budget_seconds)
+            if self.backoff_budget_seconds is not None
+            else None
+        )
+        for position, client in enumerate(self.clients):
+            try:
+                return self._invoke_with_backoff(
+                    position, prompt, system_prompt, budget
+                )
+            except Exception as e:
+                if not is_throttling_error(e):
+                    raise
+                last_error = e
+                if position + 1 < len(self.clients):
+                    LOG.warning(
+                        "%s kept throttling, falling back to %s",
+                        type(client).__name__,
+                        type(self.clients[position + 1]).__name__,
+                    )
+        assert last_error is not None
+        raise last_error
+
+    def _invoke_with_backoff(
+        self,
+        position: int,
+        prompt: str,
+        system_prompt: str | None,
+        budget: Deadline | None,
+    ) -> AbastractModelResponse:
+        for attempt in range(self.max_throttle_retries + 1):
+            try:
+                return self._invoke_with_hedge(position, prompt, system_prompt)
+            except Exception as e:
+                if not is_throttling_error(e) or attempt == self.max_throttle_retries:
+                    raise
+                delay = backoff_delay(attempt, self.backoff_base_seconds)
+                if budget is not None and delay >= budget.remaining():
+                    raise
+                LOG.info("Throttled, retrying in %.2fs", delay)
+                time.sleep(delay)
+        raise RuntimeError("unreachable")
+
+    def _invoke_with_hedge(
+        self, position: int, prompt: str, system_prompt: str | None
+    ) -> AbastractModelResponse:
+        hedge_after = None
+        if self.hedge_percentile is not None:
+            hedge_after = self.latency_trackers[position].percentile(
+                self.hedge_percentile
+            )
+        if self._executor is None or hedge_after is None:
+            return self._timed_invoke(position, prompt, system_prompt)
+
+        primary = self._executor.submit(
+            self._timed_invoke, position, prompt, system_prompt
+        )
+        done, _ = wait([primary], timeout=hedge_after)
+        if done:
+            return primary.result()
+
+        LOG.info("No response after %.2fs, sending a hedged request", hedge_after)
+        hedge = self._executor.submit(
+            self._timed_invoke, position, prompt, system_prompt
+        )
+        return _first_success([primary, hedge])
+
+    def _timed_invoke(
+        self, position: int, prompt: str, system_prompt: str | None
+    ) -> AbastractModelResponse:
+        start = time.perf_counter()
+        response = self.clients[position].invoke(
+            prompt=prompt, system_prompt=system_prompt
+        )
+        self.latency_trackers[position].record(time.perf_counter() - start)
+        return response
+
+
+def _first_success(futures: list[Future]) -> AbastractModelResponse:
+    """
+    Result of whichever future succeeds first; raises the first error only
+    when every future failed.
+    """
+    pending = set(futures)
+    first_error: BaseException | None = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            error = future.exception()
+            if error is None:
+                return future.result()
+            first_error = first_error or error
+    assert first_error is not None
+    raise first_error
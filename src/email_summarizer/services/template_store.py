@@ -0,0 +1,124 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+from email_summarizer.models.email import Email
+from email_summarizer.models.summary import Summary
+from email_summarizer.utils.template_utils import (
+    SenderTemplate,
+    TemplateDiff,
+    line_fingerprints,
+    sender_key,
+    template_diff,
+)
+
+LOG = logging.getLogger(__name__)
+
+# SQLite file remembering the last email template of every sender. Leave
+# empty to always send the whole body.
+TEMPLATE_STORE_PATH = os.getenv("TEMPLATE_STORE_PATH", "")
+# Share of a body's lines that must match the sender's previous email for
+# only the changed lines to be sent.
+TEMPLATE_MIN_SHARED_RATIO = float(os.getenv("TEMPLATE_MIN_SHARED_RATIO", 0.6))
+
+_TEMPLATE_STORE: "TemplateStore | None" = None
+_TEMPLATE_STORE_LOCK = threading.Lock()
+
+
+class TemplateStore:
+    """
+    The line fingerprints and summary of the previous email from every
+    sender, so recurring mail is summarized from what changed.
+    """
+
+    def __init__(
+        self,
+        path: str = TEMPLATE_STORE_PATH,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS sender_templates ("
+                "sender TEXT PRIMARY KEY, "
+                "fingerprints TEXT NOT NULL, "
+                "summary TEXT NOT NULL, "
+                "updated_at REAL NOT NULL)"
+            )
+
+    def get(self, sender: str) -> SenderTemplate | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT fingerprints, summary FROM sender_templates WHERE sender = ?",
+                (sender_key(sender),),
+            ).fetchone()
+        if row is None:
+            return None
+        return SenderTemplate(fingerprints=row[0].split(), summary=row[1])
+
+    def put(self, sender: str, body: str, summary: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sender_templates "
+                "(sender, fingerprints, summary, updated_at) VALUES (?, ?, ?, ?)",
+                (
+                    sender_key(sender),
+                    " ".join(line_fingerprints(body)),
+                    summary,
+                    self._clock(),
+                ),
+            )
+
+    def close(self) -> None:
+        self._connection.close()
+
+
+def get_template_store() -> TemplateStore | None:
+    """
+    Get the process-wide template store, or None when TEMPLATE_STORE_PATH is
+    not set.
+    """
+    global _TEMPLATE_STORE
+    if not TEMPLATE_STORE_PATH:
+        return None
+    with _TEMPLATE_STORE_LOCK:
+        if _TEMPLATE_STORE is None:
+            _TEMPLATE_STORE = TemplateStore()
+        return _TEMPLATE_STORE
+
+
+def find_template_diff(email: Email) -> TemplateDiff | None:
+    """
+    The lines that changed since the sender's previous email, or None when
+    the email should be summarized from its whole body.
+    """
+    store = get_template_store()
+    body = email.load_body()
+    if store is None or not body:
+        return None
+    template = store.get(email.sender)
+    if template is None:
+        return None
+    diff = template_diff(body, template, TEMPLATE_MIN_SHARED_RATIO)
+    if diff is not None:
+        LOG.debug(
+            "Sending %d changed lines of email %s, %.0f%% matched its template",
+            len(diff.changed_lines),
+            email.id,
+            diff.shared_ratio * 100,
+        )
+    return diff
+
+
+def remember_template(summary: Summary) -> None:
+    """Keep a model-written summary's email as its sender's template."""
+    store = get_template_store()
+    body = summary.email.load_body()
+    if store is None or not body or summary.is_fallback or summary.is_local:
+        return
+    store.put(summary.email.sender, body, summary.body)
@@ -1,12 +1,22 @@
 import logging
+import os
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from datetime import datetime
+from functools import cache, partial
+from typing import TYPE_CHECKING, Callable, TypeVar
 from zoneinfo import ZoneInfo
 
 from email_summarizer.models.actionable_email import ActionableEmail
 from email_summarizer.models.email import Email, GroupedEmails
 from email_summarizer.models.enums import EmailAccounts, SupportedModel
+from email_summarizer.models.prompt_config import PromptConfig
 from email_summarizer.models.report import EmailReport
 from email_summarizer.models.summary import Summary
+from email_summarizer.prompts.long_email_prompt import (
+    chunk_system_prompt,
+    combine_prompt,
+)
 from email_summarizer.prompts.next_steps import next_steps_system_prompt
 from email_summarizer.prompts.summary_prompt import summary_system_prompt
 from email_summarizer.services.anthropic_client import (
@@ -14,27 +24,237 @@ from email_summarizer.services.anthropic_client import (
     AnthropicModels,
 )
 from email_summarizer.services.base_model_client import AbstractModelClient
-from email_summarizer.services.bedrock_client import BedrockClientFactory
+from email_summarizer.services.bedrock_client import (
+    LLM_CALL_TIMEOUT_SECONDS,
+    BedrockClientFactory,
+)
 from email_summarizer.services.nova_client import NovaClientFactory
-from email_summarizer.utils.email_utils import email_to_prompt
+from email_summarizer.services.rate_budgeter import (
+    BudgetedModelClient,
+    get_rate_budgeter,
+)
+from email_summarizer.services.resilient_client import ResilientModelClient
+from email_summarizer.services.template_store import (
+    find_template_diff,
+    remember_template,
+)
+from email_summarizer.utils.cluster_summary_utils import (
+    fallback_cluster,
+    summarize_cluster,
+)
+from email_summarizer.utils.deadline_utils import Deadline, seconds_left
+from email_summarizer.utils.email_utils import (
+    EmailPromptPayload,
+    email_to_prompt,
+    template_diff_to_prompt,
+)
+from email_summarizer.utils.retry_utils import LLM_MAX_ATTEMPTS, call_with_retries
+from email_summarizer.utils.token_utils import estimate_tokens
+from email_summarizer.utils.truncation_utils import (
+    LONG_EMAIL_CHUNK_OVERLAP_TOKENS,
+    LONG_EMAIL_CHUNK_TOKENS,
+    LONG_EMAIL_MAX_CHUNKS,
+    LONG_EMAIL_TOKEN_THRESHOLD,
+    split_into_chunks,
+    truncate_to_token_budget,
+)
+
+if TYPE_CHECKING:
+    from email_summarizer.utils.intent_classifier import IntentClassifier
 
 LOG = logging.getLogger()
 ET_TIMEZONE = ZoneInfo("America/New_York")
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", 4))
+# Models to fall back along when one keeps throttling, e.g. "CLAUDE_HAIKU,NOVA_MICRO"
+MODEL_FALLBACK_CHAIN = os.getenv("MODEL_FALLBACK_CHAIN", "")
+# Latency percentile (0-1) after which a hedged duplicate request is sent.
+HEDGE_PERCENTILE = os.getenv("HEDGE_PERCENTILE")
+MAX_THROTTLE_RETRIES = int(os.getenv("MAX_THROTTLE_RETRIES", 3))
+# Trained local intent classifier (see cli.train_intent_classifier). Emails
+# it labels with at least INTENT_CONFIDENCE_THRESHOLD get a template summary
+# without a model call.
+INTENT_CLASSIFIER_PATH = os.getenv("INTENT_CLASSIFIER_PATH", "")
+INTENT_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", 0.9))
+# Body sentences kept per model by the extractive stage before summarizing,
+# e.g. "NOVA_MICRO=8,CLAUDE_HAIKU=12". Models left out get the whole body.
+EXTRACTIVE_SENTENCES = os.getenv("EXTRACTIVE_SENTENCES", "")
+EXTRACTIVE_CHAR_BUDGET = int(os.getenv("EXTRACTIVE_CHAR_BUDGET", 2000))
+
+# Email body token budgets, sized to each model's speed and context window.
+PROMPT_CONFIGS: dict[SupportedModel, PromptConfig] = {
+    SupportedModel.CLAUDE_HAIKU: PromptConfig(body_token_budget=1500),
+    SupportedModel.CLAUDE_SONNET: PromptConfig(body_token_budget=3000),
+    SupportedModel.NOVA_MICRO: PromptConfig(body_token_budget=1000),
+    SupportedModel.DEEPSEEK: PromptConfig(body_token_budget=1500),
+}
+
+_SHARED_MODEL_CLIENTS: dict[SupportedModel, AbstractModelClient] = {}
+_SHARED_MODEL_CLIENTS_LOCK = threading.Lock()
+
+T = TypeVar("T")
 
 
-def build_summary(client: AbstractModelClient, email: Email) -> Summary:
-    prompt_payload = email_to_prompt(email)
+def build_summary(
+    client: AbstractModelClient,
+    email: Email,
+    prompt_config: PromptConfig | None = None,
+) -> Summary:
+    if is_long_email(email):
+        return build_long_summary(client, email)
+    prompt_payload = summary_prompt_payload(email, prompt_config)
+    return build_summary_from_prompt(client, email, prompt_payload)
+
+
+def summary_prompt_payload(
+    email: Email, prompt_config: PromptConfig | None = None
+) -> EmailPromptPayload:
+    """
+    Prompt for a summary. Recurring emails that match their sender's
+    template are sent as the changed lines only; other bodies go through
+    the extractive stage when prompt_config sets one. Next steps always get
+    the whole body, as the action may hide in any sentence.
+    """
+    diff = find_template_diff(email)
+    if diff is not None:
+        return template_diff_to_prompt(
+            email, diff, body_token_budget=body_budget(prompt_config)
+        )
+    if prompt_config is None:
+        return email_to_prompt(email)
+    return email_to_prompt(
+        email,
+        body_token_budget=prompt_config.body_token_budget,
+        extractive_sentences=prompt_config.extractive_sentences,
+        extractive_char_budget=prompt_config.extractive_char_budget,
+    )
+
+
+def build_summary_from_prompt(
+    client: AbstractModelClient, email: Email, prompt_payload: EmailPromptPayload
+) -> Summary:
     response_object = client.invoke(
         prompt=prompt_payload["prompt_body"],
         system_prompt=summary_system_prompt(prompt_payload["was_redacted"]),
     )
+    summary = Summary(body=response_object.get_response(), email=email)
+    remember_template(summary)
+    return summary
+
+
+def is_long_email(email: Email) -> bool:
+    """Whether the body is over LONG_EMAIL_TOKEN_THRESHOLD tokens."""
+    body = email.load_body()
+    return (
+        LONG_EMAIL_TOKEN_THRESHOLD > 0
+        and bool(body)
+        and estimate_tokens(body) > LONG_EMAIL_TOKEN_THRESHOLD
+    )
+
+
+def build_long_summary(
+    client: AbstractModelClient,
+    email: Email,
+    deadline: Deadline | None = None,
+) -> Summary:
+    """
+    Summarize a long email on a pool of its own. Callers that already run
+    model calls on a pool use submit_long_summary with it instead.
+    """
+    with ThreadPoolExecutor(max_workers=LLM_CONCURRENCY) as executor:
+        return submit_long_summary(executor, client, email, deadline).result()
+
+
+def submit_long_summary(
+    executor: Executor,
+    client: AbstractModelClient,
+    email: Email,
+    deadline: Deadline | None = None,
+    chunk_tokens: int = LONG_EMAIL_CHUNK_TOKENS,
+    overlap_tokens: int = LONG_EMAIL_CHUNK_OVERLAP_TOKENS,
+    max_chunks: int = LONG_EMAIL_MAX_CHUNKS,
+) -> "Future[Summary]":
+    """
+    Summarize a long email without sending its whole body in one prompt.
+
+    The body is split into overlapping chunks whose notes calls are queued
+    on the executor, followed by one call that combines the notes into the
+    summary. Every call counts against the executor's bound, and as the
+    combine call only waits on calls queued ahead of it, it never holds up
+    a worker that they need. Each call is retried and capped like any other
+    model call; chunks that still fail are left out of the combined notes.
+    Bodies over max_chunks chunks are truncated first.
+    """
+    body = truncate_to_token_budget(email.load_body() or "", chunk_tokens * max_chunks)
+    chunks = split_into_chunks(body, chunk_tokens, overlap_tokens)
+    LOG.debug("Summarizing email %s in %d chunks", email.id, len(chunks))
+    notes_futures = [
+        executor.submit(_build_chunk_notes, client, email.with_body(chunk), deadline)
+        for chunk in chunks
+    ]
+    return executor.submit(_combine_chunk_notes, client, email, notes_futures, deadline)
+
+
+def _build_chunk_notes(
+    client: AbstractModelClient, chunk_email: Email, deadline: Deadline | None
+) -> str:
+    prompt_payload = email_to_prompt(chunk_email)
+    response_object = call_with_retries(
+        lambda: client.invoke(
+            prompt=prompt_payload["prompt_body"],
+            system_prompt=chunk_system_prompt(prompt_payload["was_redacted"]),
+        ),
+        max_attempts=LLM_MAX_ATTEMPTS,
+        deadline=deadline,
+    )
+    return response_object.get_response().strip()
+
+
+def _combine_chunk_notes(
+    client: AbstractModelClient,
+    email: Email,
+    notes_futures: "list[Future[str]]",
+    deadline: Deadline | None,
+) -> Summary:
+    notes = []
+    for part, future in enumerate(notes_futures, start=1):
+        try:
+            notes.append(f"Part {part}: {future.result(seconds_left(deadline))}")
+        except Exception as e:
+            LOG.warning("Leaving out part %d of email %s: %s", part, email.id, e)
+    if not notes:
+        raise RuntimeError(f"No part of email {email.id} could be summarized")
+    numbered_notes = "\n".join(notes)
+    response_object = call_with_retries(
+        lambda: client.invoke(
+            prompt=f"""\
+Sender: <sender>{email.sender}</sender>
+Subject: <subject>{email.subject} - {email.snippet}</subject>
+Notes:
+<notes>
+{numbered_notes}
+</notes>""",
+            system_prompt=combine_prompt(),
+        ),
+        max_attempts=LLM_MAX_ATTEMPTS,
+        deadline=deadline,
+    )
     return Summary(body=response_object.get_response(), email=email)
 
 
 def build_actionable_email(
-    client: AbstractModelClient, email: Email
+    client: AbstractModelClient,
+    email: Email,
+    prompt_config: PromptConfig | None = None,
+) -> ActionableEmail:
+    prompt_payload = email_to_prompt(
+        email, body_token_budget=body_budget(prompt_config)
+    )
+    return build_actionable_email_from_prompt(client, email, prompt_payload)
+
+
+def build_actionable_email_from_prompt(
+    client: AbstractModelClient, email: Email, prompt_payload: EmailPromptPayload
 ) -> ActionableEmail:
-    prompt_payload = email_to_prompt(email)
     response_object = client.invoke(
         prompt=prompt_payload["prompt_body"],
         system_prompt=next_steps_system_prompt(prompt_payload["was_redacted"]),
@@ -42,27 +262,178 @@ def build_actionable_email(
     return ActionableEmail(next_steps=response_object.get_response(), email=email)
 
 
+def local_summary(email: Email) -> Summary | None:
+    """
+    Template summary for an email the local classifier is confident about,
+    or None when the email needs the model.
+    """
+    classifier = get_intent_classifier()
+    if classifier is None:
+        return None
+    prediction = classifier.predict(email)
+    if prediction.confidence < INTENT_CONFIDENCE_THRESHOLD:
+        return None
+    return Summary(
+        body=f"[{prediction.intent.value}] {email.subject}", email=email, is_local=True
+    )
+
+
+@cache
+def get_intent_classifier() -> "IntentClassifier | None":
+    """
+    Load the classifier at INTENT_CLASSIFIER_PATH once. NumPy is only
+    imported when a classifier is configured.
+    """
+    if not INTENT_CLASSIFIER_PATH:
+        return None
+    from email_summarizer.utils.intent_classifier import IntentClassifier
+
+    try:
+        return IntentClassifier.load(INTENT_CLASSIFIER_PATH)
+    except (OSError, ValueError, KeyError) as e:
+        LOG.warning(
+            "Intent classifier not loaded from %s: %s", INTENT_CLASSIFIER_PATH, e
+        )
+        return None
+
+
+def fallback_line(email: Email) -> str:
+    """Subject/snippet line shown for an email the model didn't get to."""
+    return f"*{email.subject}*: {email.snippet}"
+
+
 def compile_email_report(
     client: AbstractModelClient,
     email_account: EmailAccounts,
     emails: list[Email],
     grouped_emails: list[GroupedEmails],
     high_priority_emails: list[Email],
+    deadline: Deadline | None = None,
+    prompt_config: PromptConfig | None = None,
+    clusters: list[list[Email]] | None = None,
 ) -> EmailReport:
+    """
+    Summarize the emails into a report.
+
+    Model calls run concurrently, each capped at LLM_CALL_TIMEOUT_SECONDS
+    by the model client and retried on transient errors; the model client
+    itself backs off on throttling. An email whose call fails or times out
+    falls back to its subject and snippet, so one bad call neither aborts
+    the report nor stretches it past the per-call budget. With a deadline,
+    high priority emails are submitted first, then the clusters of similar
+    emails (see cluster_summary_utils.find_clusters) that are each
+    summarized with one call, and calls still outstanding when it expires
+    fall back as well. Cluster summaries follow grouped_emails in the
+    report. prompt_config
+    bounds the email body tokens sent per call. The chunk calls of long
+    emails run on the same pool, so at most LLM_CONCURRENCY calls are ever
+    in flight.
+    """
     LOG.info("Compiling email report...")
 
-    summaries: list[Summary] = []
-    actionable_emails: list[ActionableEmail] = []
+    executor = ThreadPoolExecutor(max_workers=LLM_CONCURRENCY)
+    try:
+        LOG.debug("Building actionable emails from high priority emails...")
+        actionable_futures = [
+            executor.submit(
+                build_or_fallback,
+                partial(build_actionable_email, prompt_config=prompt_config),
+                client,
+                email,
+                deadline,
+            )
+            for email in high_priority_emails
+        ]
+        LOG.debug("Summarizing clusters of similar emails...")
+        cluster_futures = [
+            executor.submit(summarize_cluster, client, cluster, deadline)
+            for cluster in clusters or []
+        ]
+        LOG.debug("Building summaries of regular emails...")
+        local_summaries = [local_summary(email) for email in emails]
+        summary_futures = [
+            (
+                None
+                if local is not None
+                else (
+                    submit_long_summary(executor, client, email, deadline)
+                    if is_long_email(email)
+                    else executor.submit(
+                        build_or_fallback,
+                        partial(build_summary, prompt_config=prompt_config),
+                        client,
+                        email,
+                        deadline,
+                    )
+                )
+            )
+            for email, local in zip(emails, local_summaries)
+        ]
 
-    LOG.debug("Building summaries of regular emails...")
-    for email in emails:
-        summary = build_summary(client, email)
-        summaries.append(summary)
+        actionable_emails: list[ActionableEmail] = []
+        for email, actionable_future in zip(high_priority_emails, actionable_futures):
+            actionable_emails.append(
+                _result_or_none(email, actionable_future, deadline)
+                or fallback_actionable_email(email)
+            )
+
+        cluster_summaries: list[GroupedEmails] = []
+        for cluster, cluster_future in zip(clusters or [], cluster_futures):
+            try:
+                cluster_summaries.append(cluster_future.result(seconds_left(deadline)))
+            except TimeoutError:
+                LOG.warning("Listing a cluster of %d emails as-is", len(cluster))
+                cluster_summaries.append(fallback_cluster(cluster))
+
+        summaries: list[Summary] = []
+        for email, local, summary_future in zip(
+            emails, local_summaries, summary_futures
+        ):
+            if summary_future is not None:
+                summaries.append(
+                    _result_or_none(email, summary_future, deadline)
+                    or fallback_summary(email)
+                )
+            elif local is not None:
+                summaries.append(local)
+    finally:
+        # Calls still running at the deadline end at the client's timeout
+        executor.shutdown(wait=False, cancel_futures=True)
+    LOG.info(
+        "Summarized %d of %d emails locally",
+        sum(local is not None for local in local_summaries),
+        len(emails),
+    )
+
+    return assemble_email_report(
+        email_account,
+        summaries,
+        [*grouped_emails, *cluster_summaries],
+        actionable_emails,
+    )
 
-    LOG.debug("Building actionable emails from high priority emails...")
-    for email in high_priority_emails:
-        actionable_email = build_actionable_email(client, email)
-        actionable_emails.append(actionable_email)
+
+def _result_or_none(
+    email: Email, future: "Future[T]", deadline: Deadline | None
+) -> T | None:
+    # T is itself Optional for build_or_fallback futures, which already
+    # return None after a failed call; submit_long_summary's never do.
+    try:
+        return future.result(seconds_left(deadline))
+    except TimeoutError:
+        LOG.warning("Falling back for email %s: out of time", email.id)
+        return None
+    except Exception as e:
+        LOG.warning("Falling back for email %s: %s", email.id, e)
+        return None
+
+
+def assemble_email_report(
+    email_account: EmailAccounts,
+    summaries: list[Summary],
+    grouped_emails: list[GroupedEmails],
+    actionable_emails: list[ActionableEmail],
+) -> EmailReport:
     return EmailReport(
         email_account=email_account,
         summaries=summaries,
@@ -72,6 +443,43 @@ def compile_email_report(
     )
 
 
+def body_budget(prompt_config: PromptConfig | None) -> int | None:
+    return prompt_config.body_token_budget if prompt_config else None
+
+
+def build_or_fallback(
+    build: Callable[[AbstractModelClient, Email], T],
+    client: AbstractModelClient,
+    email: Email,
+    deadline: Deadline | None,
+) -> T | None:
+    """
+    Run a model call with timeouts and retries.
+
+    Returns None when the call failed, timed out or was skipped because the
+    deadline expired, so the caller can fall back for that email alone.
+    """
+    try:
+        return call_with_retries(
+            lambda: build(client, email),
+            max_attempts=LLM_MAX_ATTEMPTS,
+            deadline=deadline,
+        )
+    except Exception as e:
+        LOG.warning("Falling back for email %s: %s", email.id, e)
+        return None
+
+
+def fallback_summary(email: Email) -> Summary:
+    return Summary(body=fallback_line(email), email=email, is_fallback=True)
+
+
+def fallback_actionable_email(email: Email) -> ActionableEmail:
+    return ActionableEmail(
+        email=email, next_steps=fallback_line(email), is_fallback=True
+    )
+
+
 def get_model_client(target_model: SupportedModel) -> AbstractModelClient:
     LOG.debug("Using model: %s", target_model)
     if target_model == SupportedModel.CLAUDE_HAIKU:
@@ -83,3 +491,79 @@ def get_model_client(target_model: SupportedModel) -> AbstractModelClient:
         return NovaClientFactory().get_client(bedrock_client=bedrock_client)
     else:
         raise ValueError(f"Unsupported model: {target_model}")
+
+
+def get_prompt_config(target_model: SupportedModel) -> PromptConfig:
+    if target_model not in PROMPT_CONFIGS:
+        raise ValueError(f"Unsupported model: {target_model}")
+    sentences = extractive_sentences().get(target_model)
+    if sentences is None:
+        return PROMPT_CONFIGS[target_model]
+    return PROMPT_CONFIGS[target_model].model_copy(
+        update={
+            "extractive_sentences": sentences,
+            "extractive_char_budget": EXTRACTIVE_CHAR_BUDGET,
+        }
+    )
+
+
+def extractive_sentences(spec: str | None = None) -> dict[SupportedModel, int]:
+    """
+    Sentences kept per model from a "MODEL=sentences" comma-separated spec,
+    EXTRACTIVE_SENTENCES by default.
+    """
+    if spec is None:
+        spec = EXTRACTIVE_SENTENCES
+    sentences = {}
+    for setting in spec.split(","):
+        if not setting.strip():
+            continue
+        name, _, count = setting.partition("=")
+        sentences[SupportedModel(name.strip().upper())] = int(count)
+    return sentences
+
+
+def fallback_models(
+    target_model: SupportedModel, chain: str = MODEL_FALLBACK_CHAIN
+) -> list[SupportedModel]:
+    """
+    Models after target_model in the comma-separated fallback chain.
+    """
+    models = [SupportedModel(name.strip()) for name in chain.split(",") if name.strip()]
+    if target_model not in models:
+        return []
+    fallback_start = models.index(target_model) + 1
+    return models[fallback_start:]
+
+
+def get_resilient_model_client(target_model: SupportedModel) -> ResilientModelClient:
+    """
+    Client for the model that backs off on throttling, hedges slow calls when
+    HEDGE_PERCENTILE is set and falls back along MODEL_FALLBACK_CHAIN. Every
+    request, retries and hedges included, is paced by the process-wide
+    rate budgeter. Throttle backoff sleeps at most LLM_CALL_TIMEOUT_SECONDS
+    per call.
+    """
+    models = [target_model, *fallback_models(target_model)]
+    budgeter = get_rate_budgeter()
+    return ResilientModelClient(
+        [BudgetedModelClient(get_model_client(model), budgeter) for model in models],
+        max_throttle_retries=MAX_THROTTLE_RETRIES,
+        hedge_percentile=float(HEDGE_PERCENTILE) if HEDGE_PERCENTILE else None,
+        backoff_budget_seconds=LLM_CALL_TIMEOUT_SECONDS,
+    )
+
+
+def get_shared_model_client(target_model: SupportedModel) -> AbstractModelClient:
+    """
+    Get the process-wide client for a model, creating it on first use.
+
+    Reports for several accounts share one client (and its Bedrock
+    connection pool) per model instead of setting one up per account.
+    """
+    with _SHARED_MODEL_CLIENTS_LOCK:
+        if target_model not in _SHARED_MODEL_CLIENTS:
+            _SHARED_MODEL_CLIENTS[target_model] = get_resilient_model_client(
+                target_model
+            )
+        return _SHARED_MODEL_CLIENTS[target_model]
@@ -0,0 +1,131 @@
+import re
+from typing import TypedDict
+
+from email_summarizer.utils.token_utils import estimate_tokens
+
+# A footer marker past this share of the body ends the content. Earlier
+# markers are kept: "unsubscribe" mid-body is as likely to be content.
+FOOTER_START_SHARE = 0.6
+# Repeated lines of at most this many words, without numbers, are calls to
+# action ("Shop now") rather than content.
+MAX_BOILERPLATE_WORDS = 4
+# URLs at least this long are tracking links rather than readable addresses.
+TRACKING_LINK_MIN_LENGTH = 40
+
+_QUOTE_HEADER = re.compile(
+    r"^[ \t]*On\b[^\n]{0,250}(?:\n[^\n]{0,250})?\bwrote:[ \t]*$"
+    r"|^[ \t]*-{2,}[ \t]*(?:Original|Forwarded) Message[ \t]*-{2,}[ \t]*$",
+    re.MULTILINE | re.IGNORECASE,
+)
+_QUOTED_LINE = re.compile(r"^[ \t]*>.*(?:\n|$)", re.MULTILINE)
+# The RFC 3676 "-- " delimiter. A bare "--" is often just a separator.
+_SIGNATURE_DELIMITER = re.compile(r"^-- $", re.MULTILINE)
+_MOBILE_SIGNATURE = re.compile(
+    r"^[ \t]*Sent from my [\w ]{1,30}$|^[ \t]*Get Outlook for \w+$",
+    re.MULTILINE | re.IGNORECASE,
+)
+_FOOTER_MARKER = re.compile(
+    r"unsubscribe|manage (?:your )?(?:email )?preferences|update your preferences"
+    r"|to stop receiving|you are receiving this|you received this email"
+    r"|view (?:this email )?in (?:your )?browser|confidentiality notice"
+    r"|this (?:e-?mail|message) and any attachments|privileged and confidential"
+    r"|all rights reserved",
+    re.IGNORECASE,
+)
+_TRACKING_LINK = re.compile(rf"https?://\S{{{TRACKING_LINK_MIN_LENGTH},}}")
+_LINK_ONLY = re.compile(r"^(?:\[link\]|https?://\S+)$")
+_SENTENCE_START = re.compile(r"(?:^|\n|[.!?]\s)")
+_HORIZONTAL_WHITESPACE = re.compile(r"[ \t\u00a0\u200b\u200c]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+class CleanedBody(TypedDict):
+    body: str
+    chars_removed: int
+    tokens_removed: int
+
+
+def clean_body(body: str) -> CleanedBody:
+    """
+    Strip what the model doesn't need from a parsed email body: quoted reply
+    history, signatures, unsubscribe/legal footers, tracking links and
+    repeated lines, then collapse whitespace.
+    """
+    text = strip_quoted_reply(body)
+    text = strip_signature(text)
+    text = strip_footer(text)
+    text = _TRACKING_LINK.sub("[link]", text)
+    text = drop_repeated_lines(text)
+    text = collapse_whitespace(text)
+    return CleanedBody(
+        body=text,
+        chars_removed=len(body) - len(text),
+        tokens_removed=max(0, estimate_tokens(body) - estimate_tokens(text)),
+    )
+
+
+def strip_quoted_reply(text: str) -> str:
+    """Drop the quoted history below "On ... wrote:" and any ">" lines."""
+    match = _QUOTE_HEADER.search(text)
+    if match:
+        text = text[: match.start()]
+    return _QUOTED_LINE.sub("", text)
+
+
+def strip_signature(text: str) -> str:
+    match = _SIGNATURE_DELIMITER.search(text)
+    if match:
+        text = text[: match.start()]
+    return _MOBILE_SIGNATURE.sub("", text)
+
+
+def strip_footer(text: str) -> str:
+    """
+    Cut the body at the footer: the first marker in its last part, extended
+    back over directly preceding sentences that hold markers too. Markers
+    earlier on are left alone.
+    """
+    footer_start = int(len(text) * FOOTER_START_SHARE)
+    for match in _FOOTER_MARKER.finditer(text):
+        if match.start() < footer_start:
+            continue
+        sentence_starts = [
+            start.end() for start in _SENTENCE_START.finditer(text, 0, match.start())
+        ] or [0]
+        cut = sentence_starts.pop()
+        while sentence_starts and _FOOTER_MARKER.search(text, sentence_starts[-1], cut):
+            cut = sentence_starts.pop()
+        return text[:cut]
+    return text
+
+
+def drop_repeated_lines(text: str) -> str:
+    """
+    Keep only the first occurrence of repeated boilerplate lines: short
+    calls to action and bare links. Repeated content, e.g. the same item
+    twice on a receipt, is kept.
+    """
+    seen: set[str] = set()
+    kept = []
+    for line in text.split("\n"):
+        normalized = " ".join(line.split()).lower()
+        if normalized in seen and is_boilerplate_line(normalized):
+            continue
+        seen.add(normalized)
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def is_boilerplate_line(line: str) -> bool:
+    if _LINK_ONLY.match(line):
+        return True
+    words = line.split()
+    return 0 < len(words) <= MAX_BOILERPLATE_WORDS and not any(
+        char.isdigit() for char in line
+    )
+
+
+def collapse_whitespace(text: str) -> str:
+    text = _HORIZONTAL_WHITESPACE.sub(" ", text)
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n\n", text).strip()
@@ -0,0 +1,109 @@
+import logging
+import os
+from collections import Counter
+
+from email_summarizer.models.email import Email, GroupedEmails
+from email_summarizer.prompts.cluster_prompt import cluster_system_prompt
+from email_summarizer.services.base_model_client import AbstractModelClient
+from email_summarizer.utils.deadline_utils import Deadline
+from email_summarizer.utils.retry_utils import LLM_MAX_ATTEMPTS, call_with_retries
+
+LOG = logging.getLogger()
+# Cosine similarity (0-1) of the sender, subject and snippet vectors above
+# which ungrouped emails are summarized together. 0 turns clustering off.
+CLUSTER_SIMILARITY_THRESHOLD = float(os.getenv("CLUSTER_SIMILARITY_THRESHOLD", 0))
+# Smallest cluster summarized with one call; smaller ones are summarized
+# email by email.
+CLUSTER_MIN_SIZE = int(os.getenv("CLUSTER_MIN_SIZE", 3))
+# Senders named in a cluster's label before the rest are counted.
+CLUSTER_LABEL_SENDERS = 2
+
+
+def find_clusters(
+    emails: list[Email],
+    similarity_threshold: float | None = None,
+    min_size: int | None = None,
+) -> tuple[list[Email], list[list[Email]]]:
+    """
+    Cluster similar emails and pick the clusters of at least min_size emails
+    to summarize with one model call each, see summarize_cluster.
+
+    Returns the emails left to summarize one by one, in their original
+    order, and the clusters. Clusters are built from the sender, subject and
+    snippet alone, so clustered emails never have their bodies decoded.
+    NumPy is only imported when clustering is turned on.
+    """
+    if similarity_threshold is None:
+        similarity_threshold = CLUSTER_SIMILARITY_THRESHOLD
+    if min_size is None:
+        min_size = CLUSTER_MIN_SIZE
+    if similarity_threshold <= 0 or len(emails) < max(min_size, 2):
+        return emails, []
+    from email_summarizer.utils.clustering_utils import cluster_emails
+
+    clusters = [
+        cluster
+        for cluster in cluster_emails(emails, similarity_threshold)
+        if len(cluster) >= max(min_size, 2)
+    ]
+    clustered_ids = {email.id for cluster in clusters for email in cluster}
+    remaining = [email for email in emails if email.id not in clustered_ids]
+    if clusters:
+        LOG.info(
+            "Clustered %d emails into %d clusters", len(clustered_ids), len(clusters)
+        )
+    return remaining, clusters
+
+
+def cluster_label(cluster: list[Email]) -> str:
+    """The most frequent senders of the cluster, e.g. "A, B and 2 more"."""
+    senders = [sender for sender, _ in Counter(e.sender for e in cluster).most_common()]
+    label = ", ".join(senders[:CLUSTER_LABEL_SENDERS])
+    if len(senders) > CLUSTER_LABEL_SENDERS:
+        label = f"{label} and {len(senders) - CLUSTER_LABEL_SENDERS} more"
+    return label
+
+
+def cluster_prompt(cluster: list[Email]) -> str:
+    return "\n".join(
+        f"{i + 1}. Sender: <sender>{email.sender}</sender> "
+        f"Subject: <subject>{email.subject} - {email.snippet}</subject>"
+        for i, email in enumerate(cluster)
+    )
+
+
+def summarize_cluster(
+    client: AbstractModelClient, cluster: list[Email], deadline: Deadline | None
+) -> GroupedEmails:
+    """
+    Summarize the cluster with one model call, listing its subjects instead
+    when the call fails.
+    """
+    try:
+        response = call_with_retries(
+            lambda: client.invoke(
+                prompt=cluster_prompt(cluster),
+                system_prompt=cluster_system_prompt(),
+            ),
+            max_attempts=LLM_MAX_ATTEMPTS,
+            deadline=deadline,
+        )
+        return GroupedEmails(
+            sender=cluster_label(cluster),
+            count=len(cluster),
+            summary=response.get_response().strip(),
+            message_ids=[email.id for email in cluster],
+        )
+    except Exception as e:
+        LOG.warning("Listing a cluster of %d emails as-is: %s", len(cluster), e)
+        return fallback_cluster(cluster)
+
+
+def fallback_cluster(cluster: list[Email]) -> GroupedEmails:
+    return GroupedEmails(
+        sender=cluster_label(cluster),
+        count=len(cluster),
+        summary="; ".join(f"*{email.subject}*" for email in cluster),
+        is_fallback=True,
+        message_ids=[email.id for email in cluster],
+    )
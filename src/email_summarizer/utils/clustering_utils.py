@@ -0,0 +1,62 @@
+import re
+
+import numpy as np
+
+from email_summarizer.models.email import Email
+from email_summarizer.utils.feature_utils import email_features
+from email_summarizer.utils.tfidf_utils import (
+    DEFAULT_FEATURE_BITS,
+    hashed_tfidf_vectors,
+)
+
+_WORD = re.compile(r"[a-z]{3,}")
+
+
+def cluster_features(email: Email) -> list[str]:
+    """Sender and subject features plus the snippet's words."""
+    return email_features(email.sender, email.subject) + [
+        f"snippet:{word}" for word in _WORD.findall(email.snippet.lower())
+    ]
+
+
+def tfidf_vectors(
+    emails: list[Email], feature_bits: int = DEFAULT_FEATURE_BITS
+) -> np.ndarray:
+    """Hashed TF-IDF vectors of the emails' cluster features."""
+    return hashed_tfidf_vectors(
+        [cluster_features(email) for email in emails], feature_bits
+    )
+
+
+def cluster_emails(
+    emails: list[Email],
+    similarity_threshold: float,
+    feature_bits: int = DEFAULT_FEATURE_BITS,
+) -> list[list[Email]]:
+    """
+    Group emails whose cosine similarity to a cluster's centroid is at least
+    similarity_threshold.
+
+    Emails are assigned in order to the most similar existing cluster, or
+    start a new one. Clusters keep the order of their first email and emails
+    keep their order within a cluster.
+    """
+    if not emails:
+        return []
+    vectors = tfidf_vectors(emails, feature_bits)
+    centroids = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+    sums: list[np.ndarray] = []
+    clusters: list[list[Email]] = []
+    for email, vector in zip(emails, vectors):
+        if clusters:
+            similarities = centroids @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] >= similarity_threshold:
+                clusters[best].append(email)
+                sums[best] = sums[best] + vector
+                centroids[best] = sums[best] / np.linalg.norm(sums[best])
+                continue
+        clusters.append([email])
+        sums.append(vector.copy())
+        centroids = np.vstack([centroids, vector])
+    return clusters
@@ -0,0 +1,26 @@
+import os
+
+# Settings a report can't be built without. They are only read on first use,
+# so check them when the handler starts instead of failing mid-report.
+REQUIRED_ENV_VARS = (
+    "SPOUSE_REGEX",
+    "DAYCARE_REGEX",
+    "LICENSE_PLATE_REGEX",
+    "STREET_ADDRESS_REGEX",
+)
+
+
+class MissingConfigError(Exception):
+    pass
+
+
+def check_required_config() -> None:
+    """
+    Raises:
+        MissingConfigError: If a required environment variable is unset or empty.
+    """
+    missing = [key for key in REQUIRED_ENV_VARS if not os.getenv(key)]
+    if missing:
+        raise MissingConfigError(
+            f"Missing required environment variables: {', '.join(missing)}"
+        )
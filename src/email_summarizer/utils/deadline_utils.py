@@ -0,0 +1,48 @@
+import time
+from typing import Any
+
+
+class Deadline:
+    """
+    Point in time, on the monotonic clock, by which work has to be finished.
+    """
+
+    expires_at: float
+
+    def __init__(self, expires_at: float):
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    @classmethod
+    def from_lambda_context(
+        cls, context: Any, reserve_seconds: float = 0.0
+    ) -> "Deadline | None":
+        """
+        Build a deadline from the Lambda context, keeping reserve_seconds of
+        the remaining time back. Returns None outside of Lambda.
+        """
+        get_remaining_time = getattr(context, "get_remaining_time_in_millis", None)
+        if get_remaining_time is None:
+            return None
+        return cls.after(get_remaining_time() / 1000 - reserve_seconds)
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() == 0.0
+
+    def shortened(self, seconds: float) -> "Deadline":
+        """Deadline that expires the given number of seconds earlier."""
+        return Deadline(self.expires_at - seconds)
+
+    def __repr__(self) -> str:
+        return f"Deadline(remaining={self.remaining():.2f}s)"
+
+
+def seconds_left(deadline: Deadline | None) -> float | None:
+    """Seconds to wait for a result, or None to wait without a deadline."""
+    return None if deadline is None else deadline.remaining()
@@ -0,0 +1,155 @@
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from itertools import batched
+
+from pydantic import BaseModel
+
+from email_summarizer.models.digest import CategoryDigest
+from email_summarizer.models.enums import EmailIntent
+from email_summarizer.models.summary import Summary
+from email_summarizer.prompts.digest_prompt import digest_system_prompt
+from email_summarizer.services.base_model_client import AbstractModelClient
+from email_summarizer.utils.ai_utils import LLM_CONCURRENCY
+from email_summarizer.utils.deadline_utils import Deadline
+from email_summarizer.utils.retry_utils import LLM_MAX_ATTEMPTS, call_with_retries
+
+LOG = logging.getLogger()
+# Replace per-email summaries with per-intent digests once a report has at
+# least DIGEST_MIN_EMAILS summaries. 0 turns digest mode off.
+DIGEST_MIN_EMAILS = int(os.getenv("DIGEST_MIN_EMAILS", 0))
+# Summaries (or lower level digests) condensed per reduce call.
+DIGEST_FAN_IN = int(os.getenv("DIGEST_FAN_IN", 8))
+
+INTENT_PATTERN = re.compile(r"^\s*\[(\w+)\]\s*")
+
+
+class DigestPiece(BaseModel):
+    """A summary, or a digest of several, waiting to be reduced further."""
+
+    text: str
+    email_count: int = 1
+    is_fallback: bool = False
+
+
+def parse_intent(summary_body: str) -> tuple[EmailIntent, str]:
+    """
+    Split the "[INTENT]" prefix the summary prompt asks for off a summary.
+    Summaries without a known intent fall under OTHER.
+    """
+    match = INTENT_PATTERN.match(summary_body)
+    if match is None:
+        return EmailIntent.OTHER, summary_body.strip()
+    text_start = match.end()
+    text = summary_body[text_start:].strip()
+    try:
+        return EmailIntent(match.group(1).upper()), text
+    except ValueError:
+        return EmailIntent.OTHER, text
+
+
+def group_by_intent(summaries: list[Summary]) -> dict[EmailIntent, list[DigestPiece]]:
+    pieces: dict[EmailIntent, list[DigestPiece]] = {}
+    for summary in summaries:
+        intent, text = parse_intent(summary.body)
+        if summary.is_fallback:
+            intent = EmailIntent.OTHER
+        pieces.setdefault(intent, []).append(
+            DigestPiece(text=text, is_fallback=summary.is_fallback)
+        )
+    return pieces
+
+
+def build_digests(
+    client: AbstractModelClient,
+    summaries: list[Summary],
+    fan_in: int = DIGEST_FAN_IN,
+    deadline: Deadline | None = None,
+) -> list[CategoryDigest]:
+    """
+    Condense the summaries into one digest per intent category.
+
+    Each round reduces every group of up to fan_in pieces in every category
+    with one model call, all calls of the round running concurrently, until
+    a single piece is left per category. N summaries thus take
+    ceil(log_fan_in(N)) sequential rounds. A group whose call fails is
+    joined as-is so the digest still covers its emails.
+    """
+    if fan_in < 2:
+        raise ValueError("Digest fan-in must be at least 2")
+    pieces_by_intent = group_by_intent(summaries)
+    rounds = 0
+    with ThreadPoolExecutor(max_workers=LLM_CONCURRENCY) as executor:
+        while any(len(pieces) > 1 for pieces in pieces_by_intent.values()):
+            rounds += 1
+            futures = {
+                intent: [
+                    executor.submit(_reduce, client, intent, group, deadline)
+                    for group in _chunk(pieces, fan_in)
+                ]
+                for intent, pieces in pieces_by_intent.items()
+            }
+            pieces_by_intent = {
+                intent: [future.result() for future in intent_futures]
+                for intent, intent_futures in futures.items()
+            }
+    LOG.info(
+        "Digested %d summaries into %d categories in %d rounds",
+        len(summaries),
+        len(pieces_by_intent),
+        rounds,
+    )
+    return [
+        CategoryDigest(
+            intent=intent,
+            body=pieces[0].text,
+            email_count=pieces[0].email_count,
+            is_fallback=pieces[0].is_fallback,
+        )
+        for intent in EmailIntent
+        if (pieces := pieces_by_intent.get(intent))
+    ]
+
+
+def digest_prompt(intent: EmailIntent, group: list[DigestPiece]) -> str:
+    lines = [f"Intent: {intent.value}"]
+    lines.extend(f"{i + 1}. {piece.text}" for i, piece in enumerate(group))
+    return "\n".join(lines)
+
+
+def _chunk(pieces: list[DigestPiece], size: int) -> list[list[DigestPiece]]:
+    return [list(group) for group in batched(pieces, size)]
+
+
+def _reduce(
+    client: AbstractModelClient,
+    intent: EmailIntent,
+    group: list[DigestPiece],
+    deadline: Deadline | None,
+) -> DigestPiece:
+    email_count = sum(piece.email_count for piece in group)
+    is_fallback = any(piece.is_fallback for piece in group)
+    if len(group) == 1:
+        return group[0]
+    try:
+        response = call_with_retries(
+            lambda: client.invoke(
+                prompt=digest_prompt(intent, group),
+                system_prompt=digest_system_prompt(),
+            ),
+            max_attempts=LLM_MAX_ATTEMPTS,
+            deadline=deadline,
+        )
+        return DigestPiece(
+            text=response.get_response().strip(),
+            email_count=email_count,
+            is_fallback=is_fallback,
+        )
+    except Exception as e:
+        LOG.warning("Joining %d %s summaries as-is: %s", len(group), intent.value, e)
+        return DigestPiece(
+            text=" ".join(piece.text for piece in group),
+            email_count=email_count,
+            is_fallback=True,
+        )
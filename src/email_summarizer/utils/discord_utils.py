@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any
+
+LOG = logging.getLogger(__name__)
+
+# Discord allows roughly 5 messages per 5 seconds per channel.
+DEFAULT_MAX_MESSAGES = 5
+DEFAULT_PER_SECONDS = 5.0
+
+
+class DiscordMessageQueue:
+    """
+    Ordered outbound message queue for a single channel.
+
+    Messages are sent one at a time and paced with a sliding window so the
+    queue stays under the per-channel rate limit instead of tripping it.
+    """
+
+    channel: Any
+    max_messages: int
+    per_seconds: float
+
+    def __init__(
+        self,
+        channel: Any,
+        max_messages: int = DEFAULT_MAX_MESSAGES,
+        per_seconds: float = DEFAULT_PER_SECONDS,
+    ):
+        self.channel = channel
+        self.max_messages = max_messages
+        self.per_seconds = per_seconds
+        self._pending: deque[str] = deque()
+        self._sent_at: deque[float] = deque()
+
+    def put(self, content: str) -> None:
+        self._pending.append(content)
+
+    def extend(self, contents: list[str]) -> None:
+        self._pending.extend(contents)
+
+    async def flush(self) -> int:
+        """
+        Send every pending message in order.
+
+        Returns:
+            The number of messages sent.
+        """
+        sent = 0
+        while self._pending:
+            await self._wait_for_slot()
+            await self.channel.send(self._pending[0])
+            self._pending.popleft()
+            self._sent_at.append(time.monotonic())
+            sent += 1
+        LOG.debug("Flushed %s messages", sent)
+        return sent
+
+    async def _wait_for_slot(self) -> None:
+        now = time.monotonic()
+        while self._sent_at and now - self._sent_at[0] >= self.per_seconds:
+            self._sent_at.popleft()
+        if len(self._sent_at) >= self.max_messages:
+            delay = self.per_seconds - (now - self._sent_at[0])
+            LOG.debug("Rate limit window full, waiting %.2fs", delay)
+            await asyncio.sleep(delay)
+            self._sent_at.popleft()
@@ -2,6 +2,8 @@ from typing import TypedDict
 
 from email_summarizer.models.email import Email
 from email_summarizer.utils.redaction_utils import redact_pii
+from email_summarizer.utils.template_utils import TemplateDiff
+from email_summarizer.utils.truncation_utils import truncate_to_token_budget
 
 
 class EmailPromptPayload(TypedDict):
@@ -10,10 +12,31 @@ class EmailPromptPayload(TypedDict):
 
 
 def email_to_prompt(
-    email: Email, disable_redaction: bool = False
+    email: Email,
+    disable_redaction: bool = False,
+    body_token_budget: int | None = None,
+    extractive_sentences: int = 0,
+    extractive_char_budget: int | None = None,
 ) -> EmailPromptPayload:
-    body = email.body_preview
+    """
+    Build the model prompt for an email.
+
+    With extractive_sentences, only that many of the body's most central
+    sentences, up to extractive_char_budget characters, are kept. With a
+    body_token_budget, long bodies are truncated to it before redaction,
+    which bounds both the input tokens and the time spent redacting.
+    """
+    body = email.load_body()
     was_redacted = False
+    if isinstance(body, str) and extractive_sentences > 0:
+        # Loads NumPy, so only imported when the stage is configured
+        from email_summarizer.utils.extractive_utils import extract_sentences
+
+        body = extract_sentences(
+            body, extractive_sentences, extractive_char_budget or len(body)
+        )
+    if isinstance(body, str) and body_token_budget is not None:
+        body = truncate_to_token_budget(body, body_token_budget)
     if isinstance(body, str) and not disable_redaction:
         payload = redact_pii(body)
         was_redacted = payload["was_redacted"]
@@ -28,3 +51,23 @@ Body:
 </body>""",
         "was_redacted": was_redacted,
     }
+
+
+def template_diff_to_prompt(
+    email: Email, diff: TemplateDiff, body_token_budget: int | None = None
+) -> EmailPromptPayload:
+    """
+    Build the model prompt for a recurring email from the lines that changed
+    since the sender's previous email and that email's summary.
+    """
+    payload = email_to_prompt(
+        email.with_body("\n".join(diff.changed_lines)),
+        body_token_budget=body_token_budget,
+    )
+    return {
+        "prompt_body": f"""\
+{payload["prompt_body"]}
+Previous summary:
+<previous_summary>{diff.previous_summary}</previous_summary>""",
+        "was_redacted": payload["was_redacted"],
+    }
@@ -0,0 +1,75 @@
+import re
+
+import numpy as np
+
+from email_summarizer.utils.tfidf_utils import hashed_tfidf_vectors
+
+DAMPING = 0.85
+MAX_ITERATIONS = 50
+TOLERANCE = 1e-6
+
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|\s*\n\s*")
+_WORD = re.compile(r"[a-z]{3,}|\d+")
+
+
+def split_text_units(text: str) -> list[str]:
+    """Sentences and lines of the text, blank ones dropped."""
+    return [
+        sentence.strip()
+        for sentence in _SENTENCE_BREAK.split(text)
+        if sentence and sentence.strip()
+    ]
+
+
+def textrank_scores(sentences: list[str]) -> np.ndarray:
+    """
+    TextRank centrality of every sentence: PageRank over the graph whose
+    edges are the cosine similarities between sentences. Sentences that
+    share no words with any other spread their vote evenly.
+    """
+    count = len(sentences)
+    vectors = hashed_tfidf_vectors(
+        [_WORD.findall(sentence.lower()) for sentence in sentences]
+    )
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0)
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    transition = np.where(
+        out_weight > 0, similarity / np.where(out_weight == 0, 1, out_weight), 1 / count
+    )
+    scores = np.full(count, 1 / count)
+    for _ in range(MAX_ITERATIONS):
+        updated = (1 - DAMPING) / count + DAMPING * (transition.T @ scores)
+        converged = np.abs(updated - scores).sum() < TOLERANCE
+        scores = updated
+        if converged:
+            break
+    return scores
+
+
+def extract_sentences(text: str, max_sentences: int, char_budget: int) -> str:
+    """
+    The max_sentences most central sentences of the text that fit in
+    char_budget characters, in their original order.
+
+    Text that already fits is returned unchanged. A text whose every
+    sentence is over the budget is cut at the budget instead.
+    """
+    sentences = split_text_units(text)
+    if len(sentences) <= max_sentences and len(text) <= char_budget:
+        return text
+    scores = textrank_scores(sentences)
+    chosen: list[int] = []
+    used_chars = 0
+    # Stable so ties keep the earlier sentence
+    for index in np.argsort(-scores, kind="stable"):
+        if len(chosen) == max_sentences:
+            break
+        sentence_chars = len(sentences[index]) + 1
+        if used_chars + sentence_chars > char_budget:
+            continue
+        chosen.append(int(index))
+        used_chars += sentence_chars
+    if not chosen:
+        return text[:char_budget]
+    return "\n".join(sentences[index] for index in sorted(chosen))
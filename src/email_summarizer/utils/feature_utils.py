@@ -0,0 +1,36 @@
+import re
+
+_WORD = re.compile(r"[a-z]+|\d+")
+_ADDRESS = re.compile(r"<?([\w.+-]+)@([\w-]+(?:\.[\w-]+)+)>?")
+
+
+def email_features(sender: str, subject: str) -> list[str]:
+    """
+    Features intents are predicted and emails clustered from: the sender's
+    address, domain and display name words, and the subject's words and
+    word pairs. Numbers are
+    folded together so order numbers and dates don't fragment the features.
+    """
+    features: list[str] = []
+    sender = sender.lower()
+    address = _ADDRESS.search(sender)
+    if address:
+        local_part, domain = address.groups()
+        features.append(f"address:{local_part}@{domain}")
+        features.append(f"domain:{domain}")
+        features.append(f"site:{'.'.join(domain.split('.')[-2:])}")
+        features.extend(f"local:{word}" for word in _words(local_part))
+        name_end = address.start()
+        sender = sender[:name_end]
+    features.extend(f"name:{word}" for word in _words(sender))
+    subject_words = _words(subject.lower())
+    features.extend(f"subject:{word}" for word in subject_words)
+    features.extend(
+        f"pair:{first}_{second}"
+        for first, second in zip(subject_words, subject_words[1:])
+    )
+    return features
+
+
+def _words(text: str) -> list[str]:
+    return ["#" if word.isdigit() else word for word in _WORD.findall(text)]
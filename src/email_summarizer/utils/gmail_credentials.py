@@ -1,15 +1,19 @@
 import os
-
-from google.oauth2.credentials import Credentials
+from typing import TYPE_CHECKING
 
 from email_summarizer.models.enums import EmailAccounts
 
+if TYPE_CHECKING:
+    from google.oauth2.credentials import Credentials
+
 SCOPES = ["https://www.googleapis.com/auth/gmail.readonly"]  # Read-only access
 
 TOKEN_URI = "https://oauth2.googleapis.com/token"
 
 
-def build_gmail_credentials(email_account: EmailAccounts) -> Credentials:
+def build_gmail_credentials(email_account: EmailAccounts) -> "Credentials":
+    from google.oauth2.credentials import Credentials
+
     return Credentials(
         token=None,
         token_uri=TOKEN_URI,
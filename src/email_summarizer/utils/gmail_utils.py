@@ -1,14 +1,34 @@
+from functools import partial
+
 from email_summarizer.models.enums import EmailAccounts
 from email_summarizer.services.gmail import authenticate_gmail, list_emails
+from email_summarizer.services.message_ledger import (
+    LEDGER_LISTING_SIZE,
+    filter_reported,
+)
 
 
 class EmailUnavailableError(Exception):
     pass
 
 
+def get_gmail_service(email_account: EmailAccounts):
+    """
+    Get an authenticated gmail service.
+
+    Raises:
+        EmailUnavailableError: If the gmail service is not available.
+        RefreshTokenInvalidError: If the refresh token is invalid.
+    """
+    gmail_service = authenticate_gmail(email_account)
+    if not gmail_service:
+        raise EmailUnavailableError("Gmail service not available.")
+    return gmail_service
+
+
 def get_emails(email_account: EmailAccounts, max_results: int):
     """
-    Get emails from gmail.
+    Get emails from gmail, skipping those an earlier run already reported.
 
     Args:
         email_account: The email account to get emails from.
@@ -21,8 +41,11 @@ def get_emails(email_account: EmailAccounts, max_results: int):
     Returns:
         A list of emails.
     """
-    gmail_service = authenticate_gmail(email_account)
-    if not gmail_service:
-        raise EmailUnavailableError("Gmail service not available.")
-    emails = list_emails(gmail_service, max_results=max_results)
+    gmail_service = get_gmail_service(email_account)
+    emails = list_emails(
+        gmail_service,
+        max_results=max_results,
+        message_filter=partial(filter_reported, email_account),
+        listing_size=LEDGER_LISTING_SIZE,
+    )
     return emails
@@ -15,7 +15,7 @@ class GroupingCategory(BaseModel):
     high_priority: bool = False
 
 
-def _build_grouping_categories() -> list[GroupingCategory]:
+def build_grouping_categories() -> list[GroupingCategory]:
     spouse_regex = re.compile(os.getenv("SPOUSE_REGEX"), re.IGNORECASE)
     daycare_regex = re.compile(os.getenv("DAYCARE_REGEX"), re.IGNORECASE)
     return [
@@ -55,33 +55,48 @@ class GroupingPayload(TypedDict):
 
 
 def group_emails(emails: list[Email]) -> GroupingPayload:
-    grouped_emails: list[GroupedEmails] = []
     high_priority_emails: list[Email] = []
     ungrouped_emails: list[Email] = []
-    grouping_categories = _build_grouping_categories()
+    grouping_categories = build_grouping_categories()
     for email in emails:
-        for grouping_category in grouping_categories:
-            if re.search(grouping_category.regex, email.sender):
-                grouping_category.count += 1
-                if grouping_category.sender is None:
-                    grouping_category.sender = email.sender
-                if grouping_category.high_priority:
-                    high_priority_emails.append(email)
-                break
-        else:
+        grouping_category = classify_email(email, grouping_categories)
+        if grouping_category is None:
             ungrouped_emails.append(email)
+        elif grouping_category.high_priority:
+            high_priority_emails.append(email)
     # end for loop
 
-    for grouping_category in grouping_categories:
-        if grouping_category.count > 0 and not grouping_category.high_priority:
-            grouped_emails.append(
-                GroupedEmails(
-                    sender=grouping_category.sender or grouping_category.name,
-                    count=grouping_category.count,
-                )
-            )
     return GroupingPayload(
-        list_of_grouped_emails=grouped_emails,
+        list_of_grouped_emails=tally_grouped_emails(grouping_categories),
         ungrouped_emails=ungrouped_emails,
         high_priority_emails=high_priority_emails,
     )
+
+
+def classify_email(
+    email: Email, grouping_categories: list[GroupingCategory]
+) -> GroupingCategory | None:
+    """
+    Find the category an email's sender belongs to and count the email in
+    it. Only the sender is looked at, so the body is never decoded.
+    """
+    for grouping_category in grouping_categories:
+        if re.search(grouping_category.regex, email.sender):
+            grouping_category.count += 1
+            if grouping_category.sender is None:
+                grouping_category.sender = email.sender
+            return grouping_category
+    return None
+
+
+def tally_grouped_emails(
+    grouping_categories: list[GroupingCategory],
+) -> list[GroupedEmails]:
+    return [
+        GroupedEmails(
+            sender=grouping_category.sender or grouping_category.name,
+            count=grouping_category.count,
+        )
+        for grouping_category in grouping_categories
+        if grouping_category.count > 0 and not grouping_category.high_priority
+    ]
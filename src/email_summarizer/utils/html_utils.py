@@ -0,0 +1,232 @@
+import os
+import re
+from html.parser import HTMLParser
+
+from email_summarizer.models.enums import HtmlTextEngine
+from email_summarizer.utils.token_utils import CHARS_PER_TOKEN
+from email_summarizer.utils.truncation_utils import LONG_EMAIL_MAX_TOKENS
+
+HTML_TEXT_ENGINE = os.getenv("HTML_TEXT_ENGINE", HtmlTextEngine.STREAMING.value)
+# Text kept from one body: enough for every chunk of a long email, since
+# estimated tokens rarely average more than CHARS_PER_TOKEN characters.
+HTML_TEXT_MAX_CHARS = max(20_000, LONG_EMAIL_MAX_TOKENS * CHARS_PER_TOKEN)
+FEED_CHUNK_CHARS = 8_192
+
+_HTML_TAG = re.compile(r"<(?:[a-zA-Z][a-zA-Z0-9]*|!--|!doctype)[\s>/]", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+_HIDDEN_STYLE = re.compile(
+    r"display\s*:\s*none|visibility\s*:\s*hidden|mso-hide\s*:\s*all"
+    r"|max-height\s*:\s*0(?:px)?\s*(?:;|$)|font-size\s*:\s*0(?:px)?\s*(?:;|$)",
+    re.IGNORECASE,
+)
+_SKIPPED_TAGS = frozenset(
+    {"head", "noscript", "script", "style", "svg", "template", "title"}
+)
+_VOID_TAGS = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+_BLOCK_TAGS = frozenset(
+    {
+        "address",
+        "article",
+        "aside",
+        "blockquote",
+        "br",
+        "center",
+        "dd",
+        "div",
+        "dl",
+        "dt",
+        "footer",
+        "form",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "header",
+        "hr",
+        "li",
+        "main",
+        "nav",
+        "ol",
+        "p",
+        "pre",
+        "section",
+        "table",
+        "tr",
+        "ul",
+    }
+)
+
+# Elements whose end tag may be left out, with the start tags that close
+# them. An open element is only closed within its scope, so a nested list
+# item does not close the item its list is in.
+_P_CLOSING_TAGS = frozenset(
+    _BLOCK_TAGS - {"br", "center", "dd", "dt", "li", "tr"} | {"menu", "details"}
+)
+_BUTTON_SCOPE = frozenset(
+    {"button", "caption", "html", "marquee", "object", "table", "td", "th"}
+)
+_IMPLIED_END_TAGS: dict[str, tuple[frozenset[str], frozenset[str]]] = {
+    "li": (frozenset({"li"}), frozenset({"ol", "ul", "table"})),
+    "dt": (frozenset({"dt", "dd"}), frozenset({"dl", "table"})),
+    "dd": (frozenset({"dt", "dd"}), frozenset({"dl", "table"})),
+    "td": (frozenset({"td", "th"}), frozenset({"tr", "table"})),
+    "th": (frozenset({"td", "th"}), frozenset({"tr", "table"})),
+    "tr": (frozenset({"tr"}), frozenset({"table"})),
+    "option": (frozenset({"option"}), frozenset({"select", "datalist"})),
+}
+
+
+class StreamingTextExtractor(HTMLParser):
+    """
+    Pulls the visible text out of HTML in one pass, without building a tree.
+
+    Content of script/style/head and of hidden elements is skipped, block
+    elements become line breaks and whitespace is collapsed. Once max_chars
+    of text have been collected the extractor is done and ignores the rest.
+    """
+
+    def __init__(self, max_chars: int = HTML_TEXT_MAX_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.done = False
+        self._pieces: list[str] = []
+        self._length = 0
+        # Open elements, each flagged with whether it hides its content.
+        self._open_tags: list[tuple[str, bool]] = []
+        self._hidden_depth = 0
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._close_implied(tag)
+        if tag in _BLOCK_TAGS:
+            self._append("\n")
+        if tag in _VOID_TAGS:
+            return
+        hides = tag in _SKIPPED_TAGS or _is_hidden(attrs)
+        self._open_tags.append((tag, hides))
+        if hides:
+            self._hidden_depth += 1
+
+    def handle_startendtag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in _BLOCK_TAGS:
+            self._append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        # Unclosed children are closed along with their parent.
+        for index in range(len(self._open_tags) - 1, -1, -1):
+            if self._open_tags[index][0] == tag:
+                self._close_from(index)
+                break
+        if tag in _BLOCK_TAGS or tag in ("td", "th"):
+            self._append("\n" if tag in _BLOCK_TAGS else " ")
+
+    def handle_data(self, data: str) -> None:
+        if self._hidden_depth == 0:
+            self._append(_WHITESPACE.sub(" ", data))
+
+    def get_text(self) -> str:
+        lines = (line.strip() for line in "".join(self._pieces).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+    def _close_implied(self, tag: str) -> None:
+        """Close the open sibling that the tag ends without an end tag."""
+        if tag in _P_CLOSING_TAGS:
+            closes, scope = frozenset({"p"}), _BUTTON_SCOPE
+        elif tag in _IMPLIED_END_TAGS:
+            closes, scope = _IMPLIED_END_TAGS[tag]
+        else:
+            return
+        for index in range(len(self._open_tags) - 1, -1, -1):
+            open_tag, _ = self._open_tags[index]
+            if open_tag in closes:
+                self._close_from(index)
+                return
+            if open_tag in scope:
+                return
+
+    def _close_from(self, index: int) -> None:
+        """Close the open element at index and everything opened inside it."""
+        while len(self._open_tags) > index:
+            _, hides = self._open_tags.pop()
+            if hides:
+                self._hidden_depth -= 1
+
+    def _append(self, text: str) -> None:
+        if self.done or not text:
+            return
+        self._pieces.append(text)
+        self._length += len(text)
+        if self._length >= self.max_chars:
+            self.done = True
+
+
+def _is_hidden(attrs: list[tuple[str, str | None]]) -> bool:
+    for name, value in attrs:
+        if name == "hidden":
+            return True
+        if name == "aria-hidden" and value == "true":
+            return True
+        if name == "style" and value and _HIDDEN_STYLE.search(value):
+            return True
+    return False
+
+
+def looks_like_html(text: str) -> bool:
+    return _HTML_TAG.search(text) is not None
+
+
+def html_to_text_streaming(html: str, max_chars: int = HTML_TEXT_MAX_CHARS) -> str:
+    extractor = StreamingTextExtractor(max_chars=max_chars)
+    for start in range(0, len(html), FEED_CHUNK_CHARS):
+        end = start + FEED_CHUNK_CHARS
+        extractor.feed(html[start:end])
+        if extractor.done:
+            break
+    else:
+        extractor.close()
+    return extractor.get_text()[:max_chars]
+
+
+def html_to_text_soup(html: str) -> str:
+    """The original BeautifulSoup html.parser extraction."""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+    return soup.get_text(separator=" ", strip=True)
+
+
+def html_to_text(
+    html: str,
+    engine: HtmlTextEngine | None = None,
+    max_chars: int = HTML_TEXT_MAX_CHARS,
+) -> str:
+    """
+    Extract readable text from an email body with the configured engine.
+
+    Bodies without any markup are returned unchanged so plain-text line
+    breaks survive.
+    """
+    engine = engine or HtmlTextEngine(HTML_TEXT_ENGINE.upper())
+    if engine == HtmlTextEngine.BEAUTIFULSOUP:
+        return html_to_text_soup(html)
+    if not looks_like_html(html):
+        return html[:max_chars].strip()
+    return html_to_text_streaming(html, max_chars=max_chars)
@@ -0,0 +1,112 @@
+import zlib
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel
+
+from email_summarizer.models.email import Email
+from email_summarizer.models.enums import EmailIntent
+from email_summarizer.utils.feature_utils import email_features
+
+# 2^14 hashed features x 8 intents of float32 is 512 KB of weights.
+DEFAULT_FEATURE_BITS = 14
+INTENTS = list(EmailIntent)
+
+
+class IntentPrediction(BaseModel):
+    intent: EmailIntent
+    confidence: float
+
+
+def hash_features(features: list[str], feature_bits: int) -> np.ndarray:
+    """Column indexes of the features. crc32 is stable across processes."""
+    mask = (1 << feature_bits) - 1
+    return np.unique(
+        np.fromiter(
+            (zlib.crc32(feature.encode()) & mask for feature in features),
+            dtype=np.int64,
+            count=len(features),
+        )
+    )
+
+
+class IntentClassifier:
+    """
+    Multinomial logistic regression over hashed sender and subject features.
+
+    Scoring an email sums the weight columns of its features, so it costs a
+    few hundred additions whatever the vocabulary.
+    """
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray):
+        if weights.shape[0] != len(INTENTS) or bias.shape != (len(INTENTS),):
+            raise ValueError("Weights need one row per intent")
+        self.weights = weights
+        self.bias = bias
+        self.feature_bits = int(weights.shape[1]).bit_length() - 1
+
+    @classmethod
+    def untrained(cls, feature_bits: int = DEFAULT_FEATURE_BITS) -> "IntentClassifier":
+        return cls(
+            np.zeros((len(INTENTS), 1 << feature_bits), dtype=np.float32),
+            np.zeros(len(INTENTS), dtype=np.float32),
+        )
+
+    @classmethod
+    def fit(
+        cls,
+        examples: list[tuple[Email, EmailIntent]],
+        feature_bits: int = DEFAULT_FEATURE_BITS,
+        epochs: int = 10,
+        learning_rate: float = 0.5,
+        l2: float = 1e-4,
+        seed: int = 0,
+    ) -> "IntentClassifier":
+        """
+        Train with stochastic gradient descent on the softmax loss. Each step
+        only touches the weight columns of one email's features.
+        """
+        classifier = cls.untrained(feature_bits)
+        rows = [
+            (classifier.feature_indexes(email), INTENTS.index(intent))
+            for email, intent in examples
+        ]
+        rng = np.random.default_rng(seed)
+        for epoch in range(epochs):
+            step = learning_rate / (1 + epoch)
+            for row in rng.permutation(len(rows)):
+                indexes, label = rows[row]
+                gradient = classifier._probabilities(indexes)
+                gradient[label] -= 1.0
+                columns = classifier.weights[:, indexes]
+                classifier.weights[:, indexes] = (
+                    columns * (1 - step * l2) - step * gradient[:, np.newaxis]
+                )
+                classifier.bias -= step * gradient
+        return classifier
+
+    @classmethod
+    def load(cls, path: str | Path) -> "IntentClassifier":
+        with np.load(path) as saved:
+            return cls(saved["weights"], saved["bias"])
+
+    def save(self, path: str | Path) -> None:
+        with open(path, "wb") as model_file:
+            np.savez_compressed(model_file, weights=self.weights, bias=self.bias)
+
+    def feature_indexes(self, email: Email) -> np.ndarray:
+        return hash_features(
+            email_features(email.sender, email.subject), self.feature_bits
+        )
+
+    def predict(self, email: Email) -> IntentPrediction:
+        probabilities = self._probabilities(self.feature_indexes(email))
+        best = int(np.argmax(probabilities))
+        return IntentPrediction(
+            intent=INTENTS[best], confidence=float(probabilities[best])
+        )
+
+    def _probabilities(self, indexes: np.ndarray) -> np.ndarray:
+        scores = self.weights[:, indexes].sum(axis=1) + self.bias
+        scores = np.exp(scores - scores.max())
+        return scores / scores.sum()
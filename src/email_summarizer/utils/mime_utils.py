@@ -0,0 +1,118 @@
+import base64
+import binascii
+import logging
+import quopri
+import re
+
+from pydantic import BaseModel
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_CHARSET = "utf-8"
+PLAIN_TEXT = "text/plain"
+HTML_TEXT = "text/html"
+
+_CHARSET = re.compile(r"""charset\s*=\s*["']?([^"';\s]+)""", re.IGNORECASE)
+# Gmail has already undone the transfer encoding of "full" payloads, so
+# quoted-printable is only undone again when an escaped "=" or a soft line
+# break shows it was applied twice. Any other "=XX" may be ordinary text,
+# e.g. "?id=4F2A" in a link.
+_DOUBLE_QUOTED_PRINTABLE = re.compile(rb"=3D|=\r?\n")
+
+
+class BodyPart(BaseModel):
+    """
+    A text part of a Gmail "full" payload, still in its transfer encoding.
+
+    Nothing is decoded until decode() is called, so parts that end up
+    unused cost nothing beyond the walk.
+    """
+
+    mime_type: str
+    data: str
+    charset: str = DEFAULT_CHARSET
+    transfer_encoding: str | None = None
+
+    def decode(self) -> str | None:
+        """
+        Decode the base64url data with the declared charset, undoing
+        quoted-printable encoding that was applied twice.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(self.data)
+        except (binascii.Error, ValueError) as e:
+            LOG.error("Error decoding body: %s", e)
+            return None
+        if (
+            self.transfer_encoding == "quoted-printable"
+            and _DOUBLE_QUOTED_PRINTABLE.search(raw)
+        ):
+            raw = quopri.decodestring(raw)
+        return decode_bytes(raw, self.charset)
+
+
+def decode_bytes(raw: bytes, charset: str = DEFAULT_CHARSET) -> str:
+    """Decode with the declared charset, falling back to UTF-8, never failing."""
+    try:
+        return raw.decode(charset, errors="replace")
+    except LookupError:
+        LOG.warning("Unknown charset %s, decoding as %s", charset, DEFAULT_CHARSET)
+        return raw.decode(DEFAULT_CHARSET, errors="replace")
+
+
+def part_headers(part: dict) -> dict[str, str]:
+    return {
+        header["name"].lower(): header.get("value", "")
+        for header in part.get("headers", [])
+    }
+
+
+def is_attachment(part: dict) -> bool:
+    body = part.get("body", {})
+    disposition = part_headers(part).get("content-disposition", "")
+    return (
+        bool(part.get("filename"))
+        or "attachmentId" in body
+        or disposition.lower().startswith("attachment")
+    )
+
+
+def walk_text_parts(payload: dict):
+    """
+    Yield every inline text part of a payload, depth first in document order,
+    at any nesting depth. Attachments are skipped without being decoded.
+    """
+    if not payload or is_attachment(payload):
+        return
+    for part in payload.get("parts", []):
+        yield from walk_text_parts(part)
+    mime_type = payload.get("mimeType", "").lower()
+    data = payload.get("body", {}).get("data")
+    if not data or not (mime_type.startswith("text/") or mime_type == ""):
+        return
+    headers = part_headers(payload)
+    charset = _CHARSET.search(headers.get("content-type", ""))
+    yield BodyPart(
+        mime_type=mime_type,
+        data=data,
+        charset=charset.group(1).lower() if charset else DEFAULT_CHARSET,
+        transfer_encoding=(
+            headers.get("content-transfer-encoding", "").strip().lower() or None
+        ),
+    )
+
+
+def find_body_part(payload: dict) -> BodyPart | None:
+    """
+    The part to read the body from: the first text/plain part anywhere in
+    the tree, otherwise the first text/html part, otherwise any text part.
+    """
+    fallback: BodyPart | None = None
+    html_part: BodyPart | None = None
+    for part in walk_text_parts(payload):
+        if part.mime_type == PLAIN_TEXT:
+            return part
+        if part.mime_type == HTML_TEXT and html_part is None:
+            html_part = part
+        fallback = fallback or part
+    return html_part or fallback
@@ -0,0 +1,124 @@
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Callable, Iterable
+
+from pydantic import BaseModel
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 8
+
+# Marks the end of a stage's input. Workers put it back on their input queue
+# so every sibling worker sees it too.
+_END_OF_STREAM = object()
+
+
+class Stage:
+    """
+    One step of a pipeline: fn is applied to every item by `concurrency`
+    workers. Blocking functions run in a worker thread; coroutine functions
+    and blocking=False functions run on the event loop. Returning None drops
+    the item from the rest of the pipeline.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[Any], Any],
+        concurrency: int = 1,
+        blocking: bool = True,
+    ):
+        if concurrency < 1:
+            raise ValueError(f"Stage {name} needs at least one worker")
+        self.name = name
+        self.fn = fn
+        self.concurrency = concurrency
+        self.blocking = blocking
+
+    async def apply(self, item: Any) -> Any:
+        if inspect.iscoroutinefunction(self.fn):
+            return await self.fn(item)
+        if self.blocking:
+            return await asyncio.to_thread(self.fn, item)
+        return self.fn(item)
+
+
+class StageStats(BaseModel):
+    name: str
+    items: int = 0
+    busy_seconds: float = 0.0
+
+
+async def run_pipeline(
+    source: Iterable[Any],
+    stages: list[Stage],
+    sink: Callable[[Any], None],
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+) -> list[StageStats]:
+    """
+    Stream items from source through the stages into sink.
+
+    Stages are connected by queues holding at most queue_size items, so a
+    stage that falls behind makes the ones before it wait instead of
+    buffering. At most sum(queue sizes + worker counts) items are in flight
+    whatever the size of the source, and throughput is bound by the slowest
+    stage rather than the sum of all of them. Items may reach the sink out
+    of source order. An error in any stage cancels the whole pipeline.
+
+    Returns:
+        The number of items each stage handled and its total busy time.
+    """
+    queues: list[asyncio.Queue] = [
+        asyncio.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)
+    ]
+    stats = [StageStats(name=stage.name) for stage in stages]
+
+    async def feed() -> None:
+        for item in source:
+            await queues[0].put(item)
+        await queues[0].put(_END_OF_STREAM)
+
+    async def drain() -> None:
+        while (item := await queues[-1].get()) is not _END_OF_STREAM:
+            sink(item)
+
+    async with asyncio.TaskGroup() as task_group:
+        task_group.create_task(feed())
+        for index, stage in enumerate(stages):
+            next_index = index + 1
+            task_group.create_task(
+                _run_stage(stage, queues[index], queues[next_index], stats[index])
+            )
+        task_group.create_task(drain())
+
+    for stage_stats in stats:
+        LOG.debug(
+            "Pipeline stage %s: %d items, %.3fs busy",
+            stage_stats.name,
+            stage_stats.items,
+            stage_stats.busy_seconds,
+        )
+    return stats
+
+
+async def _run_stage(
+    stage: Stage, inbox: asyncio.Queue, outbox: asyncio.Queue, stats: StageStats
+) -> None:
+    async def worker() -> None:
+        while True:
+            item = await inbox.get()
+            if item is _END_OF_STREAM:
+                # Nothing else is put on the queue any more, so there is room.
+                inbox.put_nowait(_END_OF_STREAM)
+                return
+            start = time.perf_counter()
+            result = await stage.apply(item)
+            stats.busy_seconds += time.perf_counter() - start
+            stats.items += 1
+            if result is not None:
+                await outbox.put(result)
+
+    await asyncio.gather(*(worker() for _ in range(stage.concurrency)))
+    await outbox.put(_END_OF_STREAM)
@@ -2,7 +2,7 @@ import re
 from typing import TypedDict
 
 from email_summarizer.prompts.pii_redaction import (
-    ALL_REDACTIONS,
+    all_redactions,
     combined_redactions_regex,
 )
 
@@ -22,7 +22,7 @@ def redact_pii(email_body: str) -> str:
     running_body = email_body
     combined_regex = combined_redactions_regex()
     if re.search(combined_regex, running_body):
-        for redaction in ALL_REDACTIONS:
+        for redaction in all_redactions():
             regex = redaction.regex
             running_body, num_subs = re.subn(regex, redaction.redaction, running_body)
             if num_subs > 0:
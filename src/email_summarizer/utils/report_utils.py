@@ -0,0 +1,100 @@
+from email_summarizer.models.report import EmailReport
+
+DISCORD_MESSAGE_LIMIT = 2000
+
+
+def report_header(email_report: EmailReport) -> str:
+    return f"# {email_report.email_account.value} Email Report {email_report.timestamp}"
+
+
+def any_grouped_emails(email_report: EmailReport) -> bool:
+    return any(grouped_email.count > 0 for grouped_email in email_report.grouped_emails)
+
+
+def render_report_lines(email_report: EmailReport) -> list[str]:
+    """
+    Render the report as the ordered list of lines it is displayed with.
+    """
+    lines = [report_header(email_report)]
+    if email_report.is_empty():
+        lines.append("*No emails to report.*")
+        return lines
+
+    if len(email_report.actionable_emails) > 0:
+        for i, actionable_email in enumerate(email_report.actionable_emails):
+            lines.append(
+                f"{i + 1}. ({actionable_email.email.sender}) {actionable_email.next_steps}"
+            )
+        lines.append("--------")
+    else:
+        lines.append("*No high priority emails to report.*")
+
+    if len(email_report.digests) > 0:
+        lines.append("### Digest")
+        for digest in email_report.digests:
+            lines.append(
+                f"- **{digest.intent.value}** ({digest.email_count} emails) {digest.body}"
+            )
+    elif len(email_report.summaries) > 0:
+        for i, summary in enumerate(email_report.summaries):
+            lines.append(f"{i + 1}. ({summary.email.sender}) {summary.body}")
+    else:
+        lines.append("*No regular emails to report.*")
+
+    if any_grouped_emails(email_report):
+        lines.append("### Grouped Emails")
+        for grouped_email in email_report.grouped_emails:
+            line = f"- ({grouped_email.sender}) - message count: {grouped_email.count}"
+            if grouped_email.summary:
+                line = f"{line}: {grouped_email.summary}"
+            lines.append(line)
+    else:
+        lines.append("*No grouped emails to report.*")
+
+    fallback_count = email_report.fallback_count()
+    if fallback_count > 0:
+        lines.append(
+            f"*{fallback_count} email(s) shown unsummarized: the model call failed or ran out of time.*"
+        )
+    return lines
+
+
+def pack_messages(lines: list[str], limit: int = DISCORD_MESSAGE_LIMIT) -> list[str]:
+    """
+    Pack lines into as few messages as possible without exceeding the limit.
+
+    Lines are never reordered. A single line longer than the limit is split
+    on whitespace where possible.
+    """
+    messages: list[str] = []
+    current = ""
+    for line in lines:
+        for piece in _split_line(line, limit):
+            if not current:
+                current = piece
+            elif len(current) + 1 + len(piece) <= limit:
+                current = f"{current}\n{piece}"
+            else:
+                messages.append(current)
+                current = piece
+    if current:
+        messages.append(current)
+    return messages
+
+
+def render_report_messages(
+    email_report: EmailReport, limit: int = DISCORD_MESSAGE_LIMIT
+) -> list[str]:
+    return pack_messages(render_report_lines(email_report), limit=limit)
+
+
+def _split_line(line: str, limit: int) -> list[str]:
+    pieces = []
+    while len(line) > limit:
+        split_at = line.rfind(" ", 0, limit + 1)
+        if split_at <= 0:
+            split_at = limit
+        pieces.append(line[:split_at].rstrip())
+        line = line[split_at:].lstrip()
+    pieces.append(line)
+    return pieces
@@ -0,0 +1,104 @@
+import logging
+import os
+import random
+import time
+from typing import Callable, TypeVar
+
+from email_summarizer.utils.deadline_utils import Deadline
+
+LOG = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Attempts per model call, the first one included.
+LLM_MAX_ATTEMPTS = int(os.getenv("LLM_MAX_ATTEMPTS", 2))
+
+# Bedrock error codes worth another attempt; anything else fails fast.
+# Throttling is left to ResilientModelClient, which backs off and can fall
+# back to another model, so retries don't multiply across both layers.
+RETRYABLE_ERROR_CODES = frozenset(
+    {
+        "InternalServerException",
+        "ModelNotReadyException",
+        "ModelTimeoutException",
+        "ServiceUnavailableException",
+    }
+)
+THROTTLING_ERROR_CODES = frozenset(
+    {
+        "ServiceQuotaExceededException",
+        "ThrottlingException",
+        "TooManyRequestsException",
+    }
+)
+# botocore connection errors, matched by name so botocore isn't imported here.
+# The read and connect timeouts are enforced by the client itself, so the
+# timed-out request is closed before it is sent again.
+RETRYABLE_ERROR_NAMES = frozenset(
+    {
+        "ConnectTimeoutError",
+        "ConnectionClosedError",
+        "EndpointConnectionError",
+        "ReadTimeoutError",
+    }
+)
+
+
+def error_code(error: BaseException) -> str | None:
+    """The AWS error code of a botocore ClientError, if it is one."""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return None
+    return response.get("Error", {}).get("Code")
+
+
+def is_throttling_error(error: BaseException) -> bool:
+    return error_code(error) in THROTTLING_ERROR_CODES
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    if isinstance(error, ConnectionError):
+        return True
+    if error_code(error) in RETRYABLE_ERROR_CODES:
+        return True
+    return type(error).__name__ in RETRYABLE_ERROR_NAMES
+
+
+def backoff_delay(attempt: int, base_seconds: float, cap_seconds: float = 8.0) -> float:
+    """Exponential backoff with full jitter for the given zero-based attempt."""
+    return random.uniform(0, min(cap_seconds, base_seconds * 2**attempt))
+
+
+def call_with_retries(
+    fn: Callable[[], T],
+    max_attempts: int,
+    backoff_base_seconds: float = 0.5,
+    deadline: Deadline | None = None,
+) -> T:
+    """
+    Call fn, retrying retryable errors.
+
+    How long one attempt may take is up to the client fn calls, e.g. the
+    Bedrock client's read timeout. No attempt is started once the deadline
+    has expired.
+
+    Raises:
+        The last error when attempts run out, the error isn't retryable or
+        there is no time left for another attempt.
+    """
+    for attempt in range(max_attempts):
+        if deadline is not None and deadline.expired():
+            raise TimeoutError("Deadline reached before the call was made")
+        try:
+            return fn()
+        except Exception as e:
+            if attempt + 1 >= max_attempts or not is_retryable_error(e):
+                raise
+            delay = backoff_delay(attempt, backoff_base_seconds)
+            if deadline is not None and delay >= deadline.remaining():
+                raise
+            LOG.warning(
+                "Attempt %d failed (%s), retrying in %.2fs", attempt + 1, e, delay
+            )
+            time.sleep(delay)
+    raise ValueError("max_attempts must be at least 1")
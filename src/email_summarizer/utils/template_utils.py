@@ -0,0 +1,68 @@
+import hashlib
+import re
+from email.utils import parseaddr
+
+from pydantic import BaseModel
+
+# Bodies with fewer lines are too short to be worth diffing.
+MIN_TEMPLATE_LINES = 5
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class SenderTemplate(BaseModel):
+    """What is remembered of the previous email from a sender."""
+
+    fingerprints: list[str]
+    summary: str
+
+
+class TemplateDiff(BaseModel):
+    """The lines of a body that are not in the sender's previous email."""
+
+    changed_lines: list[str]
+    previous_summary: str
+    shared_ratio: float
+
+
+def sender_key(sender: str) -> str:
+    """The sender's address, or the whole header when it has none."""
+    _, address = parseaddr(sender)
+    return (address or sender).strip().lower()
+
+
+def body_lines(body: str) -> list[str]:
+    """Non-blank lines of the body with their whitespace collapsed."""
+    lines = (_WHITESPACE.sub(" ", line).strip() for line in body.splitlines())
+    return [line for line in lines if line]
+
+
+def line_fingerprint(line: str) -> str:
+    return hashlib.blake2b(line.lower().encode(), digest_size=8).hexdigest()
+
+
+def line_fingerprints(body: str) -> list[str]:
+    return [line_fingerprint(line) for line in body_lines(body)]
+
+
+def template_diff(
+    body: str, template: SenderTemplate, min_shared_ratio: float
+) -> TemplateDiff | None:
+    """
+    Diff the body against the sender's previous email. Returns None when the
+    body is short or shares less than min_shared_ratio of its lines with the
+    template, i.e. it is not the same template.
+    """
+    lines = body_lines(body)
+    if len(lines) < MIN_TEMPLATE_LINES:
+        return None
+    previous = set(template.fingerprints)
+    changed_lines = [line for line in lines if line_fingerprint(line) not in previous]
+    shared_ratio = 1 - len(changed_lines) / len(lines)
+    if shared_ratio < min_shared_ratio:
+        return None
+    return TemplateDiff(
+        changed_lines=changed_lines,
+        previous_summary=template.summary,
+        shared_ratio=shared_ratio,
+    )
@@ -0,0 +1,25 @@
+import zlib
+
+import numpy as np
+
+DEFAULT_FEATURE_BITS = 12
+
+
+def hashed_tfidf_vectors(
+    documents: list[list[str]], feature_bits: int = DEFAULT_FEATURE_BITS
+) -> np.ndarray:
+    """
+    Hashed TF-IDF vectors of the documents' features, one L2-normalized row
+    per document. Document frequencies come from the documents themselves,
+    so features every document shares carry little weight.
+    """
+    mask = (1 << feature_bits) - 1
+    counts = np.zeros((len(documents), 1 << feature_bits), dtype=np.float32)
+    for row, features in enumerate(documents):
+        for feature in features:
+            counts[row, zlib.crc32(feature.encode()) & mask] += 1
+    document_frequency = np.count_nonzero(counts, axis=0)
+    idf = np.log((1 + len(documents)) / (1 + document_frequency)) + 1
+    vectors = np.log1p(counts) * idf
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
@@ -0,0 +1,138 @@
+import os
+import re
+
+from email_summarizer.utils.token_utils import estimate_tokens
+
+# Bodies estimated above this many tokens are summarized in chunks instead
+# of being truncated. 0 turns long-email mode off.
+LONG_EMAIL_TOKEN_THRESHOLD = int(os.getenv("LONG_EMAIL_TOKEN_THRESHOLD", 4000))
+LONG_EMAIL_CHUNK_TOKENS = int(os.getenv("LONG_EMAIL_CHUNK_TOKENS", 1500))
+LONG_EMAIL_CHUNK_OVERLAP_TOKENS = int(os.getenv("LONG_EMAIL_CHUNK_OVERLAP_TOKENS", 150))
+# Longer bodies are truncated to this many chunks before being split.
+LONG_EMAIL_MAX_CHUNKS = int(os.getenv("LONG_EMAIL_MAX_CHUNKS", 8))
+# Most body tokens a long email is summarized from.
+LONG_EMAIL_MAX_TOKENS = LONG_EMAIL_CHUNK_TOKENS * LONG_EMAIL_MAX_CHUNKS
+
+OMISSION_MARKER = "[...]"
+# Share of the budget kept for the start and the end of the body; the rest
+# goes to the key sentences in between.
+HEAD_SHARE = 0.5
+TAIL_SHARE = 0.2
+
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\s*\n+\s*")
+# Signals that a sentence carries something the reader has to act on.
+_KEY_PATTERNS = [
+    re.compile(
+        r"\b(please|deadline|due|required|action|confirm|reply|respond|rsvp|"
+        r"urgent|reminder|cancel\w*|schedul\w*|appointment|payment|invoice|"
+        r"today|tomorrow|tonight)\b",
+        re.IGNORECASE,
+    ),
+    re.compile(
+        r"\b(mon|tue|wed|thu|fri|sat|sun)[a-z]*\b|\b(jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.? \d",
+        re.IGNORECASE,
+    ),
+    re.compile(r"\d{1,2}[:/]\d{2}|\$\s?\d"),
+    re.compile(r"\?"),
+]
+
+
+def split_sentences(text: str) -> list[str]:
+    return [sentence for sentence in _SENTENCE_BOUNDARY.split(text) if sentence]
+
+
+def key_sentence_score(sentence: str) -> int:
+    return sum(len(pattern.findall(sentence)) for pattern in _KEY_PATTERNS)
+
+
+def truncate_to_token_budget(text: str, max_tokens: int) -> str:
+    """
+    Shorten text to about max_tokens, keeping the parts that matter most.
+
+    The opening sentences and the last lines are kept, and the budget left
+    in between goes to the sentences with the most dates, amounts,
+    questions and calls to action, in their original order. Gaps are marked
+    with OMISSION_MARKER. Text already within the budget is returned as is.
+    """
+    if estimate_tokens(text) <= max_tokens:
+        return text
+
+    sentences = split_sentences(text)
+    costs = [estimate_tokens(sentence) for sentence in sentences]
+
+    head_end = _take_from_start(costs, int(max_tokens * HEAD_SHARE))
+    if head_end == 0:
+        # Even the first sentence is over the budget.
+        return _clip_to_tokens(sentences[0], max_tokens) + f" {OMISSION_MARKER}"
+    tail_start = max(
+        head_end,
+        len(sentences) - _take_from_start(costs[::-1], int(max_tokens * TAIL_SHARE)),
+    )
+
+    remaining = max_tokens - sum(costs[:head_end]) - sum(costs[tail_start:])
+    kept = set(range(head_end)) | set(range(tail_start, len(sentences)))
+    middle = sorted(
+        range(head_end, tail_start),
+        key=lambda index: (-key_sentence_score(sentences[index]), index),
+    )
+    for index in middle:
+        if key_sentence_score(sentences[index]) == 0:
+            break
+        if costs[index] <= remaining:
+            kept.add(index)
+            remaining -= costs[index]
+
+    pieces: list[str] = []
+    for index in range(len(sentences)):
+        if index in kept:
+            pieces.append(sentences[index])
+        elif not pieces or pieces[-1] != OMISSION_MARKER:
+            pieces.append(OMISSION_MARKER)
+    return " ".join(pieces)
+
+
+def split_into_chunks(
+    text: str, chunk_tokens: int, overlap_tokens: int = 0
+) -> list[str]:
+    """
+    Split text on sentence boundaries into chunks of about chunk_tokens.
+
+    Each chunk repeats up to overlap_tokens of the sentences ending the
+    previous chunk, so a point made across a boundary is seen whole by at
+    least one chunk. A sentence longer than a chunk is clipped.
+    """
+    sentences = split_sentences(text)
+    costs = [estimate_tokens(sentence) for sentence in sentences]
+    chunks: list[str] = []
+    start = 0
+    while start < len(sentences):
+        fitting = _take_from_start(costs[start:], chunk_tokens)
+        if fitting == 0:
+            chunks.append(_clip_to_tokens(sentences[start], chunk_tokens))
+            start += 1
+            continue
+        end = start + fitting
+        chunks.append(" ".join(sentences[start:end]))
+        if end >= len(sentences):
+            break
+        # Never overlap the whole chunk, or the next one would not advance.
+        after_start = start + 1
+        start = end - _take_from_start(costs[after_start:end][::-1], overlap_tokens)
+    return chunks
+
+
+def _take_from_start(costs: list[int], budget: int) -> int:
+    """Number of leading items whose combined cost fits the budget."""
+    used = 0
+    for count, cost in enumerate(costs):
+        if used + cost > budget:
+            return count
+        used += cost
+    return len(costs)
+
+
+def _clip_to_tokens(text: str, max_tokens: int) -> str:
+    words = text.split()
+    return " ".join(
+        words[: _take_from_start([estimate_tokens(w) for w in words], max_tokens)]
+    )
@@ -0,0 +1,36 @@
+from ..base import BaseTestCase
+from email_summarizer.cli.import_audit import (
+    audit_import,
+    parse_importtime,
+    self_time_by_package,
+)
+
+IMPORTTIME_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     pydantic.fields
+import time:       200 |        300 |   pydantic
+import time:        50 |        350 | email_summarizer.app
+"""
+
+
+class TestImportAudit(BaseTestCase):
+    def test_parse_importtime(self):
+        records = parse_importtime(IMPORTTIME_OUTPUT)
+
+        self.assertEqual(
+            [record.name for record in records],
+            ["pydantic.fields", "pydantic", "email_summarizer.app"],
+        )
+        self.assertEqual(records[0].depth, 2)
+        self.assertEqual(records[2].cumulative_us, 350)
+
+    def test_self_time_by_package(self):
+        totals = self_time_by_package(parse_importtime(IMPORTTIME_OUTPUT))
+
+        self.assertEqual(totals, {"pydantic": 0.3, "email_summarizer": 0.05})
+
+    def test_lambda_handler_import_stays_lazy(self):
+        """Heavy dependencies must load on first use, not when Lambda imports the handler."""
+        audit = audit_import("lambda_function")
+
+        self.assertEqual(audit.forbidden_loaded, [])
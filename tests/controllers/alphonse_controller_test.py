@@ -1,93 +1,28 @@
+import asyncio
+import io
 from unittest.mock import patch, AsyncMock, Mock, call
 
 from ..base import BaseAsyncTestCase
 from ..test_utils import mock_email
 from email_summarizer.controllers.alphonse_controller import (
-    _report_header,
-    _any_grouped_emails,
     put_email_report,
+    put_email_reports,
+    start_email_report_task,
 )
 from email_summarizer.models.enums import EmailAccounts, SupportedModel
 from email_summarizer.models.report import EmailReport
+from email_summarizer.models.report_job import ReportJob
 from email_summarizer.models.email import GroupedEmails
 from email_summarizer.models.summary import Summary
 from email_summarizer.models.actionable_email import ActionableEmail
 from email_summarizer.utils.gmail_utils import EmailUnavailableError
 from email_summarizer.services.gmail import RefreshTokenInvalidError
+from email_summarizer.services.report_sinks import StdoutSink
+from email_summarizer.utils.deadline_utils import Deadline
 import discord
 
 
 class TestAlphonseController(BaseAsyncTestCase):
-    def test_report_header(self):
-        """Test that the report header is formatted correctly."""
-        # Create a mock email report
-        email_report = EmailReport(
-            email_account=EmailAccounts.PRIMARY,
-            timestamp="2023-01-01",
-            actionable_emails=[],
-            summaries=[],
-            grouped_emails=[],
-        )
-
-        # Call the function
-        header = _report_header(email_report)
-
-        # Assert the header is formatted correctly
-        self.assertEqual(header, "# PRIMARY Email Report 2023-01-01")
-
-    def test_any_grouped_emails_with_grouped_emails(self):
-        """Test that _any_grouped_emails returns True when there are grouped emails."""
-        # Create a mock email report with grouped emails
-        grouped_email = GroupedEmails(sender="test@example.com", count=2)
-        email_report = EmailReport(
-            email_account=EmailAccounts.PRIMARY,
-            timestamp="2023-01-01",
-            actionable_emails=[],
-            summaries=[],
-            grouped_emails=[grouped_email],
-        )
-
-        # Call the function
-        result = _any_grouped_emails(email_report)
-
-        # Assert the result is True
-        self.assertTrue(result)
-
-    def test_any_grouped_emails_without_grouped_emails(self):
-        """Test that _any_grouped_emails returns False when there are no grouped emails."""
-        # Create a mock email report without grouped emails
-        email_report = EmailReport(
-            email_account=EmailAccounts.PRIMARY,
-            timestamp="2023-01-01",
-            actionable_emails=[],
-            summaries=[],
-            grouped_emails=[],
-        )
-
-        # Call the function
-        result = _any_grouped_emails(email_report)
-
-        # Assert the result is False
-        self.assertFalse(result)
-
-    def test_any_grouped_emails_with_zero_count(self):
-        """Test that _any_grouped_emails returns False when grouped emails have count of 0."""
-        # Create a mock email report with grouped emails that have count of 0
-        grouped_email = GroupedEmails(sender="test@example.com", count=0)
-        email_report = EmailReport(
-            email_account=EmailAccounts.PRIMARY,
-            timestamp="2023-01-01",
-            actionable_emails=[],
-            summaries=[],
-            grouped_emails=[grouped_email],
-        )
-
-        # Call the function
-        result = _any_grouped_emails(email_report)
-
-        # Assert the result is False
-        self.assertFalse(result)
-
     @patch("email_summarizer.controllers.alphonse_controller.get_emails")
     @patch("email_summarizer.controllers.alphonse_controller.compile_email_report")
     async def test_put_email_report_channel_not_found(
@@ -120,10 +55,11 @@ class TestAlphonseController(BaseAsyncTestCase):
         mock_get_emails.assert_not_called()
         mock_compile_email_report.assert_not_called()
 
+    @patch("email_summarizer.controllers.alphonse_controller.record_reported")
     @patch("email_summarizer.controllers.alphonse_controller.get_emails")
     @patch("email_summarizer.controllers.alphonse_controller.compile_email_report")
     async def test_put_email_report_channel_success(
-        self, mock_compile_email_report, mock_get_emails
+        self, mock_compile_email_report, mock_get_emails, mock_record_reported
     ):
         # GIVEN
         mock_client = Mock()
@@ -168,14 +104,57 @@ class TestAlphonseController(BaseAsyncTestCase):
         # THEN
         mock_channel.send.assert_has_awaits(
             [
-                call("# PRIMARY Email Report 2023-01-01"),
-                call("*No high priority emails to report.*"),
-                call("1. (test_2@example.com) AI summary of the email"),
-                call("*No grouped emails to report.*"),
+                call(
+                    "# PRIMARY Email Report 2023-01-01\n"
+                    "*No high priority emails to report.*\n"
+                    "1. (test_2@example.com) AI summary of the email\n"
+                    "*No grouped emails to report.*"
+                ),
             ]
         )
+        mock_record_reported.assert_called_once_with(email_account, ["123456789"])
         mock_client.close.assert_awaited_once()
 
+    @patch("email_summarizer.controllers.alphonse_controller.record_reported")
+    @patch("email_summarizer.controllers.alphonse_controller.get_emails")
+    @patch("email_summarizer.controllers.alphonse_controller.compile_email_report")
+    async def test_put_email_report_does_not_record_failed_discord_post(
+        self, mock_compile_email_report, mock_get_emails, mock_record_reported
+    ):
+        # GIVEN a Discord post that fails while a stdout copy succeeds
+        mock_client = Mock()
+        mock_client.user = Mock()
+        mock_client.close = AsyncMock()
+        mock_channel = Mock()
+        mock_channel.send = AsyncMock(side_effect=RuntimeError("Discord is down"))
+        mock_client.get_channel.return_value = mock_channel
+        mocked_email = mock_email()
+        mock_get_emails.return_value = [mocked_email]
+        mock_compile_email_report.return_value = EmailReport(
+            email_account=EmailAccounts.PRIMARY,
+            timestamp="2023-01-01",
+            actionable_emails=[],
+            summaries=[Summary(email=mocked_email, body="AI summary of the email")],
+            grouped_emails=[],
+        )
+        stream = io.StringIO()
+
+        # WHEN
+        delivered = await put_email_report(
+            discord_client=mock_client,
+            email_account=EmailAccounts.PRIMARY,
+            channel_str="987654321",
+            max_emails=3,
+            target_model=SupportedModel.CLAUDE_HAIKU,
+            extra_sinks=[StdoutSink(stream)],
+        )
+
+        # THEN the emails are left for the next run
+        self.assertIn("AI summary of the email", stream.getvalue())
+        mock_record_reported.assert_not_called()
+        # AND the caller learns the channel didn't get the report
+        self.assertFalse(delivered)
+
     @patch("email_summarizer.controllers.alphonse_controller.get_emails")
     @patch("email_summarizer.controllers.alphonse_controller.compile_email_report")
     async def test_put_email_report_email_unavailable_error(
@@ -252,6 +231,24 @@ class TestAlphonseController(BaseAsyncTestCase):
         mock_get_emails.assert_not_called()
         mock_compile_email_report.assert_not_called()
 
+    async def test_put_email_report_raises_unexpected_errors(self):
+        # GIVEN a bug outside of the Discord transport
+        mock_client = Mock()
+        mock_client.user = Mock()
+        mock_client.close = AsyncMock()
+        mock_client.get_channel.side_effect = RuntimeError("bug")
+
+        # WHEN / THEN it propagates once the client is closed
+        with self.assertRaises(RuntimeError):
+            await put_email_report(
+                discord_client=mock_client,
+                email_account=EmailAccounts.PRIMARY,
+                channel_str="987654321",
+                max_emails=3,
+                target_model=SupportedModel.CLAUDE_HAIKU,
+            )
+        mock_client.close.assert_awaited_once()
+
     @patch("email_summarizer.controllers.alphonse_controller.get_emails")
     @patch("email_summarizer.controllers.alphonse_controller.compile_email_report")
     async def test_put_email_report_general_exception(
@@ -331,8 +328,7 @@ class TestAlphonseController(BaseAsyncTestCase):
         # THEN
         mock_channel.send.assert_has_awaits(
             [
-                call("# PRIMARY Email Report 2023-01-01"),
-                call("*No emails to report.*"),
+                call("# PRIMARY Email Report 2023-01-01\n*No emails to report.*"),
             ]
         )
         mock_client.close.assert_awaited_once()
@@ -391,11 +387,13 @@ class TestAlphonseController(BaseAsyncTestCase):
         # THEN
         mock_channel.send.assert_has_awaits(
             [
-                call("# PRIMARY Email Report 2023-01-01"),
-                call("1. (test@example.com) Action required: Respond to this email"),
-                call("--------"),
-                call("*No regular emails to report.*"),
-                call("*No grouped emails to report.*"),
+                call(
+                    "# PRIMARY Email Report 2023-01-01\n"
+                    "1. (test@example.com) Action required: Respond to this email\n"
+                    "--------\n"
+                    "*No regular emails to report.*\n"
+                    "*No grouped emails to report.*"
+                ),
             ]
         )
         mock_client.close.assert_awaited_once()
@@ -446,12 +444,14 @@ class TestAlphonseController(BaseAsyncTestCase):
         # THEN
         mock_channel.send.assert_has_awaits(
             [
-                call("# PRIMARY Email Report 2023-01-01"),
-                call("*No high priority emails to report.*"),
-                call("*No regular emails to report.*"),
-                call("### Grouped Emails"),
-                call("- (group1@example.com) - message count: 3"),
-                call("- (group2@example.com) - message count: 2"),
+                call(
+                    "# PRIMARY Email Report 2023-01-01\n"
+                    "*No high priority emails to report.*\n"
+                    "*No regular emails to report.*\n"
+                    "### Grouped Emails\n"
+                    "- (group1@example.com) - message count: 3\n"
+                    "- (group2@example.com) - message count: 2"
+                ),
             ]
         )
         mock_client.close.assert_awaited_once()
@@ -494,3 +494,203 @@ class TestAlphonseController(BaseAsyncTestCase):
         )
         mock_client.close.assert_awaited_once()
         mock_compile_email_report.assert_not_called()
+
+    @patch("email_summarizer.controllers.alphonse_controller.get_emails")
+    @patch("email_summarizer.controllers.alphonse_controller.compile_email_report")
+    async def test_put_email_report_awaits_started_report_task(
+        self, mock_compile_email_report, mock_get_emails
+    ):
+        # GIVEN
+        mock_client = Mock()
+        mock_client.user = Mock()
+        mock_client.user.name = "TestBot"
+        mock_client.user.id = "123456789"
+        mock_client.close = AsyncMock()
+        email_account = EmailAccounts.PRIMARY
+
+        mock_channel = Mock()
+        mock_client.get_channel.return_value = mock_channel
+        mock_channel.send = AsyncMock()
+
+        email_report = EmailReport(
+            email_account=email_account,
+            timestamp="2023-01-01",
+            actionable_emails=[],
+            summaries=[],
+            grouped_emails=[],
+        )
+
+        async def build_report():
+            return email_report
+
+        email_report_task = asyncio.create_task(build_report())
+
+        # WHEN
+        await put_email_report(
+            discord_client=mock_client,
+            email_account=email_account,
+            channel_str="987654321",
+            max_emails=3,
+            target_model=SupportedModel.CLAUDE_HAIKU,
+            email_report_task=email_report_task,
+        )
+
+        # THEN
+        mock_get_emails.assert_not_called()
+        mock_compile_email_report.assert_not_called()
+        mock_channel.send.assert_awaited_once_with(
+            "# PRIMARY Email Report 2023-01-01\n*No emails to report.*"
+        )
+        mock_client.close.assert_awaited_once()
+
+    async def test_put_email_report_cancels_task_when_channel_missing(self):
+        # GIVEN
+        mock_client = Mock()
+        mock_client.user = Mock()
+        mock_client.user.name = "TestBot"
+        mock_client.user.id = "123456789"
+        mock_client.close = AsyncMock()
+        mock_client.get_channel.return_value = None
+
+        email_report_task = asyncio.create_task(asyncio.sleep(10))
+
+        # WHEN
+        await put_email_report(
+            discord_client=mock_client,
+            email_account=EmailAccounts.PRIMARY,
+            channel_str="987654321",
+            max_emails=3,
+            target_model=SupportedModel.CLAUDE_HAIKU,
+            email_report_task=email_report_task,
+        )
+
+        # THEN
+        with self.assertRaises(asyncio.CancelledError):
+            await email_report_task
+        mock_client.close.assert_awaited_once()
+
+    async def test_put_email_report_reports_timeout_at_deadline(self):
+        # GIVEN a report that is still building when the deadline expires
+        mock_client = Mock()
+        mock_client.user = Mock()
+        mock_client.user.name = "TestBot"
+        mock_client.user.id = "123456789"
+        mock_client.close = AsyncMock()
+
+        mock_channel = Mock()
+        mock_client.get_channel.return_value = mock_channel
+        mock_channel.send = AsyncMock()
+
+        email_report_task = asyncio.create_task(asyncio.sleep(10))
+
+        # WHEN
+        await put_email_reports(
+            discord_client=mock_client,
+            jobs=[
+                ReportJob(
+                    email_account=EmailAccounts.PRIMARY,
+                    target_model=SupportedModel.CLAUDE_HAIKU,
+                )
+            ],
+            channel_str="987654321",
+            max_emails=3,
+            email_report_tasks=[email_report_task],
+            deadline=Deadline.after(0.05),
+        )
+
+        # THEN the channel hears back before the deadline
+        mock_channel.send.assert_awaited_once_with(
+            "Error: ran out of time building the PRIMARY email report."
+        )
+        self.assertTrue(email_report_task.cancelled())
+        mock_client.close.assert_awaited_once()
+
+    @patch("email_summarizer.controllers.alphonse_controller.get_emails")
+    @patch("email_summarizer.controllers.alphonse_controller.compile_email_report")
+    async def test_put_email_reports_isolates_failing_account(
+        self, mock_compile_email_report, mock_get_emails
+    ):
+        # GIVEN
+        mock_client = Mock()
+        mock_client.user = Mock()
+        mock_client.user.name = "TestBot"
+        mock_client.user.id = "123456789"
+        mock_client.close = AsyncMock()
+
+        mock_channel = Mock()
+        mock_client.get_channel.return_value = mock_channel
+        mock_channel.send = AsyncMock()
+
+        def get_emails(email_account, max_results):
+            if email_account == EmailAccounts.NOREPLY:
+                raise RefreshTokenInvalidError()
+            return []
+
+        mock_get_emails.side_effect = get_emails
+        mock_compile_email_report.return_value = EmailReport(
+            email_account=EmailAccounts.PRIMARY,
+            timestamp="2023-01-01",
+            actionable_emails=[],
+            summaries=[],
+            grouped_emails=[],
+        )
+        jobs = [
+            ReportJob(
+                email_account=EmailAccounts.PRIMARY,
+                target_model=SupportedModel.CLAUDE_HAIKU,
+            ),
+            ReportJob(
+                email_account=EmailAccounts.NOREPLY,
+                target_model=SupportedModel.CLAUDE_HAIKU,
+            ),
+        ]
+
+        # WHEN
+        await put_email_reports(
+            discord_client=mock_client,
+            jobs=jobs,
+            channel_str="987654321",
+            max_emails=3,
+        )
+
+        # THEN
+        mock_channel.send.assert_has_awaits(
+            [
+                call("# PRIMARY Email Report 2023-01-01\n*No emails to report.*"),
+                call(
+                    "**Gmail refresh token for NOREPLY is invalid. Please update the token.**"
+                ),
+            ],
+            any_order=True,
+        )
+        mock_compile_email_report.assert_called_once()
+        mock_client.close.assert_awaited_once()
+
+    @patch(
+        "email_summarizer.controllers.alphonse_controller.REPORT_PIPELINE", "STREAMING"
+    )
+    @patch("email_summarizer.controllers.alphonse_controller.get_shared_model_client")
+    @patch("email_summarizer.controllers.alphonse_controller.get_emails")
+    @patch("email_summarizer.controllers.alphonse_controller.stream_email_report")
+    async def test_start_email_report_task_streams_when_configured(
+        self, mock_stream_email_report, mock_get_emails, mock_get_shared_model_client
+    ):
+        # GIVEN
+        email_report = EmailReport(
+            email_account=EmailAccounts.PRIMARY,
+            timestamp="2023-01-01",
+            actionable_emails=[],
+            summaries=[],
+            grouped_emails=[],
+        )
+        mock_stream_email_report.return_value = email_report
+
+        # WHEN
+        result = await start_email_report_task(
+            EmailAccounts.PRIMARY, SupportedModel.CLAUDE_HAIKU, 3
+        )
+
+        # THEN
+        self.assertEqual(result, email_report)
+        mock_stream_email_report.assert_awaited_once()
+        mock_get_emails.assert_not_called()
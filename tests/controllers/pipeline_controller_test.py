@@ -0,0 +1,168 @@
+import base64
+import threading
+from unittest.mock import MagicMock, patch
+
+from ..base import BaseAsyncTestCase
+from email_summarizer.controllers.pipeline_controller import (
+    stage_concurrency,
+    stream_email_report,
+)
+from email_summarizer.models.enums import EmailAccounts, FetchFormat
+from email_summarizer.services.anthropic_client import AnthropicClient
+from email_summarizer.services.base_model_client import BaseModelResponse
+
+
+def gmail_message(message_id: str, sender: str) -> dict:
+    return {
+        "id": message_id,
+        "snippet": f"Snippet {message_id}",
+        "payload": {
+            "mimeType": "text/plain",
+            "headers": [
+                {"name": "Subject", "value": f"Subject {message_id}"},
+                {"name": "From", "value": sender},
+                {"name": "Date", "value": "2024-04-19"},
+            ],
+            "body": {
+                "data": base64.urlsafe_b64encode(
+                    f"Body of {message_id}".encode()
+                ).decode()
+            },
+        },
+    }
+
+
+@patch(
+    "email_summarizer.controllers.pipeline_controller.filter_reported",
+    side_effect=lambda email_account, message_ids: message_ids,
+)
+@patch("email_summarizer.controllers.pipeline_controller.get_gmail_service")
+@patch("email_summarizer.controllers.pipeline_controller.list_messages")
+@patch("email_summarizer.controllers.pipeline_controller.get_message_details")
+class TestPipelineController(BaseAsyncTestCase):
+    def setUp(self):
+        self.messages = {
+            "1": gmail_message("1", "news@example.com"),
+            "2": gmail_message("2", "spouse@example.com"),
+            "3": gmail_message("3", "nextdoor@example.com"),
+            "4": gmail_message("4", "shop@example.com"),
+        }
+        self.mock_client = MagicMock(spec=AnthropicClient)
+        self.mock_client.invoke.return_value = BaseModelResponse(response="Summary")
+
+    async def test_stream_email_report(
+        self,
+        mock_get_message_details,
+        mock_list_messages,
+        mock_get_gmail_service,
+        mock_filter_reported,
+    ):
+        # GIVEN
+        mock_list_messages.return_value = [{"id": key} for key in self.messages]
+        mock_get_message_details.side_effect = (
+            lambda service, message_id, fetch_format: self.messages[message_id]
+        )
+
+        # WHEN
+        email_report = await stream_email_report(
+            self.mock_client,
+            EmailAccounts.PRIMARY,
+            max_emails=4,
+            fetch_format=FetchFormat.FULL,
+            concurrency={
+                "fetch": 1,
+                "parse": 2,
+                "classify": 2,
+                "redact": 2,
+                "summarize": 3,
+            },
+            queue_size=1,
+        )
+
+        # THEN ungrouped emails are summarized in Gmail's order
+        self.assertEqual(
+            [summary.email.id for summary in email_report.summaries], ["1", "4"]
+        )
+        self.assertEqual(
+            [summary.body for summary in email_report.summaries], ["Summary"] * 2
+        )
+        # AND high priority emails get next steps
+        self.assertEqual(
+            [actionable.email.id for actionable in email_report.actionable_emails],
+            ["2"],
+        )
+        # AND grouped emails are only counted
+        self.assertEqual(len(email_report.grouped_emails), 1)
+        self.assertEqual(email_report.grouped_emails[0].count, 1)
+        self.assertEqual(self.mock_client.invoke.call_count, 3)
+        prompts = [c.kwargs["prompt"] for c in self.mock_client.invoke.call_args_list]
+        self.assertFalse(any("Body of 3" in prompt for prompt in prompts))
+        # AND every processed message is marked for the ledger
+        self.assertEqual(email_report.reported_message_ids, ["1", "2", "3", "4"])
+
+    async def test_stream_email_report_skips_unavailable_messages(
+        self,
+        mock_get_message_details,
+        mock_list_messages,
+        mock_get_gmail_service,
+        mock_filter_reported,
+    ):
+        # GIVEN one message that can't be fetched
+        mock_list_messages.return_value = [{"id": "1"}, {"id": "4"}]
+        mock_get_message_details.side_effect = (
+            lambda service, message_id, fetch_format: (
+                None if message_id == "1" else self.messages[message_id]
+            )
+        )
+
+        # WHEN
+        email_report = await stream_email_report(
+            self.mock_client,
+            EmailAccounts.PRIMARY,
+            max_emails=2,
+            fetch_format=FetchFormat.FULL,
+        )
+
+        # THEN
+        self.assertEqual(
+            [summary.email.id for summary in email_report.summaries], ["4"]
+        )
+
+    @patch("email_summarizer.controllers.pipeline_controller.local_summary")
+    async def test_stream_email_report_classifies_off_the_event_loop(
+        self,
+        mock_local_summary,
+        mock_get_message_details,
+        mock_list_messages,
+        mock_get_gmail_service,
+        mock_filter_reported,
+    ):
+        # GIVEN a local classifier
+        mock_list_messages.return_value = [{"id": "4"}]
+        mock_get_message_details.side_effect = (
+            lambda service, message_id, fetch_format: self.messages[message_id]
+        )
+        classify_threads = []
+        mock_local_summary.side_effect = lambda email: classify_threads.append(
+            threading.current_thread()
+        )
+
+        # WHEN
+        await stream_email_report(
+            self.mock_client,
+            EmailAccounts.PRIMARY,
+            max_emails=1,
+            fetch_format=FetchFormat.FULL,
+        )
+
+        # THEN it ran in a worker thread
+        self.assertEqual(len(classify_threads), 1)
+        self.assertIsNot(classify_threads[0], threading.current_thread())
+
+    def test_stage_concurrency(self, *mocks):
+        concurrency = stage_concurrency("fetch=1, summarize=8")
+
+        self.assertEqual(concurrency["summarize"], 8)
+        self.assertEqual(concurrency["fetch"], 1)
+        with self.assertRaises(ValueError):
+            stage_concurrency("deliver=2")
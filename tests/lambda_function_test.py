@@ -0,0 +1,58 @@
+import os
+from unittest.mock import patch
+
+from .base import BaseTestCase
+from email_summarizer.models.enums import EmailAccounts, SupportedModel
+from email_summarizer.utils.config_utils import MissingConfigError
+from lambda_function import MalformedEventError, _parse_jobs_from_body, lambda_handler
+
+
+class TestLambdaFunction(BaseTestCase):
+    def test_parse_single_job(self):
+        jobs = _parse_jobs_from_body(
+            {"email_account_type": "PRIMARY", "model": "NOVA_MICRO"}
+        )
+
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs[0].email_account, EmailAccounts.PRIMARY)
+        self.assertEqual(jobs[0].target_model, SupportedModel.NOVA_MICRO)
+
+    def test_parse_job_list(self):
+        jobs = _parse_jobs_from_body(
+            {
+                "jobs": [
+                    {"email_account_type": "PRIMARY", "model": "NOVA_MICRO"},
+                    {"email_account_type": "NOREPLY", "model": "CLAUDE_HAIKU"},
+                ]
+            }
+        )
+
+        self.assertEqual(
+            [(job.email_account, job.target_model) for job in jobs],
+            [
+                (EmailAccounts.PRIMARY, SupportedModel.NOVA_MICRO),
+                (EmailAccounts.NOREPLY, SupportedModel.CLAUDE_HAIKU),
+            ],
+        )
+
+    def test_parse_empty_job_list(self):
+        with self.assertRaises(MalformedEventError):
+            _parse_jobs_from_body({"jobs": []})
+
+    def test_parse_unsupported_account(self):
+        with self.assertRaises(MalformedEventError):
+            _parse_jobs_from_body({"email_account_type": "WORK", "model": "NOVA_MICRO"})
+
+    def test_parse_missing_model(self):
+        with self.assertRaises(MalformedEventError):
+            _parse_jobs_from_body({"jobs": [{"email_account_type": "PRIMARY"}]})
+
+    @patch("lambda_function.run_bot_jobs")
+    @patch.dict(os.environ, {"LICENSE_PLATE_REGEX": ""})
+    def test_handler_fails_fast_without_required_config(self, mock_run_bot_jobs):
+        event = {"body": {"email_account_type": "PRIMARY", "model": "NOVA_MICRO"}}
+
+        with self.assertRaises(MissingConfigError):
+            lambda_handler(event, None)
+
+        mock_run_bot_jobs.assert_not_called()
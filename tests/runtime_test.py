@@ -0,0 +1,83 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from .base import BaseTestCase
+from email_summarizer.models.enums import EmailAccounts, SupportedModel
+from email_summarizer.models.report_job import ReportJob
+from email_summarizer.runtime import WarmRuntime
+
+JOBS = [
+    ReportJob(
+        email_account=EmailAccounts.PRIMARY, target_model=SupportedModel.NOVA_MICRO
+    )
+]
+
+
+def mock_rest_client():
+    rest_client = MagicMock()
+    rest_client.login = AsyncMock()
+    rest_client.close = AsyncMock()
+    return rest_client
+
+
+@patch("email_summarizer.runtime.DISCORD_DELIVERY", "REST")
+class TestWarmRuntime(BaseTestCase):
+    def setUp(self):
+        self.runtime = WarmRuntime()
+        self.addCleanup(self.runtime.close)
+
+    @patch("email_summarizer.runtime.run_bot_jobs", new_callable=AsyncMock)
+    @patch("email_summarizer.runtime.build_rest_client")
+    def test_reuses_loop_and_client(self, mock_build_client, mock_run_bot_jobs):
+        # GIVEN a REST client that logs in and delivers successfully
+        rest_client = mock_rest_client()
+        mock_build_client.return_value = rest_client
+        mock_run_bot_jobs.return_value = True
+
+        # WHEN the runtime handles two invocations
+        self.runtime.run(JOBS)
+        loop = self.runtime.loop
+        self.runtime.run(JOBS)
+
+        # THEN the loop and the logged-in client are reused
+        self.assertIs(self.runtime.loop, loop)
+        mock_build_client.assert_called_once()
+        rest_client.login.assert_awaited_once()
+        mock_run_bot_jobs.assert_awaited_with(
+            JOBS, rest_client=rest_client, deadline=None
+        )
+        rest_client.close.assert_not_awaited()
+
+    @patch("email_summarizer.runtime.run_bot_jobs", new_callable=AsyncMock)
+    @patch("email_summarizer.runtime.build_rest_client")
+    def test_resets_client_after_failure(self, mock_build_client, mock_run_bot_jobs):
+        # GIVEN an invocation that fails mid-delivery
+        first_client, second_client = mock_rest_client(), mock_rest_client()
+        mock_build_client.side_effect = [first_client, second_client]
+        mock_run_bot_jobs.side_effect = [RuntimeError("boom"), True]
+
+        # WHEN the next invocation runs
+        with self.assertRaises(RuntimeError):
+            self.runtime.run(JOBS)
+        self.runtime.run(JOBS)
+
+        # THEN the failed client was closed and a fresh one logged in
+        first_client.close.assert_awaited_once()
+        second_client.login.assert_awaited_once()
+
+    @patch("email_summarizer.runtime.run_bot_jobs", new_callable=AsyncMock)
+    @patch("email_summarizer.runtime.build_rest_client")
+    def test_resets_client_after_failed_delivery(
+        self, mock_build_client, mock_run_bot_jobs
+    ):
+        # GIVEN an invocation whose Discord posts fail without raising
+        first_client, second_client = mock_rest_client(), mock_rest_client()
+        mock_build_client.side_effect = [first_client, second_client]
+        mock_run_bot_jobs.side_effect = [False, True]
+
+        # WHEN the next invocation runs
+        self.runtime.run(JOBS)
+        self.runtime.run(JOBS)
+
+        # THEN the failed client was closed and a fresh one logged in
+        first_client.close.assert_awaited_once()
+        second_client.login.assert_awaited_once()
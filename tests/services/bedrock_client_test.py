@@ -0,0 +1,18 @@
+from ..base import BaseTestCase
+from email_summarizer.services.bedrock_client import (
+    BEDROCK_CONNECT_TIMEOUT_SECONDS,
+    LLM_CALL_TIMEOUT_SECONDS,
+    bedrock_config,
+)
+
+
+class TestBedrockClient(BaseTestCase):
+    def test_client_enforces_call_timeouts(self):
+        config = bedrock_config()
+
+        self.assertEqual(config.read_timeout, LLM_CALL_TIMEOUT_SECONDS)
+        self.assertEqual(config.connect_timeout, BEDROCK_CONNECT_TIMEOUT_SECONDS)
+
+    def test_botocore_does_not_retry(self):
+        # Throttling is retried by ResilientModelClient alone
+        self.assertEqual(bedrock_config().retries["total_max_attempts"], 1)
@@ -0,0 +1,142 @@
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import discord
+
+from ..base import BaseAsyncTestCase
+from email_summarizer.services.discord_rest import (
+    DISCORD_API_BASE,
+    DiscordRestClient,
+)
+
+
+def mock_session(*responses):
+    """Build a session whose request() yields the given (status, payload) pairs."""
+    session = MagicMock()
+    session.closed = False
+    session.close = AsyncMock()
+    contexts = []
+    for status, payload in responses:
+        response = Mock()
+        response.status = status
+        response.reason = "reason"
+        response.json = AsyncMock(return_value=payload)
+        context = MagicMock()
+        context.__aenter__.return_value = response
+        contexts.append(context)
+    session.request.side_effect = contexts
+    return session
+
+
+class TestDiscordRestClient(BaseAsyncTestCase):
+    def test_requires_token_or_webhook(self):
+        with self.assertRaises(ValueError):
+            DiscordRestClient()
+
+    async def test_login_with_bot_token(self):
+        session = mock_session((200, {"id": "42", "username": "Alphonse"}))
+        client = DiscordRestClient(bot_token="token", session=session)
+
+        user = await client.login()
+
+        self.assertEqual(user.name, "Alphonse")
+        self.assertEqual(user.id, "42")
+        method, url = session.request.call_args[0]
+        self.assertEqual((method, url), ("GET", f"{DISCORD_API_BASE}/users/@me"))
+        self.assertEqual(
+            session.request.call_args[1]["headers"]["Authorization"], "Bot token"
+        )
+
+    async def test_login_failure(self):
+        session = mock_session((401, {"message": "401: Unauthorized"}))
+        client = DiscordRestClient(bot_token="bad", session=session)
+
+        with self.assertRaises(discord.errors.LoginFailure):
+            await client.login()
+
+    async def test_send_to_channel(self):
+        session = mock_session((200, {"id": "1"}))
+        client = DiscordRestClient(bot_token="token", session=session)
+
+        channel = client.get_channel(987)
+        await channel.send("hello")
+
+        method, url = session.request.call_args[0]
+        self.assertEqual(method, "POST")
+        self.assertEqual(url, f"{DISCORD_API_BASE}/channels/987/messages")
+        self.assertEqual(session.request.call_args[1]["json"], {"content": "hello"})
+
+    async def test_send_to_webhook(self):
+        session = mock_session((200, {"id": "1"}))
+        client = DiscordRestClient(
+            webhook_url="https://discord.com/api/webhooks/1/abc", session=session
+        )
+
+        await client.get_channel(987).send("hello")
+
+        _, url = session.request.call_args[0]
+        self.assertEqual(url, "https://discord.com/api/webhooks/1/abc?wait=true")
+        self.assertNotIn("Authorization", session.request.call_args[1]["headers"])
+
+    async def test_send_to_webhook_keeps_its_query(self):
+        session = mock_session((200, {"id": "1"}))
+        client = DiscordRestClient(
+            webhook_url="https://discord.com/api/webhooks/1/abc?thread_id=5",
+            session=session,
+        )
+
+        await client.get_channel(987).send("hello")
+
+        _, url = session.request.call_args[0]
+        self.assertEqual(
+            url, "https://discord.com/api/webhooks/1/abc?thread_id=5&wait=true"
+        )
+
+    @patch(
+        "email_summarizer.services.discord_rest.asyncio.sleep", new_callable=AsyncMock
+    )
+    async def test_send_retries_after_rate_limit(self, mock_sleep):
+        session = mock_session((429, {"retry_after": 0.5}), (200, {"id": "1"}))
+        client = DiscordRestClient(bot_token="token", session=session)
+
+        await client.get_channel(987).send("hello")
+
+        mock_sleep.assert_awaited_once_with(0.5)
+        self.assertEqual(session.request.call_count, 2)
+
+    async def test_send_forbidden(self):
+        session = mock_session((403, {"message": "Missing Permissions"}))
+        client = DiscordRestClient(bot_token="token", session=session)
+
+        with self.assertRaises(discord.errors.Forbidden):
+            await client.get_channel(987).send("hello")
+
+    async def test_close_closes_session(self):
+        session = mock_session()
+        client = DiscordRestClient(bot_token="token", session=session)
+
+        await client.close()
+
+        session.close.assert_awaited_once()
+
+    async def test_reconnects_after_stale_connection(self):
+        import aiohttp
+
+        # GIVEN a pooled connection that went stale while the process was frozen
+        stale_session = MagicMock()
+        stale_session.closed = False
+        stale_session.close = AsyncMock()
+        stale_session.request.side_effect = aiohttp.ClientConnectionError("reset")
+        fresh_session = mock_session((200, {"id": "1"}))
+        client = DiscordRestClient(bot_token="token", session=stale_session)
+
+        # WHEN posting a message
+        with patch(
+            "email_summarizer.services.discord_rest.aiohttp.ClientSession",
+            return_value=fresh_session,
+        ):
+            payload = await client.post_message("https://example.com", "hi")
+
+        # THEN the stale session is closed and the request retried on a new one
+        self.assertEqual(payload, {"id": "1"})
+        stale_session.close.assert_awaited_once()
+        fresh_session.request.assert_called_once()
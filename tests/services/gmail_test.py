@@ -1,15 +1,21 @@
 import base64
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
 from unittest.mock import MagicMock, patch
 
+from email_summarizer.models.enums import EmailAccounts, FetchFormat
+from email_summarizer.services import gmail
 from email_summarizer.services.gmail import (
     Email,
+    authenticate_gmail,
     build_email_from_message,
     decode_body,
     extract_headers,
     format_message_info,
     list_emails,
     load_credentials_from_file,
+    parse_raw_body,
     refresh_credentials,
 )
 
@@ -43,6 +49,60 @@ class TestEmail(unittest.TestCase):
         expected_str = "Email(id=123, subject=Test Subject, sender=test@example.com, date=2024-04-19, snippet=Test snippet)"
         self.assertEqual(str(email), expected_str)
 
+    def test_body_loader_runs_once_on_first_access(self):
+        # GIVEN an email whose body is still encoded
+        body_loader = MagicMock(return_value="Decoded body")
+        email = Email.lazy(
+            body_loader,
+            id="123",
+            subject="Test Subject",
+            sender="test@example.com",
+            date="2024-04-19",
+            snippet="Test snippet",
+        )
+
+        # WHEN only the headers are used
+        str(email)
+
+        # THEN the body is never decoded
+        body_loader.assert_not_called()
+        self.assertFalse(email.body_loaded)
+        self.assertIsNone(email.body_preview)
+
+        # WHEN the body is loaded twice
+        self.assertEqual(email.load_body(), "Decoded body")
+        self.assertEqual(email.load_body(), "Decoded body")
+
+        # THEN it was decoded once
+        body_loader.assert_called_once()
+        self.assertTrue(email.body_loaded)
+        self.assertEqual(email.body_preview, "Decoded body")
+
+    def test_compare_print_and_copy_without_loading_the_body(self):
+        # GIVEN an email whose body is still encoded
+        body_loader = MagicMock(return_value="Decoded body")
+        email = Email.lazy(
+            body_loader,
+            id="123",
+            subject="Test Subject",
+            sender="test@example.com",
+            date="2024-04-19",
+            snippet="Test snippet",
+        )
+
+        # WHEN it is compared, printed and copied
+        self.assertEqual(email, email.model_copy())
+        self.assertNotEqual(email, email.model_copy(update={"id": "456"}))
+        repr(email)
+        replaced = email.with_body("New body")
+
+        # THEN the body is never decoded and the copy has the new body
+        body_loader.assert_not_called()
+        self.assertEqual(replaced.load_body(), "New body")
+        body_loader.assert_not_called()
+        self.assertNotEqual(replaced, email)
+        self.assertEqual(replaced, email.with_body("New body"))
+
 
 class TestGmailService(unittest.TestCase):
     @patch("os.path.exists")
@@ -142,7 +202,115 @@ class TestGmailService(unittest.TestCase):
         self.assertEqual(email.sender, "test@example.com")
         self.assertEqual(email.date, "2024-04-19")
         self.assertEqual(email.snippet, "Test snippet")
-        self.assertEqual(email.body_preview, "Test body")
+        self.assertEqual(email.load_body(), "Test body")
+
+    def test_raw_and_full_formats_build_identical_emails(self):
+        # GIVEN the same message as Gmail returns it in raw and full format
+        mime_message = EmailMessage()
+        mime_message["Subject"] = "Café menu"
+        mime_message["From"] = "Bistro <bistro@example.com>"
+        mime_message["Date"] = "Fri, 19 Apr 2024 10:00:00 -0400"
+        mime_message.set_content("Soup of the day:\ntomato", charset="iso-8859-1")
+        mime_message.add_alternative("<p>Soup of the day: tomato</p>", subtype="html")
+        plain_part, html_part = mime_message.get_payload()
+
+        def full_part(part):
+            return {
+                "mimeType": part.get_content_type(),
+                "headers": [{"name": "Content-Type", "value": part["Content-Type"]}],
+                "body": {
+                    "data": base64.urlsafe_b64encode(
+                        part.get_payload(decode=True)
+                    ).decode()
+                },
+            }
+
+        full_message = {
+            "snippet": "Soup of the day",
+            "payload": {
+                "mimeType": "multipart/alternative",
+                "headers": [
+                    {"name": "Subject", "value": "Café menu"},
+                    {"name": "From", "value": "Bistro <bistro@example.com>"},
+                    {"name": "Date", "value": "Fri, 19 Apr 2024 10:00:00 -0400"},
+                ],
+                "parts": [full_part(plain_part), full_part(html_part)],
+            },
+        }
+        raw_message = {
+            "snippet": "Soup of the day",
+            "raw": base64.urlsafe_b64encode(bytes(mime_message)).decode(),
+        }
+
+        # WHEN
+        full_email = build_email_from_message("1", full_message, FetchFormat.FULL)
+        raw_email = build_email_from_message("1", raw_message, FetchFormat.RAW)
+
+        # THEN
+        self.assertEqual(raw_email.load_body(), "Soup of the day:\ntomato")
+        full_email.load_body()
+        self.assertEqual(raw_email, full_email)
+
+    def test_raw_body_with_unknown_charset_falls_back_to_utf8(self):
+        raw_bytes = b"Content-Type: text/plain; charset=x-unknown\r\n\r\nHello\r\n"
+
+        self.assertEqual(parse_raw_body(raw_bytes), "Hello")
+
+    def test_metadata_format_has_no_body(self):
+        message = {
+            "snippet": "Test snippet",
+            "payload": {"headers": [{"name": "Subject", "value": "Headers only"}]},
+        }
+
+        email = build_email_from_message("1", message, FetchFormat.METADATA)
+
+        self.assertEqual(email.subject, "Headers only")
+        self.assertIsNone(email.load_body())
+
+    def test_build_email_from_nested_message(self):
+        html = base64.urlsafe_b64encode(b"<p>HTML body</p>").decode()
+        plain = base64.urlsafe_b64encode(b"Plain body\nSecond line").decode()
+        message = {
+            "snippet": "Test snippet",
+            "payload": {
+                "mimeType": "multipart/mixed",
+                "headers": [{"name": "Subject", "value": "Nested"}],
+                "parts": [
+                    {
+                        "mimeType": "multipart/alternative",
+                        "parts": [
+                            {"mimeType": "text/html", "body": {"data": html}},
+                            {"mimeType": "text/plain", "body": {"data": plain}},
+                        ],
+                    }
+                ],
+            },
+        }
+
+        email = build_email_from_message("123", message)
+
+        self.assertEqual(email.load_body(), "Plain body\nSecond line")
+
+    @patch("email_summarizer.services.gmail.html_to_text")
+    def test_build_email_from_message_defers_body_parsing(self, mock_html_to_text):
+        mock_html_to_text.return_value = "HTML body"
+        message = {
+            "snippet": "Test snippet",
+            "payload": {
+                "mimeType": "text/html",
+                "headers": [{"name": "Subject", "value": "Lazy"}],
+                "body": {
+                    "data": base64.urlsafe_b64encode(b"<p>HTML body</p>").decode()
+                },
+            },
+        }
+
+        email = build_email_from_message("123", message)
+
+        self.assertEqual(email.subject, "Lazy")
+        mock_html_to_text.assert_not_called()
+        self.assertEqual(email.load_body(), "HTML body")
+        mock_html_to_text.assert_called_once()
 
     @patch("email_summarizer.services.gmail.list_messages")
     @patch("email_summarizer.services.gmail.get_message_details")
@@ -162,7 +330,93 @@ class TestGmailService(unittest.TestCase):
         }
         list_emails(mock_service, max_results=1)
         mock_list_messages.assert_called_once_with(mock_service, 1)
-        mock_get_details.assert_called_once_with(mock_service, "123")
+        mock_get_details.assert_called_once_with(mock_service, "123", FetchFormat.FULL)
+
+    @patch("email_summarizer.services.gmail.list_messages")
+    @patch("email_summarizer.services.gmail.get_message_details")
+    def test_list_emails_filters_before_fetching(
+        self, mock_get_details, mock_list_messages
+    ):
+        # GIVEN a listing where "1" and "2" were already reported
+        mock_service = MagicMock()
+        mock_list_messages.return_value = [{"id": n} for n in ("1", "2", "3", "4")]
+        mock_get_details.return_value = {"snippet": "Test snippet"}
+
+        # WHEN
+        emails = list_emails(
+            mock_service,
+            max_results=1,
+            message_filter=lambda ids: [i for i in ids if i not in ("1", "2")],
+            listing_size=10,
+        )
+
+        # THEN only the first new message is fetched
+        mock_list_messages.assert_called_once_with(mock_service, 10)
+        mock_get_details.assert_called_once_with(mock_service, "3", FetchFormat.FULL)
+        self.assertEqual([email.id for email in emails], ["3"])
+
+    def clear_gmail_caches(self):
+        def clear():
+            gmail._CACHED_CREDENTIALS.clear()
+            gmail._thread_services().clear()
+
+        clear()
+        self.addCleanup(clear)
+
+    @patch("email_summarizer.services.gmail.build_gmail_service")
+    @patch("email_summarizer.services.gmail.is_refresh_token_valid")
+    @patch("email_summarizer.services.gmail.build_gmail_credentials")
+    def test_authenticate_gmail_reuses_valid_service(
+        self, mock_build_creds, mock_token_valid, mock_build_service
+    ):
+        self.clear_gmail_caches()
+        mock_build_creds.return_value = MagicMock(valid=True)
+        mock_token_valid.return_value = True
+        mock_build_service.return_value = MagicMock()
+
+        first = authenticate_gmail(EmailAccounts.PRIMARY)
+        second = authenticate_gmail(EmailAccounts.PRIMARY)
+
+        self.assertIs(first, second)
+        mock_build_creds.assert_called_once()
+        mock_build_service.assert_called_once()
+
+    @patch("email_summarizer.services.gmail.build_gmail_service")
+    @patch("email_summarizer.services.gmail.is_refresh_token_valid")
+    @patch("email_summarizer.services.gmail.build_gmail_credentials")
+    def test_authenticate_gmail_rebuilds_expired_service(
+        self, mock_build_creds, mock_token_valid, mock_build_service
+    ):
+        self.clear_gmail_caches()
+        mock_build_creds.return_value = MagicMock(valid=False)
+        mock_token_valid.return_value = True
+
+        authenticate_gmail(EmailAccounts.PRIMARY)
+        authenticate_gmail(EmailAccounts.PRIMARY)
+
+        self.assertEqual(mock_build_service.call_count, 2)
+
+    @patch("email_summarizer.services.gmail.build_gmail_service")
+    @patch("email_summarizer.services.gmail.is_refresh_token_valid")
+    @patch("email_summarizer.services.gmail.build_gmail_credentials")
+    def test_authenticate_gmail_builds_a_service_per_thread(
+        self, mock_build_creds, mock_token_valid, mock_build_service
+    ):
+        # GIVEN valid credentials
+        self.clear_gmail_caches()
+        mock_build_creds.return_value = MagicMock(valid=True)
+        mock_token_valid.return_value = True
+        mock_build_service.side_effect = lambda creds: MagicMock()
+
+        # WHEN the service is requested here and on another thread
+        here = authenticate_gmail(EmailAccounts.PRIMARY)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            there = executor.submit(authenticate_gmail, EmailAccounts.PRIMARY).result()
+
+        # THEN the threads don't share an HTTP client, only the credentials
+        self.assertIsNot(here, there)
+        mock_build_creds.assert_called_once()
+        self.assertEqual(mock_build_service.call_count, 2)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,94 @@
+import os
+import tempfile
+from unittest.mock import patch
+
+from ..base import BaseTestCase
+from email_summarizer.models.enums import EmailAccounts
+from email_summarizer.services.message_ledger import (
+    MessageLedger,
+    SECONDS_PER_DAY,
+    filter_reported,
+)
+
+
+class TestMessageLedger(BaseTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "ledger.sqlite3")
+        self.now = 1_000_000.0
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def ledger(self, email_account=EmailAccounts.PRIMARY, retention_days=30):
+        return MessageLedger(
+            email_account,
+            path=self.path,
+            retention_days=retention_days,
+            clock=lambda: self.now,
+        )
+
+    def test_filter_new_skips_recorded_messages(self):
+        # GIVEN
+        ledger = self.ledger()
+        ledger.record(["a", "b"])
+
+        # WHEN
+        new_ids = ledger.filter_new(["a", "c", "b", "d"])
+
+        # THEN
+        self.assertEqual(new_ids, ["c", "d"])
+        ledger.close()
+
+    def test_recorded_messages_survive_reopening(self):
+        # GIVEN a ledger written by an earlier run
+        first_run = self.ledger()
+        first_run.record(["a"])
+        first_run.close()
+
+        # WHEN
+        second_run = self.ledger()
+
+        # THEN
+        self.assertEqual(second_run.filter_new(["a", "b"]), ["b"])
+        second_run.close()
+
+    def test_accounts_are_kept_apart(self):
+        primary = self.ledger(EmailAccounts.PRIMARY)
+        primary.record(["a"])
+        noreply = self.ledger(EmailAccounts.NOREPLY)
+
+        self.assertEqual(noreply.filter_new(["a"]), ["a"])
+        primary.close()
+        noreply.close()
+
+    def test_old_entries_expire(self):
+        # GIVEN a message reported two days ago
+        ledger = self.ledger(retention_days=1)
+        ledger.record(["a"])
+        ledger.close()
+        self.now += 2 * SECONDS_PER_DAY
+
+        # WHEN the ledger is reopened
+        reopened = self.ledger(retention_days=1)
+
+        # THEN
+        self.assertEqual(reopened.filter_new(["a"]), ["a"])
+        reopened.close()
+
+    def test_filter_reported_can_reinclude_old_messages(self):
+        ledger = self.ledger()
+        ledger.record(["a"])
+
+        with patch(
+            "email_summarizer.services.message_ledger.get_message_ledger",
+            return_value=ledger,
+        ):
+            self.assertEqual(filter_reported(EmailAccounts.PRIMARY, ["a", "b"]), ["b"])
+            with patch(
+                "email_summarizer.services.message_ledger.REINCLUDE_REPORTED", True
+            ):
+                self.assertEqual(
+                    filter_reported(EmailAccounts.PRIMARY, ["a", "b"]), ["a", "b"]
+                )
+        ledger.close()
@@ -53,6 +53,21 @@ class TestNovaClient:
 
         assert response.response == "Test response"
 
+    def test_parse_response_usage(self, nova_client):
+        mock_response = {"body": MagicMock()}
+        mock_response["body"].read.return_value = json.dumps(
+            {
+                "output": {"message": {"content": [{"text": "Test response"}]}},
+                "usage": {"inputTokens": 120, "outputTokens": 30},
+            }
+        ).encode()
+
+        response = nova_client._parse_response(mock_response)
+
+        assert response.input_tokens == 120
+        assert response.output_tokens == 30
+        assert response.total_tokens() == 150
+
     def test_parse_response_empty_content(self, nova_client):
         mock_response = {"body": MagicMock()}
         mock_response["body"].read.return_value = json.dumps(
@@ -0,0 +1,99 @@
+from ..base import BaseTestCase
+from email_summarizer.services.rate_budgeter import (
+    BudgetedModelClient,
+    RateBudgeter,
+)
+from ..stub_model_client import FaultInjectingModelClient
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class TestRateBudgeter(BaseTestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+
+    def _budgeter(self, **limits) -> RateBudgeter:
+        return RateBudgeter(**limits, clock=self.clock, sleep=self.clock.sleep)
+
+    def test_paces_requests_per_minute(self):
+        # GIVEN a limit of two requests per minute
+        budgeter = self._budgeter(requests_per_minute=2)
+
+        # WHEN three requests are made at once
+        for _ in range(3):
+            budgeter.acquire(10)
+
+        # THEN the third waits for the first to leave the window
+        self.assertEqual(self.clock.sleeps, [60.0])
+
+    def test_paces_tokens_per_minute(self):
+        budgeter = self._budgeter(tokens_per_minute=1000)
+
+        budgeter.acquire(600)
+        self.clock.now = 10.0
+        budgeter.acquire(300)
+        self.clock.now = 20.0
+        budgeter.acquire(300)
+
+        # Only the first reservation has to expire for the third to fit.
+        self.assertEqual(self.clock.sleeps, [40.0])
+
+    def test_reconcile_frees_overestimated_tokens(self):
+        # GIVEN a request estimated at the whole token budget
+        budgeter = self._budgeter(tokens_per_minute=1000)
+        reservation = budgeter.acquire(1000)
+
+        # WHEN Bedrock reports it used far less
+        budgeter.reconcile(reservation, 200)
+        budgeter.acquire(500)
+
+        # THEN the next request goes straight through
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_oversized_request_passes_on_empty_window(self):
+        budgeter = self._budgeter(tokens_per_minute=100)
+
+        budgeter.acquire(500)
+
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_utilization(self):
+        budgeter = self._budgeter(requests_per_minute=10, tokens_per_minute=1000)
+        budgeter.acquire(250)
+        budgeter.acquire(250)
+
+        utilization = budgeter.utilization()
+
+        self.assertEqual(utilization.requests, 2)
+        self.assertEqual(utilization.tokens, 500)
+        self.assertEqual(utilization.request_utilization, 0.2)
+        self.assertEqual(utilization.token_utilization, 0.5)
+
+    def test_budgeted_client_reconciles_actual_usage(self):
+        # GIVEN a model that reports its token usage
+        class UsageReportingClient(FaultInjectingModelClient):
+            def invoke(self, prompt, system_prompt=None):
+                response = super().invoke(prompt, system_prompt)
+                return response.model_copy(
+                    update={"input_tokens": 40, "output_tokens": 2}
+                )
+
+        budgeter = self._budgeter(tokens_per_minute=1000)
+        client = BudgetedModelClient(UsageReportingClient(), budgeter)
+
+        # WHEN
+        client.invoke("Summarize this email", system_prompt="Be brief")
+
+        # THEN the window holds the actual usage, not the estimate
+        self.assertEqual(budgeter.utilization().tokens, 42)
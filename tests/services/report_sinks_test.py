@@ -0,0 +1,152 @@
+import io
+import json
+import os
+import tempfile
+from unittest.mock import AsyncMock, Mock
+
+from ..base import BaseAsyncTestCase
+from ..test_utils import mock_email
+from email_summarizer.models.enums import EmailAccounts
+from email_summarizer.models.report import EmailReport
+from email_summarizer.models.summary import Summary
+from email_summarizer.services.report_sinks import (
+    DiscordSink,
+    JsonFileSink,
+    ReportSink,
+    StdoutSink,
+    WebhookSink,
+    build_sink,
+    build_sinks,
+    deliver_error,
+    deliver_report,
+)
+
+
+class FailingSink(ReportSink):
+    name = "failing"
+
+    async def deliver(self, email_report):
+        raise RuntimeError("boom")
+
+    async def deliver_error(self, message, email_account=None):
+        raise RuntimeError("boom")
+
+
+class TestReportSinks(BaseAsyncTestCase):
+    def setUp(self):
+        self.email_report = EmailReport(
+            email_account=EmailAccounts.PRIMARY,
+            timestamp="2023-01-01",
+            actionable_emails=[],
+            summaries=[Summary(email=mock_email(), body="AI summary")],
+            grouped_emails=[],
+        )
+
+    async def test_discord_sink_sends_packed_messages(self):
+        channel = Mock()
+        channel.send = AsyncMock()
+
+        await DiscordSink(channel).deliver(self.email_report)
+
+        channel.send.assert_awaited_once()
+        self.assertIn("1. (test@example.com) AI summary", channel.send.await_args[0][0])
+
+    async def test_stdout_sink_writes_report(self):
+        stream = io.StringIO()
+
+        await StdoutSink(stream).deliver(self.email_report)
+
+        self.assertIn("# PRIMARY Email Report 2023-01-01", stream.getvalue())
+
+    async def test_json_file_sink_writes_report(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "report.json")
+
+            await JsonFileSink(path).deliver(self.email_report)
+
+            with open(path) as report_file:
+                written = json.load(report_file)
+        self.assertEqual(written["email_account"], "PRIMARY")
+        self.assertEqual(written["summaries"][0]["body"], "AI summary")
+
+    async def test_deliver_report_fans_out_and_isolates_failures(self):
+        stream = io.StringIO()
+        sinks = [StdoutSink(stream), FailingSink()]
+
+        deliveries = await deliver_report(self.email_report, sinks)
+
+        self.assertEqual([d.sink for d in deliveries], ["stdout", "failing"])
+        self.assertIsNone(deliveries[0].error)
+        self.assertEqual(deliveries[1].error, "boom")
+        self.assertTrue(all(d.seconds >= 0 for d in deliveries))
+        self.assertIn("AI summary", stream.getvalue())
+
+    async def test_deliver_error_reaches_every_sink(self):
+        channel = Mock()
+        channel.send = AsyncMock()
+        stream = io.StringIO()
+
+        await deliver_error("Error!", [DiscordSink(channel), StdoutSink(stream)])
+
+        channel.send.assert_awaited_once_with("Error!")
+        self.assertEqual(stream.getvalue(), "Error!\n")
+
+    def test_build_sink(self):
+        self.assertIsInstance(build_sink("stdout"), StdoutSink)
+        self.assertEqual(build_sink("json:/tmp/out.json").path, "/tmp/out.json")
+        self.assertEqual(
+            build_sink("webhook:https://example.com/hook").url,
+            "https://example.com/hook",
+        )
+        with self.assertRaises(ValueError):
+            build_sink("carrier-pigeon")
+
+    def test_build_sinks(self):
+        self.assertEqual(build_sinks(None), [])
+        sinks = build_sinks("stdout, json:/tmp/out.json")
+        self.assertEqual([sink.name for sink in sinks], ["stdout", "json"])
+
+    async def test_webhook_sink_posts_report(self):
+        session = Mock()
+        session.closed = False
+        response = Mock()
+        context = AsyncMock()
+        context.__aenter__.return_value = response
+        session.post = Mock(return_value=context)
+
+        await WebhookSink("https://example.com/hook", session=session).deliver(
+            self.email_report
+        )
+
+        url = session.post.call_args[0][0]
+        payload = session.post.call_args[1]["json"]
+        self.assertEqual(url, "https://example.com/hook")
+        self.assertEqual(payload["report"]["email_account"], "PRIMARY")
+        response.raise_for_status.assert_called_once()
+
+    async def test_json_file_sink_account_placeholder(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            sink = JsonFileSink(os.path.join(tmp_dir, "{account}.json"))
+
+            await sink.deliver(self.email_report)
+
+            self.assertTrue(os.path.exists(os.path.join(tmp_dir, "PRIMARY.json")))
+
+    async def test_json_file_sink_per_account_errors(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # GIVEN a run reporting on two accounts
+            sink = build_sink(
+                f"json:{os.path.join(tmp_dir, 'report.json')}", per_account=True
+            )
+
+            # WHEN one report is written and the other account fails
+            await sink.deliver(self.email_report)
+            await deliver_error("Error!", [sink], EmailAccounts.NOREPLY)
+
+            # THEN each account keeps its own file
+            self.assertEqual(
+                sorted(os.listdir(tmp_dir)),
+                ["report-NOREPLY.json", "report-PRIMARY.json"],
+            )
+            with open(os.path.join(tmp_dir, "report-NOREPLY.json")) as error_file:
+                self.assertEqual(json.load(error_file), {"error": "Error!"})
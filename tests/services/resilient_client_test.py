@@ -0,0 +1,110 @@
+from unittest.mock import patch
+
+from botocore.exceptions import ClientError
+
+from ..base import BaseTestCase
+from email_summarizer.services.resilient_client import (
+    LatencyTracker,
+    ResilientModelClient,
+)
+from ..stub_model_client import (
+    Fault,
+    FaultInjectingModelClient,
+)
+
+
+@patch("email_summarizer.services.resilient_client.backoff_delay", return_value=0)
+class TestResilientModelClient(BaseTestCase):
+    def test_retries_throttled_call(self, mock_backoff_delay):
+        # GIVEN a model that is throttled twice
+        stub = FaultInjectingModelClient(script=[Fault.THROTTLE, Fault.THROTTLE])
+        client = ResilientModelClient([stub], max_throttle_retries=3)
+
+        # WHEN
+        response = client.invoke("prompt")
+
+        # THEN the call backs off and succeeds
+        self.assertEqual(response.get_response(), "stub response")
+        self.assertEqual(stub.calls, 3)
+        self.assertEqual(mock_backoff_delay.call_count, 2)
+
+    def test_falls_back_after_repeated_throttles(self, _mock_sleep):
+        # GIVEN a primary model that keeps throttling
+        primary = FaultInjectingModelClient(throttle_rate=1.0)
+        fallback = FaultInjectingModelClient(response="fallback response")
+        client = ResilientModelClient([primary, fallback], max_throttle_retries=2)
+
+        # WHEN
+        response = client.invoke("prompt")
+
+        # THEN the next model in the chain answers
+        self.assertEqual(response.get_response(), "fallback response")
+        self.assertEqual(primary.calls, 3)
+        self.assertEqual(fallback.calls, 1)
+
+    def test_raises_throttle_when_chain_exhausted(self, _mock_sleep):
+        client = ResilientModelClient(
+            [FaultInjectingModelClient(throttle_rate=1.0)], max_throttle_retries=1
+        )
+
+        with self.assertRaises(ClientError):
+            client.invoke("prompt")
+
+    def test_stops_backing_off_at_budget(self, mock_backoff_delay):
+        # GIVEN a primary model that keeps throttling and backoff that would
+        # overrun the budget
+        mock_backoff_delay.return_value = 5
+        primary = FaultInjectingModelClient(throttle_rate=1.0)
+        fallback = FaultInjectingModelClient(response="fallback response")
+        client = ResilientModelClient(
+            [primary, fallback], max_throttle_retries=3, backoff_budget_seconds=1
+        )
+
+        # WHEN
+        response = client.invoke("prompt")
+
+        # THEN the next model answers without sleeping
+        self.assertEqual(response.get_response(), "fallback response")
+        self.assertEqual(primary.calls, 1)
+
+    def test_does_not_retry_other_errors(self, _mock_sleep):
+        stub = FaultInjectingModelClient(script=[Fault.ERROR])
+        fallback = FaultInjectingModelClient()
+        client = ResilientModelClient([stub, fallback])
+
+        with self.assertRaises(ClientError):
+            client.invoke("prompt")
+        self.assertEqual(stub.calls, 1)
+        self.assertEqual(fallback.calls, 0)
+
+    def test_hedges_slow_call(self, _mock_backoff_delay):
+        # GIVEN a call that stalls well past the recorded p90 latency
+        stub = FaultInjectingModelClient(script=[Fault.SLOW], slow_latency_seconds=0.5)
+        tracker = LatencyTracker(min_samples=1)
+        tracker.record(0.01)
+        client = ResilientModelClient(
+            [stub], hedge_percentile=0.9, latency_tracker=tracker
+        )
+
+        # WHEN
+        response = client.invoke("prompt")
+
+        # THEN a hedged duplicate was sent and answered first
+        self.assertEqual(response.get_response(), "stub response")
+        self.assertEqual(stub.calls, 2)
+
+
+class TestLatencyTracker(BaseTestCase):
+    def test_percentile_needs_samples(self):
+        tracker = LatencyTracker(min_samples=3)
+        tracker.record(1.0)
+
+        self.assertIsNone(tracker.percentile(0.95))
+
+    def test_percentile(self):
+        tracker = LatencyTracker(min_samples=1)
+        for seconds in range(1, 101):
+            tracker.record(seconds / 100)
+
+        self.assertEqual(tracker.percentile(0.95), 0.96)
+        self.assertEqual(tracker.percentile(0.5), 0.51)
@@ -0,0 +1,101 @@
+import os
+import tempfile
+from unittest.mock import MagicMock, patch
+
+from ..base import BaseTestCase
+from ..test_utils import SENDER, WEEK_ONE, WEEK_TWO, mock_email
+from email_summarizer.models.summary import Summary
+from email_summarizer.services.anthropic_client import AnthropicClient
+from email_summarizer.services.base_model_client import BaseModelResponse
+from email_summarizer.services.template_store import (
+    TemplateStore,
+    find_template_diff,
+    remember_template,
+)
+from email_summarizer.utils.ai_utils import build_summary
+
+
+class TestTemplateStore(BaseTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "templates.sqlite3")
+        self.mock_client = MagicMock(spec=AnthropicClient)
+        self.mock_client.invoke.return_value = BaseModelResponse(
+            response="[SCHOOL] Picture day is Thursday."
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_templates_persist(self):
+        # GIVEN
+        store = TemplateStore(self.path)
+        store.put(SENDER, WEEK_ONE, "Week one")
+        store.close()
+
+        # WHEN
+        template = TemplateStore(self.path).get("news@maple.edu")
+
+        # THEN
+        self.assertEqual(template.summary, "Week one")
+        self.assertEqual(len(template.fingerprints), 7)
+        self.assertIsNone(TemplateStore(self.path).get("other@example.com"))
+
+    def test_store_off_without_path(self):
+        remember_template(
+            Summary(body="Week one", email=mock_email(sender=SENDER, body=WEEK_ONE))
+        )
+
+        self.assertIsNone(find_template_diff(mock_email(sender=SENDER, body=WEEK_TWO)))
+
+    def test_recurring_email_summarized_from_changed_lines(self):
+        with (
+            patch(
+                "email_summarizer.services.template_store.TEMPLATE_STORE_PATH",
+                self.path,
+            ),
+            patch("email_summarizer.services.template_store._TEMPLATE_STORE", None),
+        ):
+            # GIVEN last week's update was summarized
+            self.mock_client.invoke.return_value = BaseModelResponse(
+                response="[SCHOOL] Book fair all week."
+            )
+            build_summary(self.mock_client, mock_email(sender=SENDER, body=WEEK_ONE))
+
+            # WHEN this week's update arrives
+            self.mock_client.invoke.return_value = BaseModelResponse(
+                response="[SCHOOL] Picture day is Thursday."
+            )
+            summary = build_summary(
+                self.mock_client, mock_email(sender=SENDER, body=WEEK_TWO)
+            )
+
+            # THEN only the changed line and the previous summary are sent
+            prompt = self.mock_client.invoke.call_args.kwargs["prompt"]
+            self.assertIn("picture day is Thursday", prompt)
+            self.assertNotIn("Car line opens", prompt)
+            self.assertIn(
+                "<previous_summary>[SCHOOL] Book fair all week.</previous_summary>",
+                prompt,
+            )
+            self.assertEqual(summary.body, "[SCHOOL] Picture day is Thursday.")
+
+    def test_fallback_summaries_are_not_remembered(self):
+        with (
+            patch(
+                "email_summarizer.services.template_store.TEMPLATE_STORE_PATH",
+                self.path,
+            ),
+            patch("email_summarizer.services.template_store._TEMPLATE_STORE", None),
+        ):
+            remember_template(
+                Summary(
+                    body="*Weekly Update*: snippet",
+                    email=mock_email(sender=SENDER, body=WEEK_ONE),
+                    is_fallback=True,
+                )
+            )
+
+            self.assertIsNone(
+                find_template_diff(mock_email(sender=SENDER, body=WEEK_TWO))
+            )
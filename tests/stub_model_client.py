@@ -0,0 +1,81 @@
+import random
+import threading
+import time
+from collections import deque
+from enum import Enum
+
+from email_summarizer.services.base_model_client import (
+    AbastractModelResponse,
+    AbstractModelClient,
+    BaseModelResponse,
+)
+
+
+class Fault(Enum):
+    THROTTLE = "THROTTLE"
+    ERROR = "ERROR"
+    SLOW = "SLOW"
+    OK = "OK"
+
+
+class FaultInjectingModelClient(AbstractModelClient):
+    """
+    Local stand-in for a Bedrock model client that injects faults.
+
+    Faults are taken from a script first, one per call, then drawn at the
+    configured rates. Throttles raise the
+    same ClientError Bedrock does, so retry and fallback logic can be
+    exercised without AWS.
+    """
+
+    def __init__(
+        self,
+        response: str = "stub response",
+        script: list[Fault] | None = None,
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        latency_seconds: float = 0.0,
+        slow_latency_seconds: float = 1.0,
+        seed: int | None = None,
+    ):
+        self.response = response
+        self.script = deque(script or [])
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.latency_seconds = latency_seconds
+        self.slow_latency_seconds = slow_latency_seconds
+        self.calls = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def invoke(
+        self, prompt: str, system_prompt: str | None = None
+    ) -> AbastractModelResponse:
+        fault = self._next_fault()
+        if fault == Fault.SLOW:
+            time.sleep(self.slow_latency_seconds)
+        elif self.latency_seconds:
+            time.sleep(self.latency_seconds)
+        if fault == Fault.THROTTLE:
+            raise _client_error("ThrottlingException", "Too many requests")
+        if fault == Fault.ERROR:
+            raise _client_error("ValidationException", "Injected failure")
+        return BaseModelResponse(response=self.response)
+
+    def _next_fault(self) -> Fault:
+        with self._lock:
+            self.calls += 1
+            if self.script:
+                return self.script.popleft()
+            roll = self._random.random()
+        if roll < self.throttle_rate:
+            return Fault.THROTTLE
+        if roll < self.throttle_rate + self.error_rate:
+            return Fault.ERROR
+        return Fault.OK
+
+
+def _client_error(code: str, message: str) -> Exception:
+    from botocore.exceptions import ClientError
+
+    return ClientError({"Error": {"Code": code, "Message": message}}, "Converse")
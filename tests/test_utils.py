@@ -14,3 +14,19 @@ def mock_email(
         snippet="This is a test email.",
         body_preview=body,
     )
+
+
+# A recurring sender's template, with one line changed the second week
+SENDER = "Maple Elementary <news@maple.edu>"
+WEEK_ONE = """\
+Maple Elementary Weekly Update
+Dear families,
+This week: the book fair runs Monday through Friday.
+Lunch menu is posted on the school website.
+Car line opens at 7:45 AM.
+Questions? Reply to this email.
+Unsubscribe from these updates."""
+WEEK_TWO = WEEK_ONE.replace(
+    "This week: the book fair runs Monday through Friday.",
+    "This week: picture day is Thursday.",
+)
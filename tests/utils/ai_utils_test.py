@@ -1,16 +1,23 @@
+import threading
+import time
 from unittest.mock import patch, MagicMock
 
 from ..base import BaseTestCase
 from email_summarizer.models.email import Email, GroupedEmails
-from email_summarizer.models.enums import EmailAccounts, SupportedModel
+from email_summarizer.models.enums import EmailAccounts, EmailIntent, SupportedModel
 from email_summarizer.models.summary import Summary
 from email_summarizer.models.actionable_email import ActionableEmail
 from email_summarizer.models.report import EmailReport
 from email_summarizer.utils.ai_utils import (
+    LLM_CONCURRENCY,
+    build_long_summary,
     build_summary,
     build_actionable_email,
     compile_email_report,
+    extractive_sentences,
+    fallback_models,
     get_model_client,
+    get_prompt_config,
 )
 from email_summarizer.services.anthropic_client import (
     AnthropicClient,
@@ -19,6 +26,8 @@ from email_summarizer.services.anthropic_client import (
 from email_summarizer.services.nova_client import NovaClient
 from email_summarizer.services.bedrock_client import BedrockClient
 from email_summarizer.services.base_model_client import BaseModelResponse
+from email_summarizer.utils.deadline_utils import Deadline
+from email_summarizer.utils.intent_classifier import IntentPrediction
 
 
 class TestAiUtils(BaseTestCase):
@@ -132,6 +141,308 @@ class TestAiUtils(BaseTestCase):
         self.assertIsInstance(report.timestamp, str)
         self.assertTrue(report.is_empty())
 
+    def test_compile_email_report_falls_back_past_deadline(self):
+        """Emails the model doesn't get to before the deadline fall back"""
+        # GIVEN a model call that hangs past the deadline
+        release = threading.Event()
+        self.addCleanup(release.set)
+        slow_client = MagicMock(spec=AnthropicClient)
+
+        def invoke(**_kwargs):
+            release.wait(5)
+            return self.mock_response
+
+        slow_client.invoke.side_effect = invoke
+        regular_email = self.test_email.model_copy(update={"id": "regular"})
+
+        # WHEN compiling with a short deadline
+        report = compile_email_report(
+            slow_client,
+            EmailAccounts.PRIMARY,
+            [regular_email],
+            [],
+            [self.test_email],
+            deadline=Deadline.after(0.05),
+        )
+
+        # THEN both emails fell back to their subject and snippet
+        self.assertTrue(report.actionable_emails[0].is_fallback)
+        self.assertEqual(
+            report.actionable_emails[0].next_steps,
+            "*Test Subject*: This is a test email snippet",
+        )
+        self.assertTrue(report.summaries[0].is_fallback)
+        self.assertEqual(report.fallback_count(), 2)
+
+    def test_compile_email_report_isolates_failed_call(self):
+        """One failing model call falls back without aborting the report"""
+        failing_email = self.test_email.model_copy(
+            update={"id": "failing", "subject": "Broken"}
+        )
+
+        def invoke(prompt, **_kwargs):
+            if "Broken" in prompt:
+                raise ValueError("Empty content found in Nova response")
+            return self.mock_response
+
+        self.mock_client.invoke.side_effect = invoke
+
+        report = compile_email_report(
+            self.mock_client,
+            EmailAccounts.PRIMARY,
+            [self.test_email, failing_email],
+            [],
+            [],
+        )
+
+        self.assertEqual(report.summaries[0].body, "This is a test summary")
+        self.assertFalse(report.summaries[0].is_fallback)
+        self.assertTrue(report.summaries[1].is_fallback)
+        self.assertEqual(report.summaries[1].email, failing_email)
+
+    def test_compile_email_report_within_deadline(self):
+        """Calls finishing in time are used as-is"""
+        report = compile_email_report(
+            self.mock_client,
+            EmailAccounts.PRIMARY,
+            [self.test_email],
+            [],
+            [],
+            deadline=Deadline.after(5),
+        )
+
+        self.assertFalse(report.summaries[0].is_fallback)
+        self.assertEqual(report.summaries[0].body, "This is a test summary")
+
+    @patch("email_summarizer.utils.ai_utils.LLM_CONCURRENCY", 1)
+    def test_compile_email_report_summarizes_clusters_after_high_priority(self):
+        """Cluster calls never hold back the high priority emails"""
+        # GIVEN one model call at a time
+        prompts = []
+
+        def invoke(prompt, **_kwargs):
+            prompts.append(prompt)
+            return self.mock_response
+
+        self.mock_client.invoke.side_effect = invoke
+        cluster = [
+            self.test_email.model_copy(update={"id": f"sale-{n}", "subject": "Sale"})
+            for n in range(3)
+        ]
+
+        # WHEN
+        report = compile_email_report(
+            self.mock_client,
+            EmailAccounts.PRIMARY,
+            [],
+            [GroupedEmails(sender="Warhorn", count=2)],
+            [self.test_email],
+            clusters=[cluster],
+        )
+
+        # THEN the actionable email is built first
+        self.assertNotIn("Sale", prompts[0])
+        self.assertIn("Sale", prompts[1])
+        self.assertEqual(
+            [grouped.sender for grouped in report.grouped_emails],
+            ["Warhorn", "test@example.com"],
+        )
+        self.assertEqual(report.grouped_emails[1].count, 3)
+
+    def test_build_summary_passes_body_budget(self):
+        """The prompt config's body budget reaches the prompt builder"""
+        with patch(
+            "email_summarizer.utils.ai_utils.email_to_prompt"
+        ) as mock_email_to_prompt:
+            mock_email_to_prompt.return_value = {
+                "prompt_body": "Test prompt body",
+                "was_redacted": False,
+            }
+
+            build_summary(
+                self.mock_client,
+                self.test_email,
+                prompt_config=get_prompt_config(SupportedModel.NOVA_MICRO),
+            )
+
+            mock_email_to_prompt.assert_called_once_with(
+                self.test_email,
+                body_token_budget=1000,
+                extractive_sentences=0,
+                extractive_char_budget=2000,
+            )
+
+    def test_build_summary_summarizes_long_emails_in_chunks(self):
+        """Bodies over the threshold are summarized chunk by chunk"""
+        # GIVEN a body of about 12 chunks
+        long_email = self.test_email.with_body(
+            " ".join(f"Event {n} is on Friday." for n in range(300))
+        )
+        self.mock_client.invoke.side_effect = lambda prompt, system_prompt: (
+            BaseModelResponse(
+                response="[SCHOOL] Combined" if "<notes>" in prompt else "Notes"
+            )
+        )
+
+        # WHEN
+        with patch("email_summarizer.utils.ai_utils.LONG_EMAIL_TOKEN_THRESHOLD", 500):
+            summary = build_summary(self.mock_client, long_email)
+
+        # THEN the capped chunks are summarized and combined into one summary
+        combine_prompts = [
+            c.kwargs["prompt"]
+            for c in self.mock_client.invoke.call_args_list
+            if "<notes>" in c.kwargs["prompt"]
+        ]
+        self.assertEqual(summary.body, "[SCHOOL] Combined")
+        self.assertEqual(summary.email, long_email)
+        self.assertEqual(len(combine_prompts), 1)
+        self.assertIn("Part 1: Notes", combine_prompts[0])
+        chunk_count = self.mock_client.invoke.call_count - 1
+        self.assertGreater(chunk_count, 1)
+        self.assertLessEqual(chunk_count, 8)
+
+    def test_compile_email_report_bounds_long_email_calls(self):
+        """Chunk calls of long emails share the report's pool"""
+        # GIVEN two long emails and a few short ones
+        long_email = self.test_email.with_body(
+            " ".join(f"Event {n} is on Friday." for n in range(300))
+        )
+        in_flight = 0
+        most_in_flight = 0
+        lock = threading.Lock()
+
+        def invoke(prompt, system_prompt):
+            nonlocal in_flight, most_in_flight
+            with lock:
+                in_flight += 1
+                most_in_flight = max(most_in_flight, in_flight)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            return BaseModelResponse(response="Summary")
+
+        self.mock_client.invoke.side_effect = invoke
+
+        # WHEN
+        with patch("email_summarizer.utils.ai_utils.LONG_EMAIL_TOKEN_THRESHOLD", 500):
+            report = compile_email_report(
+                self.mock_client,
+                EmailAccounts.PRIMARY,
+                [long_email, self.test_email, long_email, self.test_email],
+                [],
+                [],
+            )
+
+        # THEN
+        self.assertEqual(len(report.summaries), 4)
+        self.assertFalse(any(summary.is_fallback for summary in report.summaries))
+        self.assertGreater(self.mock_client.invoke.call_count, 4)
+        self.assertLessEqual(most_in_flight, LLM_CONCURRENCY)
+
+    def test_build_long_summary_leaves_out_failed_chunks(self):
+        """A chunk that keeps failing is left out of the combined notes"""
+        long_email = self.test_email.with_body(
+            " ".join(f"Event {n} is on Friday." for n in range(300))
+        )
+
+        def invoke(prompt, system_prompt):
+            if "<notes>" in prompt:
+                return BaseModelResponse(response="Combined")
+            if "Event 0 " in prompt:
+                raise ValueError("Boom")
+            return BaseModelResponse(response="Notes")
+
+        self.mock_client.invoke.side_effect = invoke
+
+        with self.assertLogs(level="WARNING"):
+            summary = build_long_summary(self.mock_client, long_email)
+
+        combine_prompt = self.mock_client.invoke.call_args.kwargs["prompt"]
+        self.assertEqual(summary.body, "Combined")
+        self.assertNotIn("Part 1:", combine_prompt)
+        self.assertIn("Part 2: Notes", combine_prompt)
+
+    def test_build_long_summary_respects_deadline(self):
+        long_email = self.test_email.with_body(
+            " ".join(f"Event {n} is on Friday." for n in range(300))
+        )
+
+        with self.assertRaises(Exception), self.assertLogs(level="WARNING"):
+            build_long_summary(self.mock_client, long_email, deadline=Deadline.after(0))
+
+        self.mock_client.invoke.assert_not_called()
+
+    def test_build_summary_keeps_short_emails_in_one_call(self):
+        with patch("email_summarizer.utils.ai_utils.LONG_EMAIL_TOKEN_THRESHOLD", 500):
+            build_summary(self.mock_client, self.test_email)
+
+        self.mock_client.invoke.assert_called_once()
+
+    @patch("email_summarizer.utils.ai_utils.get_intent_classifier")
+    def test_compile_email_report_skips_model_for_confident_intents(
+        self, mock_get_intent_classifier
+    ):
+        """Confidently classified emails get a template line, the rest the model"""
+        # GIVEN a classifier that is only sure about the receipt
+        receipt = self.test_email.model_copy(update={"subject": "Order shipped"})
+        question = self.test_email.model_copy(update={"subject": "Lunch?"})
+        mock_get_intent_classifier.return_value.predict.side_effect = lambda email: (
+            IntentPrediction(intent=EmailIntent.TRANSACTION, confidence=0.98)
+            if email.subject == "Order shipped"
+            else IntentPrediction(intent=EmailIntent.OTHER, confidence=0.4)
+        )
+
+        # WHEN
+        report = compile_email_report(
+            self.mock_client, EmailAccounts.PRIMARY, [receipt, question], [], []
+        )
+
+        # THEN
+        self.assertEqual(
+            [summary.body for summary in report.summaries],
+            ["[TRANSACTION] Order shipped", "This is a test summary"],
+        )
+        self.assertTrue(report.summaries[0].is_local)
+        self.mock_client.invoke.assert_called_once()
+
+    def test_get_prompt_config(self):
+        """Every supported model has a body budget"""
+        for model in SupportedModel:
+            self.assertGreater(get_prompt_config(model).body_token_budget, 0)
+
+    def test_get_prompt_config_sets_extractive_sentences_per_model(self):
+        """Only models named in EXTRACTIVE_SENTENCES get the extractive stage"""
+        with patch(
+            "email_summarizer.utils.ai_utils.EXTRACTIVE_SENTENCES", "nova_micro=8"
+        ):
+            nova_config = get_prompt_config(SupportedModel.NOVA_MICRO)
+            haiku_config = get_prompt_config(SupportedModel.CLAUDE_HAIKU)
+
+        self.assertEqual(nova_config.extractive_sentences, 8)
+        self.assertEqual(nova_config.body_token_budget, 1000)
+        self.assertEqual(haiku_config.extractive_sentences, 0)
+
+    def test_extractive_sentences(self):
+        self.assertEqual(
+            extractive_sentences("NOVA_MICRO=8, CLAUDE_HAIKU=12"),
+            {SupportedModel.NOVA_MICRO: 8, SupportedModel.CLAUDE_HAIKU: 12},
+        )
+        self.assertEqual(extractive_sentences(""), {})
+        with self.assertRaises(ValueError):
+            extractive_sentences("GPT=4")
+
+    def test_fallback_models(self):
+        """Models after the target in the chain are its fallbacks"""
+        chain = "CLAUDE_SONNET,CLAUDE_HAIKU,NOVA_MICRO"
+
+        self.assertEqual(
+            fallback_models(SupportedModel.CLAUDE_HAIKU, chain),
+            [SupportedModel.NOVA_MICRO],
+        )
+        self.assertEqual(fallback_models(SupportedModel.NOVA_MICRO, chain), [])
+        self.assertEqual(fallback_models(SupportedModel.DEEPSEEK, chain), [])
+
     def test_get_model_client(self):
         """Test getting the appropriate model client"""
         # Test Haiku model
@@ -0,0 +1,29 @@
+from ..base import BaseTestCase
+from email_summarizer.utils.bloom_utils import BloomFilter
+
+
+class TestBloomFilter(BaseTestCase):
+    def test_added_items_are_always_found(self):
+        bloom_filter = BloomFilter.from_items(
+            (f"message-{n}" for n in range(500)), capacity=500
+        )
+
+        self.assertTrue(all(f"message-{n}" in bloom_filter for n in range(500)))
+        self.assertEqual(bloom_filter.count, 500)
+
+    def test_false_positive_rate_stays_near_target(self):
+        bloom_filter = BloomFilter.from_items(
+            (f"message-{n}" for n in range(1000)),
+            capacity=1000,
+            false_positive_rate=0.01,
+        )
+
+        false_positives = sum(f"other-{n}" in bloom_filter for n in range(10000))
+
+        self.assertLess(false_positives / 10000, 0.03)
+
+    def test_invalid_sizing(self):
+        with self.assertRaises(ValueError):
+            BloomFilter(0)
+        with self.assertRaises(ValueError):
+            BloomFilter(10, false_positive_rate=1.5)
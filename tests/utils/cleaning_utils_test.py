@@ -0,0 +1,100 @@
+from ..base import BaseTestCase
+from email_summarizer.utils.cleaning_utils import (
+    clean_body,
+    collapse_whitespace,
+    drop_repeated_lines,
+    strip_footer,
+    strip_quoted_reply,
+    strip_signature,
+)
+
+
+class TestCleaningUtils(BaseTestCase):
+    def test_strip_quoted_reply(self):
+        body = (
+            "Sounds good, see you then.\n\n"
+            "On Mon, Jan 1, 2024 at 10:00 AM Jane Doe <jane@example.com>\n"
+            "wrote:\n"
+            "> Are we still on for lunch?\n"
+        )
+
+        self.assertEqual(strip_quoted_reply(body).strip(), "Sounds good, see you then.")
+
+    def test_strip_quoted_lines_without_header(self):
+        body = "My answer is yes.\n> Can you come?\n> Let me know."
+
+        self.assertEqual(strip_quoted_reply(body), "My answer is yes.\n")
+
+    def test_strip_signature(self):
+        body = "See attached.\n-- \nJohn Smith\nAcme Corp\n"
+
+        self.assertEqual(strip_signature(body), "See attached.\n")
+
+    def test_bare_dashes_are_not_a_signature(self):
+        body = "Agenda for Monday\n--\nPickup moved to 4 PM\nBring water bottles"
+
+        self.assertEqual(strip_signature(body), body)
+
+    def test_strip_mobile_signature(self):
+        body = "On my way.\nSent from my iPhone"
+
+        self.assertEqual(strip_signature(body).strip(), "On my way.")
+
+    def test_strip_footer_at_end(self):
+        body = (
+            "Your order has shipped and will arrive Tuesday. "
+            "Track it in the app for updates on delivery. "
+            "You are receiving this email because you made a purchase. "
+            "Unsubscribe | Privacy Policy"
+        )
+
+        self.assertEqual(
+            strip_footer(body).strip(),
+            "Your order has shipped and will arrive Tuesday. "
+            "Track it in the app for updates on delivery.",
+        )
+
+    def test_early_footer_marker_is_kept(self):
+        body = (
+            "Reply STOP to unsubscribe from carpool texts.\n"
+            "Pickup moves to 3pm on Friday.\nBring the permission slip."
+        )
+
+        self.assertEqual(strip_footer(body), body)
+
+    def test_drop_repeated_lines(self):
+        body = "Sale!\nShop now\nShoes 50% off\nShop now\nSHOP NOW"
+
+        self.assertEqual(drop_repeated_lines(body), "Sale!\nShop now\nShoes 50% off")
+
+    def test_repeated_content_lines_are_kept(self):
+        body = "1 x Latte $5.00\n1 x Latte $5.00\nTotal $10.00\n[link]\n[link]"
+
+        self.assertEqual(
+            drop_repeated_lines(body),
+            "1 x Latte $5.00\n1 x Latte $5.00\nTotal $10.00\n[link]",
+        )
+
+    def test_collapse_whitespace(self):
+        self.assertEqual(
+            collapse_whitespace("  Hello \t world \n\n\n\n Bye  "), "Hello world\n\nBye"
+        )
+
+    def test_clean_body_reports_removed_size(self):
+        # GIVEN a reply with tracking links and quoted history
+        body = (
+            "Thanks, I will pay the invoice today.\n"
+            "Details: https://click.example.com/track/abcdefghijklmnopqrstuvwxyz0123456789\n"
+            "On Tue, Feb 2, 2024 at 9:00 AM Billing <billing@example.com> wrote:\n"
+            "> Your invoice is attached.\n"
+        )
+
+        # WHEN
+        cleaned = clean_body(body)
+
+        # THEN
+        self.assertEqual(
+            cleaned["body"], "Thanks, I will pay the invoice today.\nDetails: [link]"
+        )
+        self.assertEqual(cleaned["chars_removed"], len(body) - len(cleaned["body"]))
+        self.assertGreater(cleaned["tokens_removed"], 0)
@@ -0,0 +1,153 @@
+from unittest.mock import MagicMock
+
+from ..base import BaseTestCase
+from email_summarizer.models.email import Email
+from email_summarizer.services.anthropic_client import AnthropicClient
+from email_summarizer.services.base_model_client import BaseModelResponse
+from email_summarizer.utils.cluster_summary_utils import (
+    cluster_label,
+    find_clusters,
+    summarize_cluster,
+)
+from email_summarizer.utils.clustering_utils import cluster_emails
+
+
+def email(message_id: str, sender: str, subject: str, snippet: str) -> Email:
+    return Email(
+        id=message_id,
+        subject=subject,
+        sender=sender,
+        date="2021-01-01",
+        snippet=snippet,
+        body_preview="Body",
+    )
+
+
+SALES = [
+    email(
+        f"sale-{n}",
+        "Old Navy <deals@oldnavy.com>",
+        f"{n}0% off everything today",
+        "Shop the sale on jeans and tees before it ends",
+    )
+    for n in range(1, 5)
+]
+DENTIST = email(
+    "dentist",
+    "Smile Dental <office@smiledental.com>",
+    "Appointment reminder",
+    "Your cleaning is scheduled for Tuesday at 3 PM",
+)
+INVOICE = email(
+    "invoice",
+    "City Water <billing@citywater.gov>",
+    "Your water bill is ready",
+    "Amount due $42.10 by November 1",
+)
+
+
+class TestClusteringUtils(BaseTestCase):
+    def test_similar_emails_share_a_cluster(self):
+        # GIVEN promotions from one store mixed with unrelated emails
+        emails = [SALES[0], DENTIST, *SALES[1:], INVOICE]
+
+        # WHEN
+        clusters = cluster_emails(emails, similarity_threshold=0.5)
+
+        # THEN the promotions form one cluster in their original order
+        self.assertEqual(
+            [[e.id for e in cluster] for cluster in clusters],
+            [
+                ["sale-1", "sale-2", "sale-3", "sale-4"],
+                ["dentist"],
+                ["invoice"],
+            ],
+        )
+
+    def test_unrelated_emails_stay_apart(self):
+        clusters = cluster_emails(
+            [SALES[0], DENTIST, INVOICE], similarity_threshold=0.2
+        )
+
+        self.assertEqual(len(clusters), 3)
+
+    def test_numbers_do_not_split_clusters(self):
+        # GIVEN promotions that only differ in their discount
+        clusters = cluster_emails(SALES, similarity_threshold=0.99)
+
+        # THEN
+        self.assertEqual(len(clusters), 1)
+
+    def test_no_emails(self):
+        self.assertEqual(cluster_emails([], similarity_threshold=0.5), [])
+
+
+class TestClusterSummaryUtils(BaseTestCase):
+    def setUp(self):
+        self.mock_client = MagicMock(spec=AnthropicClient)
+        self.mock_client.invoke.return_value = BaseModelResponse(
+            response=" Old Navy has up to 40% off. "
+        )
+
+    def test_find_clusters(self):
+        # GIVEN
+        emails = [SALES[0], DENTIST, *SALES[1:], INVOICE]
+
+        # WHEN
+        remaining, clusters = find_clusters(
+            emails, similarity_threshold=0.5, min_size=3
+        )
+
+        # THEN the unclustered emails are left in order
+        self.assertEqual([e.id for e in remaining], ["dentist", "invoice"])
+        self.assertEqual(clusters, [SALES])
+
+    def test_small_clusters_are_left_alone(self):
+        remaining, clusters = find_clusters(
+            SALES[:2] + [DENTIST], similarity_threshold=0.5, min_size=3
+        )
+
+        self.assertEqual(remaining, SALES[:2] + [DENTIST])
+        self.assertEqual(clusters, [])
+
+    def test_clustering_off_by_default(self):
+        remaining, clusters = find_clusters(SALES)
+
+        self.assertEqual(remaining, SALES)
+        self.assertEqual(clusters, [])
+
+    def test_cluster_summarized_with_one_call(self):
+        grouped_emails = summarize_cluster(self.mock_client, SALES, deadline=None)
+
+        self.mock_client.invoke.assert_called_once()
+        self.assertIn(
+            "40% off everything", self.mock_client.invoke.call_args.kwargs["prompt"]
+        )
+        self.assertEqual(grouped_emails.sender, "Old Navy <deals@oldnavy.com>")
+        self.assertEqual(grouped_emails.count, 4)
+        self.assertEqual(grouped_emails.summary, "Old Navy has up to 40% off.")
+        self.assertEqual(grouped_emails.message_ids, [e.id for e in SALES])
+        self.assertFalse(grouped_emails.is_fallback)
+
+    def test_failed_call_lists_subjects(self):
+        # GIVEN
+        self.mock_client.invoke.side_effect = ValueError("Boom")
+
+        # WHEN
+        with self.assertLogs(level="WARNING"):
+            grouped_emails = summarize_cluster(self.mock_client, SALES, deadline=None)
+
+        # THEN
+        self.assertTrue(grouped_emails.is_fallback)
+        self.assertEqual(
+            grouped_emails.summary,
+            "; ".join(f"*{e.subject}*" for e in SALES),
+        )
+
+    def test_cluster_label(self):
+        cluster = [SALES[0], SALES[1], DENTIST, INVOICE]
+
+        self.assertEqual(
+            cluster_label(cluster),
+            "Old Navy <deals@oldnavy.com>, Smile Dental <office@smiledental.com> and 1 more",
+        )
@@ -0,0 +1,27 @@
+import os
+from unittest.mock import patch
+
+from ..base import BaseTestCase
+from email_summarizer.utils.config_utils import (
+    REQUIRED_ENV_VARS,
+    MissingConfigError,
+    check_required_config,
+)
+
+
+class TestConfigUtils(BaseTestCase):
+    @patch.dict(os.environ, {key: "PLACEHOLDER" for key in REQUIRED_ENV_VARS})
+    def test_check_required_config(self):
+        check_required_config()
+
+    @patch.dict(os.environ, {key: "PLACEHOLDER" for key in REQUIRED_ENV_VARS})
+    def test_check_required_config_names_missing_vars(self):
+        # GIVEN an unset and an empty setting
+        del os.environ["SPOUSE_REGEX"]
+        os.environ["STREET_ADDRESS_REGEX"] = ""
+
+        # WHEN / THEN
+        with self.assertRaisesRegex(
+            MissingConfigError, "SPOUSE_REGEX, STREET_ADDRESS_REGEX"
+        ):
+            check_required_config()
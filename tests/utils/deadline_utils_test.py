@@ -0,0 +1,33 @@
+from unittest.mock import Mock, patch
+
+from ..base import BaseTestCase
+from email_summarizer.utils.deadline_utils import Deadline
+
+
+@patch("email_summarizer.utils.deadline_utils.time.monotonic", return_value=100.0)
+class TestDeadline(BaseTestCase):
+    def test_remaining(self, _mock_monotonic):
+        deadline = Deadline.after(5)
+
+        self.assertEqual(deadline.remaining(), 5.0)
+        self.assertFalse(deadline.expired())
+
+    def test_expired_deadline_has_no_time_left(self, _mock_monotonic):
+        deadline = Deadline(expires_at=90.0)
+
+        self.assertEqual(deadline.remaining(), 0.0)
+        self.assertTrue(deadline.expired())
+
+    def test_shortened(self, _mock_monotonic):
+        self.assertEqual(Deadline.after(5).shortened(2).remaining(), 3.0)
+
+    def test_from_lambda_context_keeps_reserve(self, _mock_monotonic):
+        context = Mock()
+        context.get_remaining_time_in_millis.return_value = 30_000
+
+        deadline = Deadline.from_lambda_context(context, reserve_seconds=5)
+
+        self.assertEqual(deadline.remaining(), 25.0)
+
+    def test_from_lambda_context_without_context(self, _mock_monotonic):
+        self.assertIsNone(Deadline.from_lambda_context(None))
@@ -0,0 +1,74 @@
+from unittest.mock import MagicMock
+
+from ..base import BaseTestCase
+from ..test_utils import mock_email
+from email_summarizer.models.enums import EmailIntent
+from email_summarizer.models.summary import Summary
+from email_summarizer.services.anthropic_client import AnthropicClient
+from email_summarizer.services.base_model_client import BaseModelResponse
+from email_summarizer.utils.digest_utils import build_digests, parse_intent
+
+
+class TestDigestUtils(BaseTestCase):
+    def setUp(self):
+        self.mock_client = MagicMock(spec=AnthropicClient)
+        self.mock_client.invoke.return_value = BaseModelResponse(response="Digest")
+
+    def summaries(self, count: int, intent: str = "SALE") -> list[Summary]:
+        return [
+            Summary(body=f"[{intent}] Summary {n}", email=mock_email())
+            for n in range(count)
+        ]
+
+    def test_parse_intent(self):
+        self.assertEqual(
+            parse_intent("[TRANSACTION] Order received."),
+            (EmailIntent.TRANSACTION, "Order received."),
+        )
+        self.assertEqual(parse_intent("No tag"), (EmailIntent.OTHER, "No tag"))
+        self.assertEqual(parse_intent("[UNKNOWN] Text"), (EmailIntent.OTHER, "Text"))
+
+    def test_rounds_grow_logarithmically(self):
+        # GIVEN 64 summaries and a fan-in of 4
+        summaries = self.summaries(64)
+
+        # WHEN
+        with self.assertLogs(level="INFO") as logs:
+            digests = build_digests(self.mock_client, summaries, fan_in=4)
+
+        # THEN 16 + 4 + 1 reduce calls run in 3 rounds
+        self.assertEqual(self.mock_client.invoke.call_count, 21)
+        self.assertIn("in 3 rounds", "\n".join(logs.output))
+        self.assertEqual(len(digests), 1)
+        self.assertEqual(digests[0].intent, EmailIntent.SALE)
+        self.assertEqual(digests[0].email_count, 64)
+        self.assertEqual(digests[0].body, "Digest")
+
+    def test_one_digest_per_intent(self):
+        # GIVEN one lone alert and several sales
+        summaries = self.summaries(3, "SALE") + self.summaries(1, "ALERT")
+
+        # WHEN
+        digests = build_digests(self.mock_client, summaries, fan_in=8)
+
+        # THEN the lone summary is used as-is
+        self.assertEqual(
+            [(d.intent, d.body, d.email_count) for d in digests],
+            [(EmailIntent.SALE, "Digest", 3), (EmailIntent.ALERT, "Summary 0", 1)],
+        )
+        self.mock_client.invoke.assert_called_once()
+        self.assertIn(
+            "Intent: SALE", self.mock_client.invoke.call_args.kwargs["prompt"]
+        )
+
+    def test_failed_reduce_joins_summaries(self):
+        self.mock_client.invoke.side_effect = ValueError("Model error")
+
+        digests = build_digests(self.mock_client, self.summaries(2), fan_in=2)
+
+        self.assertEqual(digests[0].body, "Summary 0 Summary 1")
+        self.assertTrue(digests[0].is_fallback)
+
+    def test_fan_in_must_reduce(self):
+        with self.assertRaises(ValueError):
+            build_digests(self.mock_client, self.summaries(2), fan_in=1)
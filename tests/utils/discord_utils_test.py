@@ -0,0 +1,45 @@
+from unittest.mock import AsyncMock, Mock, call, patch
+
+from ..base import BaseAsyncTestCase
+from email_summarizer.utils.discord_utils import DiscordMessageQueue
+
+
+class TestDiscordMessageQueue(BaseAsyncTestCase):
+    async def test_flush_sends_in_order(self):
+        """Test that queued messages are sent in order."""
+        channel = Mock()
+        channel.send = AsyncMock()
+        queue = DiscordMessageQueue(channel)
+        queue.extend(["first", "second"])
+        queue.put("third")
+
+        sent = await queue.flush()
+
+        self.assertEqual(sent, 3)
+        channel.send.assert_has_awaits([call("first"), call("second"), call("third")])
+
+    @patch("email_summarizer.utils.discord_utils.asyncio.sleep", new_callable=AsyncMock)
+    async def test_flush_waits_when_window_is_full(self, mock_sleep):
+        """Test that the queue pauses once the rate limit window is full."""
+        channel = Mock()
+        channel.send = AsyncMock()
+        queue = DiscordMessageQueue(channel, max_messages=2, per_seconds=5.0)
+        queue.extend(["a", "b", "c"])
+
+        await queue.flush()
+
+        self.assertEqual(channel.send.await_count, 3)
+        mock_sleep.assert_awaited_once()
+        self.assertGreater(mock_sleep.await_args[0][0], 0)
+
+    @patch("email_summarizer.utils.discord_utils.asyncio.sleep", new_callable=AsyncMock)
+    async def test_flush_does_not_wait_under_limit(self, mock_sleep):
+        """Test that the queue never sleeps while under the limit."""
+        channel = Mock()
+        channel.send = AsyncMock()
+        queue = DiscordMessageQueue(channel)
+        queue.extend(["a", "b"])
+
+        await queue.flush()
+
+        mock_sleep.assert_not_awaited()
@@ -99,6 +99,41 @@ class TestEmailUtils(BaseTestCase):
         self.assertIn("<body>", result["prompt_body"])
         self.assertIn("None", result["prompt_body"])
 
+    def test_email_to_prompt_truncates_to_body_budget(self):
+        """Test that long bodies are truncated to the token budget"""
+        long_email = Email(
+            **self.test_email.model_dump(exclude={"body_preview"}),
+            body_preview="Opening line. " + "Filler text here. " * 500,
+        )
+
+        result = email_to_prompt(
+            long_email, disable_redaction=True, body_token_budget=50
+        )
+
+        self.assertIn("Opening line.", result["prompt_body"])
+        self.assertIn("[...]", result["prompt_body"])
+        self.assertLess(len(result["prompt_body"]), 1000)
+
+    def test_email_to_prompt_extracts_sentences(self):
+        """Only the most central sentences are kept with extractive_sentences"""
+        newsletter = self.test_email.with_body(
+            "The book fair runs Friday in the library.\n"
+            "Volunteer at the book fair in the library.\n"
+            "Follow us online.\n"
+            "Unsubscribe here."
+        )
+
+        result = email_to_prompt(
+            newsletter,
+            disable_redaction=True,
+            extractive_sentences=2,
+            extractive_char_budget=500,
+        )
+
+        self.assertIn("The book fair runs Friday", result["prompt_body"])
+        self.assertIn("Volunteer at the book fair", result["prompt_body"])
+        self.assertNotIn("Unsubscribe", result["prompt_body"])
+
     def test_email_to_prompt_return_type(self):
         """Test that email_to_prompt returns the correct type"""
         result = email_to_prompt(self.test_email)
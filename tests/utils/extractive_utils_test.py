@@ -0,0 +1,63 @@
+from ..base import BaseTestCase
+from email_summarizer.utils.extractive_utils import (
+    extract_sentences,
+    split_text_units,
+    textrank_scores,
+)
+
+NEWSLETTER = """\
+Welcome to the Maple Elementary weekly update!
+The book fair runs Monday through Friday in the library.
+Parents can volunteer at the book fair during lunch.
+Picture day is Thursday, so send your child in their best smile.
+Follow us on social media for more updates.
+Unsubscribe from this list at any time."""
+
+
+class TestExtractiveUtils(BaseTestCase):
+    def test_split_text_units(self):
+        self.assertEqual(
+            split_text_units("First one. Second one!\n\nThird line\n  "),
+            ["First one.", "Second one!", "Third line"],
+        )
+
+    def test_central_sentences_score_highest(self):
+        # GIVEN
+        sentences = split_text_units(NEWSLETTER)
+
+        # WHEN
+        scores = textrank_scores(sentences)
+
+        # THEN the two book fair sentences support each other
+        top_two = set(scores.argsort()[-2:])
+        self.assertEqual(top_two, {1, 2})
+        self.assertAlmostEqual(float(scores.sum()), 1.0, places=5)
+
+    def test_extract_keeps_original_order(self):
+        extracted = extract_sentences(NEWSLETTER, max_sentences=2, char_budget=500)
+
+        self.assertEqual(
+            extracted,
+            "The book fair runs Monday through Friday in the library.\n"
+            "Parents can volunteer at the book fair during lunch.",
+        )
+
+    def test_extract_respects_char_budget(self):
+        extracted = extract_sentences(NEWSLETTER, max_sentences=4, char_budget=120)
+
+        self.assertLessEqual(len(extracted), 120)
+        self.assertIn("book fair", extracted)
+
+    def test_short_text_is_unchanged(self):
+        text = "Lunch at noon? Let me know."
+
+        self.assertEqual(
+            extract_sentences(text, max_sentences=4, char_budget=500), text
+        )
+
+    def test_single_long_sentence_is_cut(self):
+        text = "word " * 100
+
+        self.assertEqual(
+            extract_sentences(text, max_sentences=1, char_budget=50), text[:50]
+        )
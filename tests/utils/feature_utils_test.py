@@ -0,0 +1,13 @@
+from ..base import BaseTestCase
+from email_summarizer.utils.feature_utils import email_features
+
+
+class TestFeatureUtils(BaseTestCase):
+    def test_email_features(self):
+        features = email_features("Shop <orders@shop.example.com>", "Order 123 shipped")
+
+        self.assertIn("address:orders@shop.example.com", features)
+        self.assertIn("site:example.com", features)
+        self.assertIn("name:shop", features)
+        self.assertIn("subject:#", features)
+        self.assertIn("pair:order_#", features)
@@ -3,7 +3,7 @@ from unittest.mock import patch
 from ..base import BaseTestCase
 from email_summarizer.models.email import Email
 from email_summarizer.utils.grouping_utils import (
-    _build_grouping_categories,
+    build_grouping_categories,
     group_emails,
 )
 
@@ -73,7 +73,7 @@ class TestGroupingUtils(BaseTestCase):
 
     def test_build_grouping_categories(self):
         """Test building grouping categories"""
-        categories = _build_grouping_categories()
+        categories = build_grouping_categories()
 
         # Verify categories were created correctly
         self.assertEqual(len(categories), 4)
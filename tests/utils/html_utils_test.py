@@ -0,0 +1,95 @@
+from ..base import BaseTestCase
+from email_summarizer.models.enums import HtmlTextEngine
+from email_summarizer.utils.html_utils import (
+    html_to_text,
+    html_to_text_streaming,
+    looks_like_html,
+)
+from email_summarizer.utils.token_utils import estimate_tokens
+from email_summarizer.utils.truncation_utils import LONG_EMAIL_MAX_TOKENS
+
+
+class TestHtmlUtils(BaseTestCase):
+    def test_skips_script_style_and_head(self):
+        html = (
+            "<html><head><title>Promo</title><style>p {color: red}</style></head>"
+            "<body><script>track()</script><p>Big sale today</p></body></html>"
+        )
+
+        self.assertEqual(html_to_text_streaming(html), "Big sale today")
+
+    def test_skips_hidden_elements(self):
+        html = (
+            '<div style="display:none;max-height:0">Preheader text</div>'
+            '<span aria-hidden="true">hidden</span>'
+            "<p hidden>also hidden</p>"
+            "<p>Visible</p>"
+        )
+
+        self.assertEqual(html_to_text_streaming(html), "Visible")
+
+    def test_block_elements_become_lines(self):
+        html = (
+            "<h1>Weekly  update</h1><p>Field trip on <b>Friday</b>.</p>"
+            "<ul><li>Bring lunch</li><li>Wear   sneakers</li></ul>"
+            "Line<br>break &amp; more"
+        )
+
+        self.assertEqual(
+            html_to_text_streaming(html),
+            "Weekly update\nField trip on Friday.\nBring lunch\nWear sneakers\n"
+            "Line\nbreak & more",
+        )
+
+    def test_unclosed_hidden_children_are_closed_with_parent(self):
+        html = '<div style="display:none"><p>hidden<span>x</div><p>Shown</p>'
+
+        self.assertEqual(html_to_text_streaming(html), "Shown")
+
+    def test_unclosed_hidden_paragraph_is_closed_by_next_paragraph(self):
+        html = (
+            '<html><body><p style="display:none">Preview text'
+            "<p>Pickup is at 3 PM on Friday.<p>Bring a jacket.</body></html>"
+        )
+
+        self.assertEqual(
+            html_to_text_streaming(html),
+            "Pickup is at 3 PM on Friday.\nBring a jacket.",
+        )
+
+    def test_implied_end_tags_stay_in_scope(self):
+        html = (
+            "<ul><li hidden>Hidden item<li>First<ul><li>Nested</ul><li>Second</ul>"
+            '<table><tr><td style="display:none">x<td>Cell<tr><td>Row two</table>'
+            "<select><option hidden>Pick one<option>Blue</select>"
+        )
+
+        self.assertEqual(
+            html_to_text_streaming(html),
+            "First\nNested\nSecond\nCell\nRow two\nBlue",
+        )
+
+    def test_stops_at_size_budget(self):
+        html = "<p>" + "word " * 10_000 + "</p><p>never reached</p>"
+
+        text = html_to_text_streaming(html, max_chars=100)
+
+        self.assertLessEqual(len(text), 100)
+        self.assertNotIn("never reached", text)
+
+    def test_keeps_enough_text_for_long_email_mode(self):
+        html = "<p>" + "The spring concert is on Friday evening. " * 5_000 + "</p>"
+
+        text = html_to_text_streaming(html)
+
+        self.assertGreaterEqual(estimate_tokens(text), LONG_EMAIL_MAX_TOKENS)
+
+    def test_plain_text_keeps_line_breaks(self):
+        self.assertFalse(looks_like_html("Hi,\nSee you at 5 < 6.\nBye"))
+        self.assertEqual(html_to_text("Hi,\nBye\n"), "Hi,\nBye")
+
+    def test_beautifulsoup_engine(self):
+        self.assertEqual(
+            html_to_text("<p>Hello</p><p>world</p>", HtmlTextEngine.BEAUTIFULSOUP),
+            "Hello world",
+        )
@@ -0,0 +1,74 @@
+import os
+import tempfile
+
+from ..base import BaseTestCase
+from ..test_utils import mock_email
+from email_summarizer.models.enums import EmailIntent
+from email_summarizer.utils.intent_classifier import IntentClassifier
+
+
+def training_examples():
+    examples = []
+    for n in range(20):
+        examples.append(
+            (
+                mock_email(
+                    subject=f"Your order #{1000 + n} has shipped",
+                    sender="Shop <orders@shop.example.com>",
+                ),
+                EmailIntent.TRANSACTION,
+            )
+        )
+        examples.append(
+            (
+                mock_email(
+                    subject=f"How was your stay in room {n}? Leave a review",
+                    sender="Hotel <reviews@hotel.example.com>",
+                ),
+                EmailIntent.REVIEW,
+            )
+        )
+        examples.append(
+            (
+                mock_email(
+                    subject=f"{n}0% off everything this weekend",
+                    sender="Deals <deals@store.example.com>",
+                ),
+                EmailIntent.SALE,
+            )
+        )
+    return examples
+
+
+class TestIntentClassifier(BaseTestCase):
+    def test_fit_and_predict(self):
+        # GIVEN
+        classifier = IntentClassifier.fit(training_examples(), feature_bits=12)
+
+        # WHEN
+        receipt = classifier.predict(
+            mock_email(
+                subject="Your order #5555 has shipped",
+                sender="Shop <orders@shop.example.com>",
+            )
+        )
+        unknown = classifier.predict(
+            mock_email(subject="Lunch tomorrow?", sender="friend@example.org")
+        )
+
+        # THEN
+        self.assertEqual(receipt.intent, EmailIntent.TRANSACTION)
+        self.assertGreater(receipt.confidence, 0.9)
+        self.assertLess(unknown.confidence, 0.9)
+
+    def test_save_and_load(self):
+        classifier = IntentClassifier.fit(training_examples(), feature_bits=10)
+        email = mock_email(subject="50% off", sender="deals@store.example.com")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "classifier.npz")
+            classifier.save(path)
+            loaded = IntentClassifier.load(path)
+
+        self.assertEqual(loaded.feature_bits, 10)
+        self.assertEqual(loaded.predict(email), classifier.predict(email))
@@ -0,0 +1,122 @@
+import base64
+
+from ..base import BaseTestCase
+from email_summarizer.utils.mime_utils import BodyPart, find_body_part
+
+
+def encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def text_part(mime_type: str, raw: bytes, content_type: str | None = None, **extra):
+    headers = [{"name": "Content-Type", "value": content_type or mime_type}]
+    headers += [{"name": name, "value": value} for name, value in extra.items()]
+    return {"mimeType": mime_type, "headers": headers, "body": {"data": encode(raw)}}
+
+
+class TestMimeUtils(BaseTestCase):
+    def test_finds_plain_text_in_nested_alternative(self):
+        # GIVEN multipart/mixed > multipart/alternative with html listed first
+        payload = {
+            "mimeType": "multipart/mixed",
+            "parts": [
+                {
+                    "mimeType": "multipart/alternative",
+                    "parts": [
+                        text_part("text/html", b"<p>Hello</p>"),
+                        text_part("text/plain", b"Hello"),
+                    ],
+                },
+                {
+                    "mimeType": "application/pdf",
+                    "filename": "invoice.pdf",
+                    "body": {"attachmentId": "att-1", "size": 1000},
+                },
+            ],
+        }
+
+        # WHEN
+        part = find_body_part(payload)
+
+        # THEN
+        self.assertEqual(part.mime_type, "text/plain")
+        self.assertEqual(part.decode(), "Hello")
+
+    def test_falls_back_to_html(self):
+        payload = {
+            "mimeType": "multipart/alternative",
+            "parts": [text_part("text/html", b"<p>Only html</p>")],
+        }
+
+        self.assertEqual(find_body_part(payload).mime_type, "text/html")
+
+    def test_skips_text_attachments(self):
+        payload = {
+            "mimeType": "multipart/mixed",
+            "parts": [
+                {
+                    "mimeType": "text/plain",
+                    "filename": "notes.txt",
+                    "headers": [{"name": "Content-Disposition", "value": "attachment"}],
+                    "body": {"data": "not base64!"},
+                },
+                text_part("text/html", b"<p>Body</p>"),
+            ],
+        }
+
+        self.assertEqual(find_body_part(payload).decode(), "<p>Body</p>")
+
+    def test_walk_does_not_decode(self):
+        # Data is only decoded on demand, so a broken unused part is harmless.
+        payload = {
+            "mimeType": "multipart/alternative",
+            "parts": [
+                {"mimeType": "text/plain", "body": {"data": "Zm9v"}},
+                {"mimeType": "text/html", "body": {"data": "not base64!"}},
+            ],
+        }
+
+        self.assertEqual(find_body_part(payload).decode(), "foo")
+
+    def test_decodes_declared_charset(self):
+        part = find_body_part(
+            text_part(
+                "text/plain",
+                "Café à midi".encode("iso-8859-1"),
+                content_type='text/plain; charset="ISO-8859-1"',
+            )
+        )
+
+        self.assertEqual(part.charset, "iso-8859-1")
+        self.assertEqual(part.decode(), "Café à midi")
+
+    def test_unknown_charset_falls_back_to_utf8(self):
+        part = BodyPart(mime_type="text/plain", data=encode(b"ok"), charset="x-bogus")
+
+        self.assertEqual(part.decode(), "ok")
+
+    def test_undoes_quoted_printable_artifacts(self):
+        part = find_body_part(
+            text_part(
+                "text/html",
+                b'<a href=3D"https://example.com">Link</a> that wraps=\n here',
+                **{"Content-Transfer-Encoding": "quoted-printable"},
+            )
+        )
+
+        self.assertEqual(
+            part.decode(), '<a href="https://example.com">Link</a> that wraps here'
+        )
+
+    def test_keeps_equals_escapes_without_double_encoding(self):
+        """Text that merely looks like quoted-printable is left alone"""
+        text = b"https://x.com/?id=4F2A&page=20 and total=10"
+        part = find_body_part(
+            text_part(
+                "text/plain",
+                text,
+                **{"Content-Transfer-Encoding": "quoted-printable"},
+            )
+        )
+
+        self.assertEqual(part.decode(), text.decode())
@@ -0,0 +1,89 @@
+import asyncio
+
+from ..base import BaseAsyncTestCase
+from email_summarizer.utils.pipeline_utils import Stage, run_pipeline
+
+
+class TestPipelineUtils(BaseAsyncTestCase):
+    async def test_run_pipeline_applies_stages_in_order(self):
+        # GIVEN
+        results = []
+        stages = [
+            Stage("double", lambda item: item * 2, concurrency=2),
+            Stage(
+                "keep_multiples_of_four", lambda item: item if item % 4 == 0 else None
+            ),
+            Stage("label", lambda item: f"item-{item}", blocking=False),
+        ]
+
+        # WHEN
+        stats = await run_pipeline(range(10), stages, results.append, queue_size=2)
+
+        # THEN
+        self.assertEqual(
+            sorted(results), sorted(f"item-{n * 2}" for n in range(10) if n % 2 == 0)
+        )
+        self.assertEqual(
+            [s.name for s in stats], ["double", "keep_multiples_of_four", "label"]
+        )
+        self.assertEqual([s.items for s in stats], [10, 10, 5])
+
+    async def test_bounded_queues_limit_items_in_flight(self):
+        # GIVEN a fast source and a slow final stage
+        fed = 0
+        in_flight_peak = 0
+        consumed = []
+
+        def source():
+            nonlocal fed
+            for n in range(50):
+                fed += 1
+                yield n
+
+        async def slow(item):
+            nonlocal in_flight_peak
+            in_flight_peak = max(in_flight_peak, fed - len(consumed))
+            await asyncio.sleep(0.001)
+            return item
+
+        # WHEN
+        await run_pipeline(
+            source(),
+            [Stage("fast", lambda item: item, blocking=False), Stage("slow", slow)],
+            consumed.append,
+            queue_size=2,
+        )
+
+        # THEN the source is held back instead of buffering the whole input
+        self.assertEqual(sorted(consumed), list(range(50)))
+        self.assertLessEqual(in_flight_peak, 8)
+
+    async def test_slowest_stage_bounds_throughput(self):
+        # GIVEN two stages that each take 20ms per item
+        async def slow(item):
+            await asyncio.sleep(0.02)
+            return item
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+
+        # WHEN
+        await run_pipeline(
+            range(10), [Stage("a", slow), Stage("b", slow)], lambda item: None
+        )
+
+        # THEN the stages overlap instead of adding up to 400ms
+        self.assertLess(loop.time() - start, 0.35)
+
+    async def test_stage_error_cancels_pipeline(self):
+        def explode(item):
+            raise ValueError("bad item")
+
+        with self.assertRaises(ExceptionGroup) as raised:
+            await run_pipeline(range(100), [Stage("explode", explode)], print)
+
+        self.assertIsInstance(raised.exception.exceptions[0], ValueError)
+
+    def test_stage_needs_a_worker(self):
+        with self.assertRaises(ValueError):
+            Stage("empty", lambda item: item, concurrency=0)
@@ -0,0 +1,181 @@
+from ..base import BaseTestCase
+from ..test_utils import mock_email
+from email_summarizer.models.email import Email, GroupedEmails
+from email_summarizer.models.digest import CategoryDigest
+from email_summarizer.models.enums import EmailAccounts, EmailIntent
+from email_summarizer.models.report import EmailReport
+from email_summarizer.models.summary import Summary
+from email_summarizer.utils.report_utils import (
+    DISCORD_MESSAGE_LIMIT,
+    any_grouped_emails,
+    pack_messages,
+    render_report_lines,
+    render_report_messages,
+    report_header,
+)
+
+
+class TestReportUtils(BaseTestCase):
+    def _report(self, summaries=None, grouped_emails=None) -> EmailReport:
+        return EmailReport(
+            email_account=EmailAccounts.PRIMARY,
+            timestamp="2023-01-01",
+            actionable_emails=[],
+            summaries=summaries or [],
+            grouped_emails=grouped_emails or [],
+        )
+
+    def test_report_header(self):
+        """Test that the report header is formatted correctly."""
+        header = report_header(self._report())
+
+        self.assertEqual(header, "# PRIMARY Email Report 2023-01-01")
+
+    def test_any_grouped_emails_with_grouped_emails(self):
+        """Test that any_grouped_emails returns True when there are grouped emails."""
+        email_report = self._report(
+            grouped_emails=[GroupedEmails(sender="test@example.com", count=2)]
+        )
+
+        self.assertTrue(any_grouped_emails(email_report))
+
+    def test_any_grouped_emails_without_grouped_emails(self):
+        """Test that any_grouped_emails returns False when there are no grouped emails."""
+        self.assertFalse(any_grouped_emails(self._report()))
+
+    def test_any_grouped_emails_with_zero_count(self):
+        """Test that any_grouped_emails returns False when grouped emails have count of 0."""
+        email_report = self._report(
+            grouped_emails=[GroupedEmails(sender="test@example.com", count=0)]
+        )
+
+        self.assertFalse(any_grouped_emails(email_report))
+
+    def test_render_report_lines_empty_report(self):
+        """Test that an empty report renders the header and a placeholder."""
+        lines = render_report_lines(self._report())
+
+        self.assertEqual(
+            lines, ["# PRIMARY Email Report 2023-01-01", "*No emails to report.*"]
+        )
+
+    def test_render_report_lines_notes_fallbacks(self):
+        """Test that a partial report says how many emails fell back."""
+        email = mock_email()
+        lines = render_report_lines(
+            self._report(
+                summaries=[
+                    Summary(body="A summary", email=email),
+                    Summary(
+                        body="*Test Email*: snippet", email=email, is_fallback=True
+                    ),
+                ]
+            )
+        )
+
+        self.assertEqual(
+            lines[-1],
+            "*1 email(s) shown unsummarized: the model call failed or ran out of time.*",
+        )
+
+    def test_render_report_lines_shows_digests_instead_of_summaries(self):
+        """Test that digest mode renders one line per intent category."""
+        email_report = self._report(
+            summaries=[Summary(body="[SALE] A sale", email=mock_email())] * 2
+        )
+        email_report.digests = [
+            CategoryDigest(intent=EmailIntent.SALE, body="Two sales", email_count=2)
+        ]
+
+        lines = render_report_lines(email_report)
+
+        self.assertIn("### Digest", lines)
+        self.assertIn("- **SALE** (2 emails) Two sales", lines)
+        self.assertNotIn("1. (test@example.com) [SALE] A sale", lines)
+
+    def test_render_report_lines_shows_cluster_summaries(self):
+        """Test that a summarized cluster is listed with its summary."""
+        lines = render_report_lines(
+            self._report(
+                grouped_emails=[
+                    GroupedEmails(sender="a@example.com", count=2),
+                    GroupedEmails(
+                        sender="Old Navy", count=4, summary="40% off ends tonight."
+                    ),
+                ]
+            )
+        )
+
+        self.assertIn("- (a@example.com) - message count: 2", lines)
+        self.assertIn("- (Old Navy) - message count: 4: 40% off ends tonight.", lines)
+
+    def test_recordable_message_ids_leave_out_fallbacks(self):
+        """Emails shown as fallbacks are summarized again by a later run"""
+        summarized = Email(**mock_email().model_dump() | {"id": "summarized"})
+        failed = Email(**mock_email().model_dump() | {"id": "failed"})
+        email_report = self._report(
+            summaries=[
+                Summary(body="A summary", email=summarized),
+                Summary(body="*Test Email*", email=failed, is_fallback=True),
+            ],
+            grouped_emails=[
+                GroupedEmails(sender="a@example.com", count=1),
+                GroupedEmails(
+                    sender="Old Navy",
+                    count=2,
+                    is_fallback=True,
+                    message_ids=["cluster-1", "cluster-2"],
+                ),
+            ],
+        )
+        email_report.reported_message_ids = [
+            "summarized",
+            "failed",
+            "grouped",
+            "cluster-1",
+            "cluster-2",
+        ]
+
+        self.assertEqual(
+            email_report.recordable_message_ids(), ["summarized", "grouped"]
+        )
+
+    def test_pack_messages_joins_lines(self):
+        """Test that short lines are packed into a single message."""
+        messages = pack_messages(["a", "b", "c"], limit=10)
+
+        self.assertEqual(messages, ["a\nb\nc"])
+
+    def test_pack_messages_respects_limit(self):
+        """Test that no message exceeds the limit and line order is kept."""
+        lines = [f"line {i}" for i in range(10)]
+
+        messages = pack_messages(lines, limit=20)
+
+        self.assertTrue(all(len(message) <= 20 for message in messages))
+        self.assertEqual("\n".join(messages).split("\n"), lines)
+
+    def test_pack_messages_splits_long_line(self):
+        """Test that a line longer than the limit is split on whitespace."""
+        messages = pack_messages(["word " * 10], limit=12)
+
+        self.assertTrue(all(len(message) <= 12 for message in messages))
+        self.assertEqual(" ".join(messages).split(), ["word"] * 10)
+
+    def test_render_report_messages_large_report(self):
+        """Test that a large report is packed into a handful of messages."""
+        summaries = [
+            Summary(
+                email=mock_email(sender=f"sender{i}@example.com"),
+                body="[SALE] " + "Lorem ipsum dolor sit amet. " * 3,
+            )
+            for i in range(40)
+        ]
+
+        messages = render_report_messages(self._report(summaries=summaries))
+
+        self.assertLessEqual(len(messages), 3)
+        self.assertTrue(
+            all(len(message) <= DISCORD_MESSAGE_LIMIT for message in messages)
+        )
+        self.assertTrue(messages[0].startswith("# PRIMARY Email Report 2023-01-01"))
@@ -0,0 +1,73 @@
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+from ..base import BaseTestCase
+from email_summarizer.utils.deadline_utils import Deadline
+from email_summarizer.utils.retry_utils import (
+    backoff_delay,
+    call_with_retries,
+    is_retryable_error,
+)
+
+
+def client_error(code: str) -> ClientError:
+    return ClientError({"Error": {"Code": code, "Message": code}}, "Converse")
+
+
+@patch("email_summarizer.utils.retry_utils.time.sleep")
+class TestRetryUtils(BaseTestCase):
+    def test_is_retryable_error(self, _mock_sleep):
+        self.assertTrue(is_retryable_error(client_error("ServiceUnavailableException")))
+        self.assertFalse(is_retryable_error(client_error("ThrottlingException")))
+        self.assertTrue(is_retryable_error(ConnectionResetError()))
+        # Only timeouts the client enforced itself are retried
+        self.assertFalse(is_retryable_error(TimeoutError()))
+        self.assertFalse(is_retryable_error(client_error("ValidationException")))
+        self.assertFalse(is_retryable_error(ValueError("bad response")))
+
+    def test_backoff_delay_is_capped(self, _mock_sleep):
+        for attempt in range(10):
+            self.assertLessEqual(backoff_delay(attempt, 0.5, cap_seconds=2.0), 2.0)
+
+    def test_retries_retryable_error(self, mock_sleep):
+        # GIVEN a call that fails once
+        fn = MagicMock(
+            side_effect=[client_error("ServiceUnavailableException"), "summary"]
+        )
+
+        # WHEN
+        result = call_with_retries(fn, max_attempts=3)
+
+        # THEN
+        self.assertEqual(result, "summary")
+        self.assertEqual(fn.call_count, 2)
+        mock_sleep.assert_called_once()
+
+    def test_does_not_retry_other_errors(self, _mock_sleep):
+        fn = MagicMock(side_effect=client_error("ValidationException"))
+
+        with self.assertRaises(ClientError):
+            call_with_retries(fn, max_attempts=3)
+        fn.assert_called_once()
+
+    def test_leaves_throttling_to_the_model_client(self, _mock_sleep):
+        fn = MagicMock(side_effect=client_error("ThrottlingException"))
+
+        with self.assertRaises(ClientError):
+            call_with_retries(fn, max_attempts=3)
+        fn.assert_called_once()
+
+    def test_gives_up_after_max_attempts(self, _mock_sleep):
+        fn = MagicMock(side_effect=client_error("ServiceUnavailableException"))
+
+        with self.assertRaises(ClientError):
+            call_with_retries(fn, max_attempts=2)
+        self.assertEqual(fn.call_count, 2)
+
+    def test_skips_call_after_deadline(self, _mock_sleep):
+        fn = MagicMock()
+
+        with self.assertRaises(TimeoutError):
+            call_with_retries(fn, max_attempts=2, deadline=Deadline(0.0))
+        fn.assert_not_called()
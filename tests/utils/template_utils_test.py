@@ -0,0 +1,43 @@
+from ..base import BaseTestCase
+from ..test_utils import SENDER, WEEK_ONE, WEEK_TWO
+from email_summarizer.services.template_store import TemplateStore
+from email_summarizer.utils.template_utils import (
+    SenderTemplate,
+    sender_key,
+    template_diff,
+)
+
+
+class TestTemplateUtils(BaseTestCase):
+    def template(self) -> SenderTemplate:
+        store = TemplateStore(":memory:")
+        store.put(SENDER, WEEK_ONE, "[SCHOOL] Book fair all week.")
+        return store.get(SENDER)
+
+    def test_sender_key(self):
+        self.assertEqual(sender_key(SENDER), "news@maple.edu")
+        self.assertEqual(sender_key("NEWS@maple.edu"), "news@maple.edu")
+
+    def test_only_changed_lines_are_kept(self):
+        diff = template_diff(WEEK_TWO, self.template(), min_shared_ratio=0.6)
+
+        self.assertEqual(diff.changed_lines, ["This week: picture day is Thursday."])
+        self.assertEqual(diff.previous_summary, "[SCHOOL] Book fair all week.")
+        self.assertAlmostEqual(diff.shared_ratio, 6 / 7)
+
+    def test_whitespace_and_case_do_not_count_as_changes(self):
+        body = WEEK_ONE.upper().replace("\n", "\n\n   ")
+
+        diff = template_diff(body, self.template(), min_shared_ratio=0.6)
+
+        self.assertEqual(diff.changed_lines, [])
+
+    def test_different_template_is_not_diffed(self):
+        body = "\n".join(f"Brand new line {n}" for n in range(8))
+
+        self.assertIsNone(template_diff(body, self.template(), min_shared_ratio=0.6))
+
+    def test_short_bodies_are_not_diffed(self):
+        self.assertIsNone(
+            template_diff("Dear families,", self.template(), min_shared_ratio=0.6)
+        )
@@ -0,0 +1,19 @@
+from ..base import BaseTestCase
+from email_summarizer.utils.tfidf_utils import hashed_tfidf_vectors
+
+
+class TestTfidfUtils(BaseTestCase):
+    def test_rows_are_normalized(self):
+        vectors = hashed_tfidf_vectors([["sale", "shoes"], ["sale", "boots"], []])
+
+        self.assertAlmostEqual(float((vectors[0] ** 2).sum()), 1.0, places=5)
+        self.assertEqual(float(abs(vectors[2]).sum()), 0.0)
+
+    def test_shared_features_weigh_less(self):
+        # GIVEN "sale" is in every document
+        vectors = hashed_tfidf_vectors([["sale", "shoes"], ["sale", "boots"]])
+
+        # THEN the documents are only partly similar
+        similarity = float(vectors[0] @ vectors[1])
+        self.assertGreater(similarity, 0)
+        self.assertLess(similarity, 0.5)
@@ -0,0 +1,14 @@
+from ..base import BaseTestCase
+from email_summarizer.utils.token_utils import estimate_tokens
+
+
+class TestTokenUtils(BaseTestCase):
+    def test_estimate_tokens_empty(self):
+        self.assertEqual(estimate_tokens(""), 0)
+        self.assertEqual(estimate_tokens(None), 0)
+
+    def test_estimate_tokens_counts_words_and_punctuation(self):
+        self.assertEqual(estimate_tokens("Hello, world!"), 4)
+
+    def test_estimate_tokens_splits_long_words(self):
+        self.assertEqual(estimate_tokens("internationalization"), 4)
@@ -0,0 +1,78 @@
+from ..base import BaseTestCase
+from email_summarizer.utils.token_utils import estimate_tokens
+from email_summarizer.utils.truncation_utils import (
+    OMISSION_MARKER,
+    key_sentence_score,
+    split_into_chunks,
+    split_sentences,
+    truncate_to_token_budget,
+)
+
+FILLER = "Our newsletter brings you the finest stories from around the world."
+
+
+class TestTruncationUtils(BaseTestCase):
+    def test_split_sentences(self):
+        self.assertEqual(
+            split_sentences("First one. Second one!\nThird line"),
+            ["First one.", "Second one!", "Third line"],
+        )
+
+    def test_key_sentence_score(self):
+        self.assertGreater(
+            key_sentence_score("Please RSVP by Friday at 5:00 for $20."), 0
+        )
+        self.assertEqual(key_sentence_score(FILLER), 0)
+
+    def test_short_text_is_unchanged(self):
+        self.assertEqual(truncate_to_token_budget("Short body.", 100), "Short body.")
+
+    def test_keeps_head_key_sentences_and_tail(self):
+        # GIVEN a long newsletter with one important sentence in the middle
+        body = "\n".join(
+            ["Hello from the school office."]
+            + [FILLER] * 40
+            + ["Please confirm pickup by Friday at 3:30."]
+            + [FILLER] * 40
+            + ["Unsubscribe here."]
+        )
+
+        # WHEN
+        truncated = truncate_to_token_budget(body, 60)
+
+        # THEN it fits the budget and keeps what matters
+        self.assertLessEqual(estimate_tokens(truncated), 60 + 2 * 3)
+        self.assertTrue(truncated.startswith("Hello from the school office."))
+        self.assertIn("Please confirm pickup by Friday at 3:30.", truncated)
+        self.assertTrue(truncated.endswith("Unsubscribe here."))
+        self.assertIn(OMISSION_MARKER, truncated)
+
+    def test_clips_oversized_first_sentence(self):
+        body = " ".join(["word"] * 100)
+
+        truncated = truncate_to_token_budget(body, 10)
+
+        self.assertEqual(truncated, " ".join(["word"] * 10) + f" {OMISSION_MARKER}")
+
+    def test_split_into_chunks_overlaps(self):
+        # GIVEN ten numbered sentences of 5 tokens each
+        sentences = [f"Sentence number {n}." for n in range(10)]
+        body = " ".join(sentences)
+
+        # WHEN
+        chunks = split_into_chunks(body, chunk_tokens=15, overlap_tokens=5)
+
+        # THEN every sentence is covered and each chunk repeats the last
+        # sentence of the one before
+        self.assertEqual(chunks[0], " ".join(sentences[:3]))
+        self.assertTrue(chunks[1].startswith(sentences[2]))
+        self.assertTrue(chunks[-1].endswith(sentences[-1]))
+        for sentence in sentences:
+            self.assertTrue(any(sentence in chunk for chunk in chunks))
+        for chunk in chunks:
+            self.assertLessEqual(estimate_tokens(chunk), 15)
+
+    def test_split_into_chunks_clips_oversized_sentence(self):
+        chunks = split_into_chunks(" ".join(["word"] * 30) + ". Short one.", 10)
+
+        self.assertEqual(chunks, [" ".join(["word"] * 10), "Short one."])